@@ -490,7 +490,8 @@ async function handleFormSubmit(event) {
         user_id: userId,
         experience: `【URL】${currentPageData.url}\n【タイトル】${currentPageData.title}\n\n【仮説】\n${elements.statement.value}\n\n【背景・文脈】\n${elements.context.value}\n\n【成立条件】\n${elements.conditions.value}`,
         auto_score: true,
-        check_sharing: false
+        check_sharing: false,
+        defer_scoring: true
       })
     });
 
@@ -9,6 +9,9 @@ CREATE TABLE IF NOT EXISTS user_files (
     -- category VARCHAR(100) DEFAULT 'Uncategorized', -- Deprecated: Use file_categories table
     is_verified BOOLEAN DEFAULT FALSE,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    -- file_path のファイル名部分（拡張子なし = アップロード時のUUID）。UUID検索用
+    file_uuid VARCHAR(255) GENERATED ALWAYS AS (SUBSTRING_INDEX(SUBSTRING_INDEX(file_path, '/', -1), '.', 1)) STORED,
     CONSTRAINT fk_user_files_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_user_hash (user_id, file_hash) -- ユーザーごとの重複チェックを高速化
+    INDEX idx_user_hash (user_id, file_hash), -- ユーザーごとの重複チェックを高速化
+    INDEX idx_file_uuid (file_uuid)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -51,11 +51,12 @@ CREATE TABLE IF NOT EXISTS hypotheses (
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     shared_at DATETIME,                                -- 公開日時
     PRIMARY KEY (id),
-    INDEX idx_hypotheses_user (origin_user_id),
+    INDEX idx_hypotheses_user_updated (origin_user_id, updated_at),  -- ユーザー別一覧（更新順）
     INDEX idx_hypotheses_team (team_id),
-    INDEX idx_hypotheses_status (status),
+    INDEX idx_hypotheses_status_shared (status, shared_at),          -- 公開仮説一覧（公開順）
     INDEX idx_hypotheses_verification (verification_state),
     INDEX idx_hypotheses_parent (parent_hypothesis_id),
+    FULLTEXT INDEX ft_hypotheses_content (content) WITH PARSER ngram,  -- RAG用キーワード検索（日本語対応）
     CONSTRAINT fk_hypotheses_user FOREIGN KEY (origin_user_id) REFERENCES users(id) ON DELETE CASCADE,
     CONSTRAINT fk_hypotheses_team FOREIGN KEY (team_id) REFERENCES teams(id) ON DELETE SET NULL,
     CONSTRAINT fk_hypotheses_parent FOREIGN KEY (parent_hypothesis_id) REFERENCES hypotheses(id) ON DELETE SET NULL
@@ -79,7 +80,7 @@ CREATE TABLE IF NOT EXISTS hypothesis_verifications (
     parent_verification_id BIGINT UNSIGNED,            -- 差分の場合の親検証ID
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (id),
-    INDEX idx_verifications_hypothesis (hypothesis_id),
+    INDEX idx_verifications_hypothesis_result (hypothesis_id, verification_result),  -- 仮説別の結果集計
     INDEX idx_verifications_user (verifier_user_id),
     INDEX idx_verifications_team (verifier_team_id),
     INDEX idx_verifications_result (verification_result),
@@ -6,5 +6,6 @@ CREATE TABLE IF NOT EXISTS user_messages (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (id),
     KEY idx_user_messages_user_id_created_at (user_id, created_at),
+    KEY idx_user_messages_user_id_id (user_id, id),
     CONSTRAINT fk_user_messages_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
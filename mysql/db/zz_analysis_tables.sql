@@ -4,8 +4,11 @@ CREATE TABLE IF NOT EXISTS user_message_analyses (
     user_message_id BIGINT UNSIGNED NOT NULL,
     analysis JSON NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    -- 構造分析を含む分析かどうか（イノベーション履歴の絞り込み用）
+    has_structural TINYINT(1) GENERATED ALWAYS AS (JSON_CONTAINS_PATH(analysis, 'one', '$.structural_analysis')) STORED,
     PRIMARY KEY (id),
     KEY idx_user_message_analyses_user (user_id, created_at),
+    KEY idx_user_message_analyses_structural (user_id, has_structural, id),
     CONSTRAINT fk_user_message_analyses_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     CONSTRAINT fk_user_message_analyses_message FOREIGN KEY (user_message_id) REFERENCES user_messages(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
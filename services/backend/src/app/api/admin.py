@@ -520,6 +520,7 @@ async def get_hybrid_model_config():
         TASK_GAP_ANALYSIS,
         TASK_REPORT_GENERATION,
         TASK_RESPONSE_PLANNING,
+        TASK_SUGGESTION_GATE,
     )
 
     return {
@@ -552,6 +553,7 @@ async def get_hybrid_model_config():
                     "gap_analysis": TASK_GAP_ANALYSIS.to_dict(),
                     "report_generation": TASK_REPORT_GENERATION.to_dict(),
                     "response_planning": TASK_RESPONSE_PLANNING.to_dict(),
+                    "suggestion_gate": TASK_SUGGESTION_GATE.to_dict(),
                 },
                 "embedding_tasks": {
                     "wiki_embedding": TASK_WIKI_EMBEDDING.to_dict(),
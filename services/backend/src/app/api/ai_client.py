@@ -1,11 +1,14 @@
+import asyncio
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Generator, AsyncGenerator, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Generator, AsyncGenerator, Type, Union
 
 import requests
 from openai import OpenAI, AsyncOpenAI
+from pydantic import BaseModel, ValidationError
 
 from config import (
     AI_URL,
@@ -164,6 +167,60 @@ class AIClient:
         """
         return model.startswith("gpt-5") or model.startswith("o1")
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _json_schema_format(response_schema: Type[BaseModel]) -> Dict[str, Any]:
+        """Build the OpenAI json_schema response format for a pydantic model (once per model)."""
+        return {
+            "name": response_schema.__name__,
+            "schema": response_schema.model_json_schema()
+        }
+
+    def _reasoning_kwargs(
+        self,
+        prompt: str,
+        model: str,
+        response_schema: Optional[Type[BaseModel]] = None
+    ) -> Dict[str, Any]:
+        """Build Responses API arguments for reasoning models."""
+        kwargs = {
+            "model": model,
+            "reasoning": {"effort": "medium"},
+            "input": [{"role": "user", "content": prompt}]
+        }
+        if response_schema is not None:
+            kwargs["text"] = {
+                "format": {"type": "json_schema", **self._json_schema_format(response_schema)}
+            }
+        return kwargs
+
+    def parse_response(
+        self,
+        raw_text: str,
+        response_schema: Optional[Type[BaseModel]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parse LLM output. With a schema the output is validated against it
+        (missing fields take their defaults); without one, JSON is extracted.
+        Also used for streamed text, which is generated without a schema.
+        Returns None when the output is not valid JSON or does not match.
+        """
+        if response_schema is None:
+            return self._extract_json(raw_text)
+
+        try:
+            return response_schema.model_validate_json(raw_text).model_dump()
+        except ValidationError:
+            # Providers without native structured output may wrap the JSON in text
+            data = self._extract_json(raw_text)
+            if data is None:
+                return None
+            try:
+                return response_schema.model_validate(data).model_dump()
+            except ValidationError as exc:
+                logger.warning(f"[!] LLM response did not match {response_schema.__name__}: {exc}")
+                return None
+
     # =========================================================================
     # Text Generation Methods
     # =========================================================================
@@ -174,7 +231,8 @@ class AIClient:
         model: Optional[str] = None,
         force_json: bool = False,
         task_config: Optional[ModelConfig] = None,
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        response_schema: Optional[Type[BaseModel]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         LLMを使用して応答を生成する汎用メソッド。
@@ -185,6 +243,7 @@ class AIClient:
             force_json: JSON形式を強制するかどうか
             task_config: タスク設定（ModelConfig）
             provider: プロバイダー指定（"local" or "openai"）
+            response_schema: 構造化出力のスキーマ（pydanticモデル）
 
         Returns:
             生成されたJSONレスポンス
@@ -196,15 +255,16 @@ class AIClient:
         logger.debug(f"Prompt sent to LLM: {prompt[:200]}...")
 
         if resolved_provider == PROVIDER_OPENAI:
-            return self._generate_openai(prompt, target_model, force_json)
+            return self._generate_openai(prompt, target_model, force_json, response_schema)
         else:
-            return self._generate_local(prompt, target_model)
+            return self._generate_local(prompt, target_model, response_schema)
 
     def _generate_openai(
         self,
         prompt: str,
         model: str,
-        force_json: bool = False
+        force_json: bool = False,
+        response_schema: Optional[Type[BaseModel]] = None
     ) -> Optional[Dict[str, Any]]:
         """Generate response using OpenAI API."""
         if not self.openai_client:
@@ -215,9 +275,7 @@ class AIClient:
             if self._is_reasoning_model(model):
                 # GPT-5 / o1 specific handling
                 response = self.openai_client.responses.create(
-                    model=model,
-                    reasoning={"effort": "medium"},
-                    input=[{"role": "user", "content": prompt}]
+                    **self._reasoning_kwargs(prompt, model, response_schema)
                 )
                 raw_text = self._extract_reasoning_response(response)
             else:
@@ -228,19 +286,103 @@ class AIClient:
                         {"role": "user", "content": prompt}
                     ]
                 }
-                if force_json:
+                if response_schema is not None:
+                    kwargs["response_format"] = {
+                        "type": "json_schema",
+                        "json_schema": self._json_schema_format(response_schema)
+                    }
+                elif force_json:
                     kwargs["response_format"] = {"type": "json_object"}
 
                 response = self.openai_client.chat.completions.create(**kwargs)
                 raw_text = response.choices[0].message.content.strip()
 
             logger.debug(f"OpenAI response: {raw_text[:200]}...")
-            return self._extract_json(raw_text)
+            return self.parse_response(raw_text, response_schema)
 
         except Exception as exc:
             logger.error(f"[✗] OpenAI API request failed: {exc}")
             return None
 
+    async def agenerate_response(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        force_json: bool = False,
+        task_config: Optional[ModelConfig] = None,
+        provider: Optional[str] = None,
+        response_schema: Optional[Type[BaseModel]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        generate_response の非同期版。asyncio.gather で複数リクエストを並行実行できる。
+
+        Args:
+            prompt: プロンプト
+            model: 使用するモデル（指定がなければtask_configまたはデフォルト）
+            force_json: JSON形式を強制するかどうか
+            task_config: タスク設定（ModelConfig）
+            provider: プロバイダー指定（"local" or "openai"）
+            response_schema: 構造化出力のスキーマ（pydanticモデル）
+
+        Returns:
+            生成されたJSONレスポンス
+        """
+        resolved_provider = self._resolve_provider(task_config, provider)
+        target_model = self._resolve_model(task_config, model, resolved_provider)
+
+        logger.info(f"[Router] Provider: {resolved_provider}, Model: {target_model} (async)")
+        logger.debug(f"Prompt sent to LLM: {prompt[:200]}...")
+
+        if resolved_provider == PROVIDER_OPENAI:
+            return await self._agenerate_openai(prompt, target_model, force_json, response_schema)
+        else:
+            # Local LLM uses the blocking client; run it off the event loop
+            return await asyncio.to_thread(self._generate_local, prompt, target_model, response_schema)
+
+    async def _agenerate_openai(
+        self,
+        prompt: str,
+        model: str,
+        force_json: bool = False,
+        response_schema: Optional[Type[BaseModel]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Generate response using the async OpenAI client."""
+        if not self.async_openai_client:
+            logger.error("OpenAI async client not available")
+            return None
+
+        try:
+            if self._is_reasoning_model(model):
+                response = await self.async_openai_client.responses.create(
+                    **self._reasoning_kwargs(prompt, model, response_schema)
+                )
+                raw_text = self._extract_reasoning_response(response)
+            else:
+                kwargs = {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": "You are a helpful assistant."},
+                        {"role": "user", "content": prompt}
+                    ]
+                }
+                if response_schema is not None:
+                    kwargs["response_format"] = {
+                        "type": "json_schema",
+                        "json_schema": self._json_schema_format(response_schema)
+                    }
+                elif force_json:
+                    kwargs["response_format"] = {"type": "json_object"}
+
+                response = await self.async_openai_client.chat.completions.create(**kwargs)
+                raw_text = response.choices[0].message.content.strip()
+
+            logger.debug(f"OpenAI response: {raw_text[:200]}...")
+            return self.parse_response(raw_text, response_schema)
+
+        except Exception as exc:
+            logger.error(f"[✗] OpenAI async API request failed: {exc}")
+            return None
+
     def _extract_reasoning_response(self, response: Any) -> str:
         """Extract text from reasoning model response."""
         raw_text = ""
@@ -266,22 +408,32 @@ class AIClient:
 
         return raw_text
 
-    def _generate_local(self, prompt: str, model: str) -> Optional[Dict[str, Any]]:
+    def _generate_local(
+        self,
+        prompt: str,
+        model: str,
+        response_schema: Optional[Type[BaseModel]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Generate response using local LLM (Ollama)."""
         if not self.local_available:
             logger.error("Local LLM not available")
             return None
 
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if response_schema is not None:
+            # Ollama constrains the output to the given JSON schema
+            payload["format"] = self._json_schema_format(response_schema)["schema"]
+
         try:
             response = requests.post(
                 self.local_api_url,
-                json={"model": model, "prompt": prompt, "stream": False},
+                json=payload,
                 timeout=120,
             )
             response.raise_for_status()
             raw_text = response.json().get("response", "").strip()
             logger.debug(f"Local LLM response: {raw_text[:200]}...")
-            return self._extract_json(raw_text)
+            return self.parse_response(raw_text, response_schema)
 
         except Exception as exc:
             logger.error(f"[✗] Local LLM request failed: {exc}")
@@ -305,6 +457,42 @@ class AIClient:
             provider=provider
         )
 
+    def generate_structured(
+        self,
+        prompt: str,
+        response_schema: Type[BaseModel],
+        model: Optional[str] = None,
+        task_config: Optional[ModelConfig] = None,
+        provider: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        スキーマに沿った構造化出力を生成する（OpenAI: json_schema, Ollama: format）。
+        """
+        return self.generate_response(
+            prompt,
+            model=model,
+            task_config=task_config,
+            provider=provider,
+            response_schema=response_schema
+        )
+
+    async def agenerate_structured(
+        self,
+        prompt: str,
+        response_schema: Type[BaseModel],
+        model: Optional[str] = None,
+        task_config: Optional[ModelConfig] = None,
+        provider: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """generate_structured の非同期版。"""
+        return await self.agenerate_response(
+            prompt,
+            model=model,
+            task_config=task_config,
+            provider=provider,
+            response_schema=response_schema
+        )
+
     # =========================================================================
     # Streaming Methods
     # =========================================================================
@@ -404,13 +592,89 @@ class AIClient:
 
         logger.debug(f"[Embedding Router] Provider: {resolved_provider}, Model: {model}")
 
-        text = text.replace("\n", " ")
+        if "\n" in text:
+            text = text.replace("\n", " ")
 
         if resolved_provider == PROVIDER_OPENAI:
             return self._get_embedding_openai(text, model)
         else:
             return self._get_embedding_local(text, model)
 
+    def get_embeddings_batch(
+        self,
+        texts: List[str],
+        embedding_config: Optional[EmbeddingConfig] = None,
+        provider: Optional[str] = None
+    ) -> List[List[float]]:
+        """
+        複数テキストの埋め込みベクトルを1回のリクエストで生成する。
+
+        Args:
+            texts: 入力テキストのリスト
+            embedding_config: Embedding設定（EmbeddingConfig）
+            provider: プロバイダー指定（"local" or "openai"）
+
+        Returns:
+            入力順に並んだ埋め込みベクトルのリスト（失敗時は空リスト要素）
+        """
+        if not texts:
+            return []
+
+        if embedding_config is None:
+            embedding_config = get_active_embedding_config()
+
+        resolved_provider = self._resolve_provider(embedding_config, provider)
+        model = embedding_config.model if embedding_config else settings.CLOUD_EMBEDDING_MODEL
+
+        logger.debug(f"[Embedding Router] Batch of {len(texts)}, Provider: {resolved_provider}, Model: {model}")
+
+        inputs = [text.replace("\n", " ") if "\n" in text else text for text in texts]
+
+        if resolved_provider == PROVIDER_OPENAI:
+            return self._get_embeddings_batch_openai(inputs, model)
+        else:
+            return self._get_embeddings_batch_local(inputs, model)
+
+    def _get_embeddings_batch_openai(self, texts: List[str], model: str) -> List[List[float]]:
+        """Get embeddings for several texts from OpenAI API in one request."""
+        if not self.openai_client:
+            logger.error("OpenAI client not available for embeddings")
+            return [[] for _ in texts]
+
+        try:
+            response = self.openai_client.embeddings.create(input=texts, model=model)
+            vectors: List[List[float]] = [[] for _ in texts]
+            for item in response.data:
+                vectors[item.index] = item.embedding
+            return vectors
+        except Exception as exc:
+            logger.error(f"[✗] OpenAI batch embedding request failed: {exc}")
+            return [[] for _ in texts]
+
+    def _get_embeddings_batch_local(self, texts: List[str], model: str) -> List[List[float]]:
+        """Get embeddings for several texts from local LLM (Ollama) in one request."""
+        if not self.local_available:
+            logger.error("Local LLM not available for embeddings")
+            return [[] for _ in texts]
+
+        try:
+            response = requests.post(
+                self.local_embedding_url,
+                json={"model": model, "input": texts},
+                timeout=60,
+            )
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings", [])
+            if len(embeddings) == len(texts):
+                return embeddings
+
+            logger.warning(f"Unexpected batch embedding count: {len(embeddings)} for {len(texts)} inputs")
+            return [[] for _ in texts]
+
+        except Exception as exc:
+            logger.error(f"[✗] Local LLM batch embedding request failed: {exc}")
+            return [[] for _ in texts]
+
     def _get_embedding_openai(self, text: str, model: str) -> List[float]:
         """Get embedding from OpenAI API."""
         if not self.openai_client:
@@ -1,8 +1,7 @@
 import json
-from pathlib import Path
 from typing import Dict, Any
-from langchain_core.prompts import PromptTemplate
 from app.api.ai_client import AIClient
+from app.utils.prompt_loader import load_prompt_template
 from config import MODEL_GAP_ANALYSIS
 
 class GapAnalyzer:
@@ -12,8 +11,7 @@ class GapAnalyzer:
     """
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/gap_analysis.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("gap_analysis.txt")
 
     def analyze(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
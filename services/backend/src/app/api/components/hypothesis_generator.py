@@ -1,8 +1,7 @@
 import json
-from pathlib import Path
 from typing import Dict, Any
-from langchain_core.prompts import PromptTemplate
 from app.api.ai_client import AIClient
+from app.utils.prompt_loader import load_prompt_template
 from config import MODEL_HYPOTHESIS_GENERATION
 
 class HypothesisGenerator:
@@ -12,9 +11,7 @@ class HypothesisGenerator:
     """
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        # プロンプトファイルのパス解決 (project_root/static/prompts/hypothesis_generation.txt)
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/hypothesis_generation.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("hypothesis_generation.txt")
 
     def generate(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
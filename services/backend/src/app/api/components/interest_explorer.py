@@ -1,15 +1,13 @@
 import json
-from pathlib import Path
 from typing import Dict, Any
 from app.api.ai_client import AIClient
+from app.utils.prompt_loader import load_prompt_text
 from config import MODEL_INTEREST_EXPLORATION
 
 class InterestExplorer:
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/interest_exploration.txt"
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            self.base_prompt = f.read()
+        self.base_prompt = load_prompt_text("interest_exploration.txt")
 
     def explore(self, context: Dict[str, Any]) -> Dict[str, Any]:
         prompt = self._create_prompt(context)
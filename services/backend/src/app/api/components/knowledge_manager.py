@@ -4,12 +4,17 @@ import hashlib
 import uuid
 import logging
 from typing import List, Dict, Any, Optional
+import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance, ScoredPoint, Filter, FieldCondition, MatchValue
+from qdrant_client.models import (
+    PointStruct, PointVectors, VectorParams, Distance, ScoredPoint, Filter, FieldCondition, MatchValue,
+    BinaryQuantization, BinaryQuantizationConfig,
+)
 
 from app.api.db import DBClient
 from app.api.ai_client import AIClient
 from app.api.components.graph_manager import GraphManager
+from app.api.components.rag_manager import RAGManager
 from config import (
     EMBEDDING_DIMENSION,
     EmbeddingConfig,
@@ -23,6 +28,15 @@ from config import (
 logger = logging.getLogger(__name__)
 
 
+def _as_vec(vector: Any) -> np.ndarray:
+    """
+    Convert an embedding to a contiguous float32 buffer.
+    qdrant-client serializes numpy arrays in bulk instead of iterating
+    Python floats, which matters for 1536/3072-dim batch uploads.
+    """
+    return np.ascontiguousarray(vector, dtype=np.float32)
+
+
 class KnowledgeManager:
     """
     Manages the knowledge base (Second Brain) including User Context (L1),
@@ -181,14 +195,30 @@ class KnowledgeManager:
                 self.qdrant_client.create_collection(
                     collection_name=target_collection,
                     vectors_config=VectorParams(size=target_size, distance=Distance.COSINE),
+                    # 1-bit vectors kept in RAM; searches rescore with the original vectors
+                    quantization_config=BinaryQuantization(
+                        binary=BinaryQuantizationConfig(always_ram=True)
+                    ),
                 )
                 logger.info(f"Created collection: {target_collection} with dimension {target_size}")
             except Exception as e:
-                if "already exists" in str(e) or "Conflict" in str(e):
-                    pass
-                else:
-                    logger.error(f"[!] Failed to create collection: {e}")
-                    raise e
+                # Another worker may have created it concurrently
+                if self.qdrant_client.collection_exists(target_collection):
+                    return
+                logger.error(f"[!] Failed to create collection: {e}")
+                raise e
+
+    @staticmethod
+    def _verify_update(update_result: Any, collection: str, point_id: str) -> None:
+        """
+        Log upserts that Qdrant neither acknowledged nor completed.
+        With wait=False the write is applied asynchronously by the server,
+        so this only catches requests that were rejected up front.
+        """
+        status = getattr(update_result, "status", None)
+        status_value = getattr(status, "value", status)
+        if status_value not in ("acknowledged", "completed"):
+            logger.warning(f"[!] Qdrant upsert not confirmed for {point_id} in {collection}: {status_value}")
 
     def add_user_memory(
         self,
@@ -197,7 +227,8 @@ class KnowledgeManager:
         memory_type: str = "user_hypothesis",
         category: str = None,
         meta: Dict[str, Any] = None,
-        embedding_config: Optional[EmbeddingConfig] = None
+        embedding_config: Optional[EmbeddingConfig] = None,
+        wait: bool = False
     ) -> bool:
         """
         L1/L2: Save private user memory or AI insight.
@@ -209,6 +240,8 @@ class KnowledgeManager:
             category: Optional category
             meta: Additional metadata
             embedding_config: Optional embedding config (default: TASK_USER_DOCUMENT_EMBEDDING)
+            wait: Block until Qdrant has applied the write. Only needed for
+                  read-your-writes flows such as duplicate checks.
         """
         config = embedding_config or TASK_USER_DOCUMENT_EMBEDDING
         collection = self._generate_collection_name(config)
@@ -232,15 +265,17 @@ class KnowledgeManager:
         }
 
         try:
-            self.qdrant_client.upsert(
+            update_result = self.qdrant_client.upsert(
                 collection_name=collection,
-                wait=True,
+                wait=wait,
                 points=[PointStruct(
                     id=entry_id,
                     vector=vector,
                     payload=payload
                 )]
             )
+            self._verify_update(update_result, collection, entry_id)
+            RAGManager.invalidate_cached_results(collection, user_id)
 
             # Sync to Knowledge Graph if applicable
             if category and category != "General":
@@ -280,10 +315,15 @@ class KnowledgeManager:
         content: str,
         source: str = "system",
         meta: Dict[str, Any] = None,
-        embedding_config: Optional[EmbeddingConfig] = None
+        embedding_config: Optional[EmbeddingConfig] = None,
+        wait: bool = False
     ) -> bool:
         """
         L3: Save shared public fact.
+
+        Args:
+            wait: Block until Qdrant has applied the write. Only needed for
+                  read-your-writes flows such as duplicate checks.
         """
         config = embedding_config or self._embedding_config
         collection = self._generate_collection_name(config)
@@ -307,15 +347,17 @@ class KnowledgeManager:
         }
 
         try:
-            self.qdrant_client.upsert(
+            update_result = self.qdrant_client.upsert(
                 collection_name=collection,
-                wait=True,
+                wait=wait,
                 points=[PointStruct(
                     id=entry_id,
                     vector=vector,
                     payload=payload
                 )]
             )
+            self._verify_update(update_result, collection, entry_id)
+            RAGManager.invalidate_cached_results(collection)
             return True
         except Exception as e:
             logger.error(f"[✗] Qdrant upsert failed: {e}")
@@ -342,10 +384,8 @@ class KnowledgeManager:
         vector_size = config.dimension
 
         self._setup_qdrant_collection(collection, vector_size)
-        points = []
-
-        # Use a zero vector of the correct dimension
-        dummy_vector = [0.0] * vector_size
+        ids = []
+        payloads = []
 
         for item in items:
             content = item.get("content", "")
@@ -380,21 +420,21 @@ class KnowledgeManager:
                 }
             }
 
-            points.append(PointStruct(
-                id=item_id,
-                vector=dummy_vector,
-                payload=payload
-            ))
+            ids.append(item_id)
+            payloads.append(payload)
 
-        if points:
+        if ids:
             try:
-                self.qdrant_client.upsert(
+                # Zero vectors of the correct dimension, filled in later by process_pending_embeddings
+                self.qdrant_client.upload_collection(
                     collection_name=collection,
-                    wait=False,
-                    points=points
+                    vectors=np.zeros((len(ids), vector_size), dtype=np.float32),
+                    payload=payloads,
+                    ids=ids,
+                    wait=False
                 )
-                logger.info(f"Imported {len(points)} items to collection: {collection}")
-                return {"status": "success", "count": len(points), "collection": collection}
+                logger.info(f"Imported {len(ids)} items to collection: {collection}")
+                return {"status": "success", "count": len(ids), "collection": collection}
             except Exception as e:
                 logger.error(f"[✗] Raw import failed: {e}")
                 return {"status": "error", "message": str(e)}
@@ -429,19 +469,19 @@ class KnowledgeManager:
         )
 
         try:
+            # Only the fields needed to build the embedding text are fetched
             scroll_result, _ = self.qdrant_client.scroll(
                 collection_name=collection,
                 scroll_filter=filter_condition,
                 limit=batch_size,
-                with_payload=True,
+                with_payload=["content", "meta.title"],
                 with_vectors=False
             )
 
-            processed_count = 0
-            points_to_update = []
+            point_vectors = []
 
             for point in scroll_result:
-                payload = point.payload
+                payload = point.payload or {}
                 meta = payload.get("meta", {})
 
                 title = meta.get("title", "")
@@ -453,22 +493,26 @@ class KnowledgeManager:
                 vector = self.ai_client.get_embedding(text_to_embed, embedding_config=config)
 
                 if vector:
-                    meta["is_embedded"] = True
-                    payload["meta"] = meta
-
-                    points_to_update.append(PointStruct(
-                        id=point.id,
-                        vector=vector,
-                        payload=payload
-                    ))
-                    processed_count += 1
-
-            if points_to_update:
-                self.qdrant_client.upsert(
+                    point_vectors.append(PointVectors(id=point.id, vector=vector))
+
+            processed_count = len(point_vectors)
+
+            if point_vectors:
+                # Partial updates: send the new vectors and flip the flag
+                # without re-uploading the (potentially large) payload.
+                self.qdrant_client.update_vectors(
+                    collection_name=collection,
+                    points=point_vectors,
+                    wait=True
+                )
+                self.qdrant_client.set_payload(
                     collection_name=collection,
-                    wait=True,
-                    points=points_to_update
+                    payload={"is_embedded": True},
+                    points=[pv.id for pv in point_vectors],
+                    key="meta",
+                    wait=True
                 )
+                RAGManager.invalidate_cached_results(collection)
 
             return {"status": "success", "processed": processed_count, "collection": collection}
 
@@ -485,7 +529,10 @@ class KnowledgeManager:
 
         success_count = 0
         error_count = 0
-        points = []
+        ids = []
+        vectors = []
+        payloads = []
+        db_entries = []
 
         for entry in catalog_data:
             try:
@@ -493,8 +540,7 @@ class KnowledgeManager:
                 md5_hash = hashlib.md5(unique_str.encode()).hexdigest()
                 entry_id = str(uuid.UUID(hex=md5_hash))
                 entry["id"] = entry_id
-
-                self.db_client.insert_service_catalog_entry(entry)
+                db_entries.append(entry)
 
                 text_to_embed = f"{entry.get('タイトル', '')} {entry.get('サービス内容', '')} {entry.get('対象者', '')} {entry.get('条件・申し込み方法', '')}"
                 vector = self.ai_client.get_embedding(text_to_embed, embedding_config=self._embedding_config)
@@ -513,11 +559,9 @@ class KnowledgeManager:
                         }
                     }
 
-                    points.append(PointStruct(
-                        id=entry_id,
-                        vector=vector,
-                        payload=payload
-                    ))
+                    ids.append(entry_id)
+                    vectors.append(_as_vec(vector))
+                    payloads.append(payload)
                     success_count += 1
                 else:
                     error_count += 1
@@ -526,13 +570,28 @@ class KnowledgeManager:
                 logger.error(f"[✗] Error processing entry {entry.get('タイトル')}: {e}")
                 error_count += 1
 
-        if points:
+        # Single multi-row upsert instead of one round-trip per entry
+        written = self.db_client.insert_service_catalog_entries(db_entries)
+        if written < len(db_entries):
+            # The upsert is one transaction, so a failure leaves no entry in MySQL;
+            # skip Qdrant rather than index services that cannot be looked up
+            return {
+                "status": "partial_failure",
+                "success": 0,
+                "error": len(catalog_data),
+                "db_error": f"Stored {written} of {len(db_entries)} catalog entries in MySQL"
+            }
+
+        if ids:
             try:
-                self.qdrant_client.upsert(
+                self.qdrant_client.upload_collection(
                     collection_name=self._collection_name,
-                    wait=True,
-                    points=points
+                    vectors=np.stack(vectors),
+                    payload=payloads,
+                    ids=ids,
+                    wait=True
                 )
+                RAGManager.invalidate_cached_results(self._collection_name)
             except Exception as e:
                 return {"status": "partial_failure", "success": success_count, "error": error_count, "qdrant_error": str(e)}
 
@@ -556,6 +615,7 @@ class KnowledgeManager:
             if self.qdrant_client.collection_exists(collection):
                 self.qdrant_client.delete_collection(collection)
                 self._setup_qdrant_collection(collection, config.dimension)
+                RAGManager.invalidate_cached_results(collection)
                 qdrant_success = True
             else:
                 self._setup_qdrant_collection(collection, config.dimension)
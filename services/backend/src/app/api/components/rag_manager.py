@@ -1,10 +1,20 @@
 import os
+import hashlib
+import functools
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from cachetools import TTLCache
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector
+from qdrant_client.models import (
+    Filter, FieldCondition, MatchValue, FilterSelector, QueryRequest,
+    SearchParams, QuantizationSearchParams, PayloadSchemaType, PayloadSelectorInclude,
+)
 from app.api.db import DBClient
 from app.api.ai_client import AIClient
+from app.utils.semantic_cache import SemanticResultCache
 from config import (
     EmbeddingConfig,
     TASK_RAG_SEARCH_EMBEDDING,
@@ -15,6 +25,176 @@ from config import (
 logger = logging.getLogger(__name__)
 
 
+# Qdrant clients shared across RAGManager instances (one connection pool per endpoint)
+_CLIENT_CACHE: Dict[Tuple[str, int], QdrantClient] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
+
+
+def _get_qdrant_client(host: str, port: int) -> QdrantClient:
+    """
+    Return the shared QdrantClient for host/port, creating it on first use.
+
+    With QDRANT_PREFER_GRPC enabled the client talks gRPC (persistent HTTP/2
+    streams, binary payloads) on QDRANT_GRPC_PORT.
+    """
+    key = (host, port)
+    client = _CLIENT_CACHE.get(key)
+    if client is not None:
+        return client
+
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            if QDRANT_PREFER_GRPC:
+                client = QdrantClient(
+                    host=host,
+                    port=port,
+                    grpc_port=QDRANT_GRPC_PORT,
+                    prefer_grpc=True,
+                    grpc_options={"grpc.max_receive_message_length": 64 << 20}
+                )
+            else:
+                client = QdrantClient(host=host, port=port)
+            _CLIENT_CACHE[key] = client
+        return client
+
+
+# Search over binary-quantized vectors, oversample and rescore with full precision
+_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0)
+)
+
+# Payload projections: only the fields the result formatters read are transferred
+_KNOWLEDGE_PAYLOAD = PayloadSelectorInclude(
+    include=["visibility", "type", "content", "meta.title", "meta.file_id", "meta.url", "meta.source"]
+)
+_TEXT_SEARCH_PAYLOAD = PayloadSelectorInclude(
+    include=["visibility", "type", "content", "meta.title", "meta.url"]
+)
+
+# Prepared knowledge query: only query/filter change per request. model_copy skips
+# re-validating the constant fields and the (large) query vector.
+_KNOWLEDGE_QUERY_TEMPLATE = QueryRequest(
+    params=_SEARCH_PARAMS,
+    limit=5,
+    with_payload=_KNOWLEDGE_PAYLOAD
+)
+
+# Public-only visibility filter for anonymous searches (no user_id)
+_PUBLIC_ONLY_FILTER = Filter(
+    must=[
+        FieldCondition(key="visibility", match=MatchValue(value="public"))
+    ]
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_search_filter(user_id: str, category: Optional[str], require_user: bool) -> Filter:
+    """
+    Build (and memoize) the search filter for a user/category.
+
+    require_user=True: Public OR (Private AND current_user)
+    require_user=False: Public only
+
+    The returned Filter is shared between calls and must not be mutated.
+    """
+    if require_user:
+        visibility_filter = Filter(
+            should=[
+                FieldCondition(key="visibility", match=MatchValue(value="public")),
+                Filter(
+                    must=[
+                        FieldCondition(key="visibility", match=MatchValue(value="private")),
+                        FieldCondition(key="user_id", match=MatchValue(value=user_id))
+                    ]
+                )
+            ]
+        )
+    else:
+        visibility_filter = _PUBLIC_ONLY_FILTER
+
+    if not category:
+        return visibility_filter
+
+    return Filter(
+        must=[
+            visibility_filter,
+            FieldCondition(key="category", match=MatchValue(value=category))
+        ]
+    )
+
+
+@dataclass
+class SearchHit:
+    """
+    Knowledge search hit kept in the result cache.
+
+    Slotted (no per-instance __dict__) since cached result sets are long-lived;
+    converted to the retrieval evidence dict only when returned.
+    """
+    __slots__ = ("source_type", "type", "content", "meta", "title", "file_id", "score")
+
+    source_type: str
+    type: Optional[str]
+    content: Optional[str]
+    meta: Dict[str, Any]
+    title: Optional[str]
+    file_id: Optional[str]
+    score: float
+
+    def to_dict(self, hypothesis_id: Any) -> Dict[str, Any]:
+        return {
+            "hypothesis_id": hypothesis_id,
+            "source_type": self.source_type,
+            "type": self.type,
+            "content": self.content,
+            "meta": self.meta,
+            "title": self.title,
+            "file_id": self.file_id,
+            "score": self.score
+        }
+
+
+@dataclass
+class TextSearchHit:
+    """Direct text search hit kept in the result cache (see SearchHit)."""
+    __slots__ = ("id", "content", "type", "visibility", "meta", "title", "score")
+
+    id: str
+    content: Optional[str]
+    type: Optional[str]
+    visibility: Optional[str]
+    meta: Dict[str, Any]
+    title: Optional[str]
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "content": self.content,
+            "type": self.type,
+            "visibility": self.visibility,
+            "meta": self.meta,
+            "title": self.title,
+            "score": self.score
+        }
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that counts capacity evictions for monitoring."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+
+    def popitem(self):
+        self.evictions += 1
+        return super().popitem()
+
+
 class RAGManager:
     """
     RAG（検索拡張生成）管理コンポーネント。
@@ -25,6 +205,29 @@ class RAGManager:
 
     BASE_COLLECTION_NAME = "knowledge_base"
 
+    # Query embedding cache (keys include provider/model, so it survives config switches)
+    EMBEDDING_CACHE_MAXSIZE = 2048
+    EMBEDDING_CACHE_TTL = 600
+
+    # Seconds before a cached collection_exists result is re-checked
+    COLLECTION_CHECK_TTL = 60
+
+    # Payload fields used in search filters; indexed so filtering happens inside HNSW traversal
+    PAYLOAD_INDEX_FIELDS = ("visibility", "user_id", "category")
+
+    # Collections whose payload indexes have been ensured by this process
+    _ensured_indexes = set()
+
+    # Near-duplicate query results, shared across instances (buckets include the collection).
+    # Writes in this process clear the affected buckets via invalidate_cached_results;
+    # writes from other processes (e.g. Celery workers) become visible after the TTL.
+    _result_cache = SemanticResultCache(ttl=300)
+
+    # Query embeddings, shared across instances since a RAGManager is built per request/task
+    _emb_cache = _CountingTTLCache(maxsize=EMBEDDING_CACHE_MAXSIZE, ttl=EMBEDDING_CACHE_TTL)
+    _emb_cache_lock = threading.RLock()
+    _emb_cache_stats = {"hits": 0, "misses": 0}
+
     def __init__(
         self,
         ai_client: AIClient,
@@ -39,19 +242,35 @@ class RAGManager:
         """
         self.qdrant_host = os.getenv("QDRANT_HOST", "localhost")
         self.qdrant_port = int(os.getenv("QDRANT_PORT", 6333))
-        self.qdrant_client = QdrantClient(host=self.qdrant_host, port=self.qdrant_port)
+        self.qdrant_client = _get_qdrant_client(self.qdrant_host, self.qdrant_port)
         self.db_client = DBClient()
         self.ai_client = ai_client
 
         # Set embedding configuration
         self._embedding_config = embedding_config or TASK_RAG_SEARCH_EMBEDDING
         self._collection_name = self._generate_collection_name(self._embedding_config)
+        self._collection_exists: Optional[bool] = None
+        self._collection_checked_at = 0.0
 
         logger.info(
             f"RAGManager initialized with collection: {self._collection_name}, "
             f"provider: {self._embedding_config.provider}"
         )
 
+    @classmethod
+    def invalidate_cached_results(cls, collection_name: str, user_id: Optional[str] = None) -> None:
+        """
+        Drop cached search results for a collection after it was written to.
+
+        Args:
+            collection_name: Collection that changed
+            user_id: Owner of a private write; None for public writes, which every user can see
+        """
+        # Bucket keys are (kind, collection, user_id, ...)
+        cls._result_cache.discard(
+            lambda key: key[1] == collection_name and (user_id is None or key[2] == user_id)
+        )
+
     @property
     def collection_name(self) -> str:
         """Get current collection name."""
@@ -75,8 +294,46 @@ class RAGManager:
         """
         self._embedding_config = embedding_config
         self._collection_name = self._generate_collection_name(embedding_config)
+        self._collection_exists = None
         logger.info(f"RAGManager switched to collection: {self._collection_name}")
 
+    def _ensure_collection(self) -> bool:
+        """
+        Return whether the current collection exists.
+
+        The result is cached and re-checked after COLLECTION_CHECK_TTL seconds,
+        so a collection created later is picked up without a restart.
+        """
+        now = time.monotonic()
+        if self._collection_exists is None or now - self._collection_checked_at > self.COLLECTION_CHECK_TTL:
+            self._collection_exists = self.qdrant_client.collection_exists(self._collection_name)
+            self._collection_checked_at = now
+            if self._collection_exists:
+                self._ensure_payload_indexes()
+        return self._collection_exists
+
+    def _ensure_payload_indexes(self) -> None:
+        """Create keyword payload indexes for the filter fields (once per collection)."""
+        if self._collection_name in self._ensured_indexes:
+            return
+
+        try:
+            existing = self.qdrant_client.get_collection(self._collection_name).payload_schema or {}
+            for field_name in self.PAYLOAD_INDEX_FIELDS:
+                if field_name in existing:
+                    continue
+                self.qdrant_client.create_payload_index(
+                    collection_name=self._collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+        except Exception as e:
+            # Retried on the next collection check
+            logger.warning(f"[!] Failed to ensure payload indexes on {self._collection_name}: {e}")
+            return
+
+        self._ensured_indexes.add(self._collection_name)
+
     def retrieve_knowledge(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         仮説に基づいて知識を検索する。
@@ -89,101 +346,184 @@ class RAGManager:
         interest_profile = context.get("interest_profile", {})
         current_category = interest_profile.get("current_category")
 
-        for hypothesis in hypotheses:
-            if isinstance(hypothesis, dict) and hypothesis.get("should_call_rag"):
-                results = self._search_knowledge(hypothesis, user_id, category=current_category)
-                retrieval_evidence["results"].extend(results)
+        eligible = [
+            h for h in hypotheses
+            if isinstance(h, dict) and h.get("should_call_rag")
+            and (h.get("search_query") or h.get("statement"))
+        ]
+
+        if eligible:
+            retrieval_evidence["results"] = self._search_knowledge_batch(
+                eligible, user_id, category=current_category
+            )
 
         context["retrieval_evidence"] = retrieval_evidence
         return context
 
-    def _get_embedding(self, text: str) -> List[float]:
-        """Get embedding using configured provider and model."""
-        text = text.replace("\n", " ")
-        return self.ai_client.get_embedding(text, embedding_config=self._embedding_config)
-
-    def _search_knowledge(
+    def _search_knowledge_batch(
         self,
-        hypothesis: Dict[str, Any],
+        hypotheses: List[Dict[str, Any]],
         user_id: str,
         category: str = None
     ) -> List[Dict[str, Any]]:
         """
-        仮説に基づいて知識を検索する（権限フィルタ + カテゴリフィルタ付き）。
+        複数の仮説に対する知識検索を一括で行う。
+        同じ検索文の仮説はまとめ、Embeddingは1リクエスト、Qdrant検索は query_batch_points 1回にまとめる。
         """
-        query_text = hypothesis.get("search_query") or hypothesis.get("statement")
-
-        if not query_text:
-            return []
-
-        # Check if collection exists
-        if not self.qdrant_client.collection_exists(self._collection_name):
+        if not self._ensure_collection():
             logger.warning(f"Collection {self._collection_name} does not exist")
             return []
 
         try:
-            query_vector = self._get_embedding(query_text)
-
-            if not query_vector:
-                logger.warning("Failed to generate query embedding")
-                return []
-
-            # Base Visibility Filter: Public OR (Private AND current_user)
-            visibility_filter = Filter(
-                should=[
-                    FieldCondition(key="visibility", match=MatchValue(value="public")),
-                    Filter(
-                        must=[
-                            FieldCondition(key="visibility", match=MatchValue(value="private")),
-                            FieldCondition(key="user_id", match=MatchValue(value=user_id))
-                        ]
-                    )
-                ]
-            )
-
-            # Apply Category Filter if present
-            if category:
-                search_filter = Filter(
-                    must=[
-                        visibility_filter,
-                        FieldCondition(key="category", match=MatchValue(value=category))
+            # Hypotheses sharing the same query text are embedded and searched once
+            queries_by_text: Dict[str, List[Dict[str, Any]]] = {}
+            for h in hypotheses:
+                queries_by_text.setdefault(h.get("search_query") or h.get("statement"), []).append(h)
+
+            texts = list(queries_by_text)
+            vectors = self._get_embeddings(texts)
+
+            search_filter = _build_search_filter(user_id, category, True)
+            cache_key = ("knowledge", self._collection_name, user_id, category)
+
+            # Resolve from the semantic cache first; only misses go to Qdrant
+            hits_per_text: List[List[SearchHit]] = []
+            pending = []
+            for idx, vector in enumerate(vectors):
+                if not vector:
+                    logger.warning("Failed to generate query embedding")
+                    hits_per_text.append([])
+                    continue
+
+                cached = self._result_cache.get(cache_key, vector)
+                if cached is not None:
+                    hits_per_text.append(cached)
+                else:
+                    hits_per_text.append([])
+                    pending.append(idx)
+
+            if pending:
+                responses = self.qdrant_client.query_batch_points(
+                    collection_name=self._collection_name,
+                    requests=[
+                        _KNOWLEDGE_QUERY_TEMPLATE.model_copy(
+                            update={"query": vectors[idx], "filter": search_filter}
+                        )
+                        for idx in pending
                     ]
                 )
-            else:
-                search_filter = visibility_filter
-
-            search_result = self.qdrant_client.query_points(
-                collection_name=self._collection_name,
-                query=query_vector,
-                query_filter=search_filter,
-                limit=5
-            )
+                for idx, response in zip(pending, responses):
+                    hits = [self._format_knowledge_hit(hit) for hit in response.points]
+                    self._result_cache.put(cache_key, vectors[idx], hits)
+                    hits_per_text[idx] = hits
 
+            # Fan results back out to every hypothesis, in the original order
+            hits_by_text = dict(zip(texts, hits_per_text))
             results = []
-            for hit in search_result.points:
-                payload = hit.payload
-                source_type = "public_fact" if payload.get("visibility") == "public" else "private_memory"
-                meta = payload.get("meta") or {}
-
-                title = meta.get("title")
-                file_id = meta.get("file_id")
-
-                results.append({
-                    "hypothesis_id": hypothesis.get("id"),
-                    "source_type": source_type,
-                    "type": payload.get("type"),
-                    "content": payload.get("content"),
-                    "meta": meta,
-                    "title": title,
-                    "file_id": file_id,
-                    "score": hit.score
-                })
+            for h in hypotheses:
+                hits = hits_by_text[h.get("search_query") or h.get("statement")]
+                results.extend(hit.to_dict(h.get("id")) for hit in hits)
             return results
 
         except Exception as e:
-            logger.error(f"[✗] RAG Search Error: {e}")
+            logger.error(f"[✗] RAG Batch Search Error: {e}")
             return []
 
+    def _embedding_cache_key(self, text: str) -> tuple:
+        """Cache key for a normalized query text under the current embedding model."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return (self._embedding_config.provider, self._embedding_config.model, digest)
+
+    def _get_embedding(self, text: str) -> List[float]:
+        """Get embedding using configured provider and model (LRU+TTL cached)."""
+        if "\n" in text:
+            text = text.replace("\n", " ")
+        key = self._embedding_cache_key(text)
+
+        with self._emb_cache_lock:
+            cached = self._emb_cache.get(key)
+            if cached is not None:
+                self._emb_cache_stats["hits"] += 1
+                return cached
+            self._emb_cache_stats["misses"] += 1
+
+        vector = self.ai_client.get_embedding(text, embedding_config=self._embedding_config)
+
+        # Failed embeddings are not cached so the next call retries
+        if vector:
+            with self._emb_cache_lock:
+                self._emb_cache[key] = vector
+        return vector
+
+    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for several texts; cache misses are fetched in one batch request."""
+        normalized = [text.replace("\n", " ") if "\n" in text else text for text in texts]
+        keys = [self._embedding_cache_key(text) for text in normalized]
+        vectors: List[List[float]] = [[] for _ in normalized]
+        missing: Dict[tuple, List[int]] = {}
+
+        with self._emb_cache_lock:
+            for idx, key in enumerate(keys):
+                cached = self._emb_cache.get(key)
+                if cached is not None:
+                    self._emb_cache_stats["hits"] += 1
+                    vectors[idx] = cached
+                else:
+                    self._emb_cache_stats["misses"] += 1
+                    missing.setdefault(key, []).append(idx)
+
+        if missing:
+            miss_texts = [normalized[indices[0]] for indices in missing.values()]
+            fetched = self.ai_client.get_embeddings_batch(
+                miss_texts, embedding_config=self._embedding_config
+            )
+            with self._emb_cache_lock:
+                for (key, indices), vector in zip(missing.items(), fetched):
+                    if vector:
+                        self._emb_cache[key] = vector
+                    for idx in indices:
+                        vectors[idx] = vector
+
+        return vectors
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get embedding cache statistics for monitoring.
+
+        Returns:
+            Dictionary with hits, misses, evictions, hit_rate, current size and maxsize
+        """
+        with self._emb_cache_lock:
+            hits = self._emb_cache_stats["hits"]
+            misses = self._emb_cache_stats["misses"]
+            total = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "evictions": self._emb_cache.evictions,
+                "hit_rate": hits / total if total else 0.0,
+                "size": self._emb_cache.currsize,
+                "maxsize": self._emb_cache.maxsize,
+                "semantic_results": self._result_cache.stats(),
+            }
+
+    @staticmethod
+    def _format_knowledge_hit(hit: Any) -> SearchHit:
+        """Convert a Qdrant hit into a retrieval evidence entry."""
+        payload = hit.payload
+        source_type = "public_fact" if payload.get("visibility") == "public" else "private_memory"
+        meta = payload.get("meta") or {}
+
+        return SearchHit(
+            source_type,
+            payload.get("type"),
+            payload.get("content"),
+            meta,
+            meta.get("title"),
+            meta.get("file_id"),
+            hit.score
+        )
+
     def search_by_text(
         self,
         query_text: str,
@@ -208,7 +548,7 @@ class RAGManager:
         if not query_text:
             return []
 
-        if not self.qdrant_client.collection_exists(self._collection_name):
+        if not self._ensure_collection():
             logger.warning(f"Collection {self._collection_name} does not exist")
             return []
 
@@ -219,58 +559,40 @@ class RAGManager:
                 logger.warning("Failed to generate query embedding")
                 return []
 
-            # Build visibility filter
-            visibility_filter = Filter(
-                should=[
-                    FieldCondition(key="visibility", match=MatchValue(value="public")),
-                    Filter(
-                        must=[
-                            FieldCondition(key="visibility", match=MatchValue(value="private")),
-                            FieldCondition(key="user_id", match=MatchValue(value=user_id))
-                        ]
-                    )
-                ]
-            ) if user_id else Filter(
-                must=[
-                    FieldCondition(key="visibility", match=MatchValue(value="public"))
-                ]
-            )
+            search_filter = _build_search_filter(user_id, category, bool(user_id))
 
-            # Apply category filter if specified
-            if category:
-                search_filter = Filter(
-                    must=[
-                        visibility_filter,
-                        FieldCondition(key="category", match=MatchValue(value=category))
-                    ]
-                )
-            else:
-                search_filter = visibility_filter
+            cache_key = ("text", self._collection_name, user_id, category, limit, score_threshold)
+            cached = self._result_cache.get(cache_key, query_vector)
+            if cached is not None:
+                return [h.to_dict() for h in cached]
 
             search_result = self.qdrant_client.query_points(
                 collection_name=self._collection_name,
                 query=query_vector,
                 query_filter=search_filter,
+                search_params=_SEARCH_PARAMS,
+                with_payload=_TEXT_SEARCH_PAYLOAD,
                 limit=limit,
                 score_threshold=score_threshold
             )
 
-            results = []
+            hits = []
             for hit in search_result.points:
                 payload = hit.payload
                 meta = payload.get("meta") or {}
 
-                results.append({
-                    "id": str(hit.id),
-                    "content": payload.get("content"),
-                    "type": payload.get("type"),
-                    "visibility": payload.get("visibility"),
-                    "meta": meta,
-                    "title": meta.get("title"),
-                    "score": hit.score
-                })
-
-            return results
+                hits.append(TextSearchHit(
+                    str(hit.id),
+                    payload.get("content"),
+                    payload.get("type"),
+                    payload.get("visibility"),
+                    meta,
+                    meta.get("title"),
+                    hit.score
+                ))
+
+            self._result_cache.put(cache_key, query_vector, hits)
+            return [h.to_dict() for h in hits]
 
         except Exception as e:
             logger.error(f"[✗] RAG text search error: {e}")
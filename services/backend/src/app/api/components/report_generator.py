@@ -1,7 +1,7 @@
 import json
-from pathlib import Path
 from typing import Dict, Any
 from app.api.ai_client import AIClient
+from app.utils.prompt_loader import load_prompt_text
 from config import MODEL_REPORT_GENERATION
 
 class ReportGenerator:
@@ -10,9 +10,7 @@ class ReportGenerator:
     """
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/report_generation.txt"
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            self.base_prompt = f.read()
+        self.base_prompt = load_prompt_text("report_generation.txt")
 
     def generate(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1,9 +1,8 @@
 import json
 import logging
-from pathlib import Path
 from typing import Dict, Any, Tuple
-from langchain_core.prompts import PromptTemplate
 from app.api.ai_client import AIClient
+from app.utils.prompt_loader import load_prompt_template
 from config import MODEL_RESPONSE_PLANNING, MODEL_FAST, MODEL_SMART
 
 logger = logging.getLogger(__name__)
@@ -15,9 +14,7 @@ class ResponsePlanner:
     """
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        # プロンプトファイルのパス解決 (project_root/static/prompts/response_planning.txt)
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/response_planning.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("response_planning.txt")
 
     def plan_response(self, context: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
         """
@@ -1,10 +1,9 @@
 import json
 import logging
 import numpy as np
-from pathlib import Path
 from typing import Dict, Any, List
-from langchain_core.prompts import PromptTemplate
 from app.api.ai_client import AIClient
+from app.utils.prompt_loader import load_prompt_template
 from app.api.state_manager import StateManager
 from config import MODEL_SITUATION_ANALYSIS
 
@@ -31,9 +30,7 @@ class SituationAnalyzer:
 
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        # プロンプトファイルのパス解決
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/situation_analysis.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("situation_analysis.txt")
 
         # アンカーベクトルの初期化
         self.high_immersion_vectors = self._embed_anchors(self.ANCHOR_TEXTS_HIGH)
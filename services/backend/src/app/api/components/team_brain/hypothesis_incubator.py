@@ -5,20 +5,31 @@ Hypothesis Incubator (FR-103)
 経験の言語化と仮説の構造化を行うコンポーネント。
 """
 
-import json
 import logging
-from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from langchain_core.prompts import PromptTemplate
-
 from app.api.ai_client import AIClient
 from app.api.db import DBClient
+from app.utils import json_utils
+from app.utils.prompt_loader import load_prompt_template
 from config import MODEL_HYPOTHESIS_GENERATION
 
 logger = logging.getLogger(__name__)
 
 
+def parse_hypothesis_content(content: str) -> Any:
+    """
+    仮説のcontent（JSON文字列）をパースする。
+    JSONでない平文は例外を経由せず {"statement": content} として扱う。
+    """
+    if content[:1] in ("{", "["):
+        try:
+            return json_utils.loads(content)
+        except json_utils.JSONDecodeError:
+            pass
+    return {"statement": content}
+
+
 class HypothesisIncubator:
     """
     仮説形成アシスタント（Hypothesis Incubator）
@@ -37,8 +48,7 @@ class HypothesisIncubator:
         self.db_client = db_client or DBClient()
 
         # プロンプトファイルの読み込み
-        prompt_path = Path(__file__).resolve().parents[3] / "static/prompts/hypothesis_incubator.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("hypothesis_incubator.txt")
 
     def incubate(
         self,
@@ -128,7 +138,7 @@ class HypothesisIncubator:
 あなたは仮説形成アシスタントです。以下の仮説に対するユーザーのフィードバックを踏まえて、仮説をブラッシュアップしてください。
 
 ## 現在の仮説
-{json.dumps(hypothesis.get('content', ''), ensure_ascii=False)}
+{json_utils.dumps(hypothesis.get('content', ''))}
 
 ## ユーザーのフィードバック
 {feedback}
@@ -163,7 +173,7 @@ class HypothesisIncubator:
 
         # 仮説を更新
         refined = result.get("refined_hypothesis", {})
-        content = json.dumps(refined, ensure_ascii=False)
+        content = json_utils.dumps(refined)
         tags = refined.get("tags", [])
 
         self.db_client.update_hypothesis(
@@ -195,7 +205,7 @@ class HypothesisIncubator:
         return self.prompt_template.format(
             user_experience=experience,
             existing_hypotheses=hypotheses_text or "（なし）",
-            interest_profile=json.dumps(interest_profile, ensure_ascii=False, indent=2)
+            interest_profile=json_utils.dumps(interest_profile, indent=True)
         )
 
     def _save_hypothesis(
@@ -205,7 +215,7 @@ class HypothesisIncubator:
         original_experience: str
     ) -> Optional[str]:
         """仮説をデータベースに保存する。"""
-        content = json.dumps(structured_hypothesis, ensure_ascii=False)
+        content = json_utils.dumps(structured_hypothesis)
         tags = structured_hypothesis.get("tags", [])
 
         return self.db_client.create_hypothesis(
@@ -223,16 +233,13 @@ class HypothesisIncubator:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """ユーザーの仮説一覧を取得する。"""
-        hypotheses = self.db_client.get_user_hypotheses(
+        hypotheses = []
+        # DBから読み出しながら1行ずつコンテンツをパース
+        for h in self.db_client.iter_user_hypotheses(
             user_id, status, verification_state, limit
-        )
-
-        # コンテンツをパース
-        for h in hypotheses:
+        ):
             if h.get("content"):
-                try:
-                    h["content_parsed"] = json.loads(h["content"])
-                except json.JSONDecodeError:
-                    h["content_parsed"] = {"statement": h["content"]}
+                h["content_parsed"] = parse_hypothesis_content(h["content"])
+            hypotheses.append(h)
 
         return hypotheses
@@ -5,15 +5,15 @@ Hypothesis Quality Scorer (FR-201)
 仮説の「筋の良さ」を評価するコンポーネント。
 """
 
-import json
+import asyncio
 import logging
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional
 
-from langchain_core.prompts import PromptTemplate
-
 from app.api.ai_client import AIClient
 from app.api.db import DBClient
+from app.utils import json_utils
+from app.utils.prompt_loader import load_prompt_template
 from config import MODEL_HYPOTHESIS_GENERATION
 
 logger = logging.getLogger(__name__)
@@ -44,13 +44,15 @@ class HypothesisQualityScorer:
     THRESHOLD_SPECIFICITY = 0.5
     THRESHOLD_IMPACT = 0.5
 
+    # バッチスコアリング時のAI同時リクエスト数の上限
+    MAX_SCORING_WORKERS = 8
+
     def __init__(self, ai_client: AIClient, db_client: Optional[DBClient] = None):
         self.ai_client = ai_client
         self.db_client = db_client or DBClient()
 
         # プロンプトファイルの読み込み
-        prompt_path = Path(__file__).resolve().parents[3] / "static/prompts/hypothesis_quality_scoring.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("hypothesis_quality_scoring.txt")
 
     def score(
         self,
@@ -72,19 +74,53 @@ class HypothesisQualityScorer:
         if not hypothesis:
             return {"success": False, "error": "Hypothesis not found"}
 
-        # 既存ナレッジの取得（指定がなければ共有仮説を検索）
-        if existing_knowledge is None:
-            existing_knowledge = self._get_related_knowledge(hypothesis)
+        return self._score_hypothesis_obj(hypothesis, existing_knowledge)
 
-        # プロンプトの作成
-        prompt = self._create_prompt(hypothesis, existing_knowledge)
+    async def ascore(
+        self,
+        hypothesis_id: str,
+        existing_knowledge: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        score の非同期版。DBアクセスはスレッドで、AI呼び出しは非同期クライアントで行う。
+        """
+        hypothesis = await asyncio.to_thread(self.db_client.get_hypothesis, hypothesis_id)
+        if not hypothesis:
+            return {"success": False, "error": "Hypothesis not found"}
 
-        # AIによるスコアリング
-        result = self.ai_client.generate_response(
-            prompt,
+        if existing_knowledge is None:
+            existing_knowledge = await asyncio.to_thread(self._get_related_knowledge, hypothesis)
+
+        result = await self.ai_client.agenerate_response(
+            self._create_prompt(hypothesis, existing_knowledge),
             model=MODEL_HYPOTHESIS_GENERATION
         )
 
+        if not result:
+            logger.warning("Failed to score hypothesis")
+            return {"success": False, "error": "AI scoring failed"}
+
+        scores = self._extract_and_validate_scores(result)
+
+        return await asyncio.to_thread(self._finalize_scores, hypothesis["id"], scores, result)
+
+    def _score_hypothesis_obj(
+        self,
+        hypothesis: Dict[str, Any],
+        existing_knowledge: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        取得済みの仮説（DB行）をスコアリングする。
+
+        Args:
+            hypothesis: 仮説レコード
+            existing_knowledge: 比較対象の既存ナレッジ（オプション）
+
+        Returns:
+            スコアリング結果
+        """
+        result = self._request_scoring(hypothesis, existing_knowledge)
+
         if not result:
             logger.warning("Failed to score hypothesis")
             return {"success": False, "error": "AI scoring failed"}
@@ -92,17 +128,46 @@ class HypothesisQualityScorer:
         # スコアの抽出と検証
         scores = self._extract_and_validate_scores(result)
 
+        return self._finalize_scores(hypothesis["id"], scores, result)
+
+    def _request_scoring(
+        self,
+        hypothesis: Dict[str, Any],
+        existing_knowledge: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """AIにスコアリングを依頼し、生の応答を返す。"""
+        # 既存ナレッジの取得（指定がなければ共有仮説を検索）
+        if existing_knowledge is None:
+            existing_knowledge = self._get_related_knowledge(hypothesis)
+
+        # プロンプトの作成
+        prompt = self._create_prompt(hypothesis, existing_knowledge)
+
+        # AIによるスコアリング
+        return self.ai_client.generate_response(
+            prompt,
+            model=MODEL_HYPOTHESIS_GENERATION
+        )
+
+    def _finalize_scores(
+        self,
+        hypothesis_id: str,
+        scores: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """High Potential判定を行い、スコアを保存して結果を組み立てる。"""
         # High Potential判定
         is_high_potential = self._determine_high_potential(scores)
         scores["is_high_potential"] = is_high_potential
 
         # スコアをデータベースに保存
-        self._save_scores(hypothesis_id, scores, result)
+        stored_quality_score = self._save_scores(hypothesis_id, scores, result)
 
         return {
             "success": True,
             "hypothesis_id": hypothesis_id,
             "scores": scores,
+            "stored_quality_score": stored_quality_score,
             "rationale": result.get("scoring_rationale", {}),
             "improvement_suggestions": result.get("improvement_suggestions", [])
         }
@@ -126,19 +191,62 @@ class HypothesisQualityScorer:
             user_id, status=status, limit=20
         )
 
-        results = []
-        for h in hypotheses:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(hypotheses)
+        pending = []
+        for idx, h in enumerate(hypotheses):
             # 既にスコアリング済みかチェック
             if h.get("quality_score"):
-                results.append({
+                results[idx] = {
                     "hypothesis_id": h["id"],
                     "already_scored": True,
                     "scores": h["quality_score"]
-                })
-                continue
-
-            result = self.score(h["id"])
-            results.append(result)
+                }
+            else:
+                pending.append(idx)
+
+        if not pending:
+            return results
+
+        # AI呼び出しを並行実行（結果は元の順序で返す）
+        with ThreadPoolExecutor(max_workers=min(self.MAX_SCORING_WORKERS, len(pending))) as executor:
+            futures = {
+                executor.submit(self._request_scoring, hypotheses[idx]): idx
+                for idx in pending
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"[✗] Batch scoring failed for {hypotheses[idx]['id']}: {e}")
+                    results[idx] = {
+                        "success": False,
+                        "hypothesis_id": hypotheses[idx]["id"],
+                        "error": str(e)
+                    }
+                    continue
+
+                if not result:
+                    logger.warning("Failed to score hypothesis")
+                    results[idx] = {
+                        "success": False,
+                        "hypothesis_id": hypotheses[idx]["id"],
+                        "error": "AI scoring failed"
+                    }
+                    continue
+
+                try:
+                    scores = self._extract_and_validate_scores(result)
+                except (TypeError, ValueError) as e:
+                    logger.error(f"[✗] Invalid scores for {hypotheses[idx]['id']}: {e}")
+                    results[idx] = {
+                        "success": False,
+                        "hypothesis_id": hypotheses[idx]["id"],
+                        "error": str(e)
+                    }
+                    continue
+
+                results[idx] = self._finalize_scores(hypotheses[idx]["id"], scores, result)
 
         return results
 
@@ -156,17 +264,20 @@ class HypothesisQualityScorer:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """仮説に関連する既存ナレッジを取得する。"""
-        # コンテンツからキーワードを抽出
-        content = hypothesis.get("content", "")
-        try:
-            parsed = json.loads(content)
-            keywords = []
-            if parsed.get("statement"):
-                keywords.extend(parsed["statement"].split()[:5])
-            if parsed.get("tags"):
-                keywords.extend(parsed["tags"])
-        except json.JSONDecodeError:
+        content = hypothesis.get("content") or ""
+        if "statement" in hypothesis and content[:1] not in ("{", "["):
+            # 平文のcontent（parse_hypothesis_content と同じ判定）は本文の単語を使う
             keywords = content.split()[:5]
+            if hypothesis.get("tags"):
+                keywords.extend(hypothesis["tags"])
+        elif hypothesis.get("statement") is not None:
+            # DB側で抽出済みの statement / tags 列を使う（contentの再パース不要）
+            keywords = hypothesis["statement"].split()[:5]
+            if hypothesis.get("tags"):
+                keywords.extend(hypothesis["tags"])
+        else:
+            # statement列がない行、statementを持たないJSON、壊れたJSONはcontentをパースする
+            keywords = self._extract_keywords_from_content(content)
 
         if not keywords:
             return []
@@ -178,6 +289,20 @@ class HypothesisQualityScorer:
             limit=limit
         )
 
+    @staticmethod
+    def _extract_keywords_from_content(content: str) -> List[str]:
+        """contentのJSONからキーワードを抽出する（statement列で足りない行向け）。"""
+        try:
+            parsed = json_utils.loads(content)
+            keywords = []
+            if parsed.get("statement"):
+                keywords.extend(parsed["statement"].split()[:5])
+            if parsed.get("tags"):
+                keywords.extend(parsed["tags"])
+        except json_utils.JSONDecodeError:
+            keywords = content.split()[:5]
+        return keywords
+
     def _create_prompt(
         self,
         hypothesis: Dict[str, Any],
@@ -235,10 +360,15 @@ class HypothesisQualityScorer:
         hypothesis_id: str,
         scores: Dict[str, Any],
         result: Dict[str, Any]
-    ) -> None:
-        """スコアをデータベースに保存する。"""
+    ) -> Dict[str, Any]:
+        """
+        スコアをデータベースに保存する。
+
+        Returns:
+            hypotheses.quality_score に保存される形のスコア
+        """
         rationale = result.get("scoring_rationale", {})
-        rationale_text = json.dumps(rationale, ensure_ascii=False) if isinstance(rationale, dict) else str(rationale)
+        rationale_text = json_utils.dumps(rationale) if isinstance(rationale, dict) else str(rationale)
 
         self.db_client.save_quality_score(
             hypothesis_id=hypothesis_id,
@@ -249,3 +379,11 @@ class HypothesisQualityScorer:
             is_high_potential=scores["is_high_potential"],
             scoring_rationale=rationale_text
         )
+
+        return DBClient.quality_score_record(
+            scores["novelty_score"],
+            scores["specificity_score"],
+            scores["impact_score"],
+            scores["overall_score"],
+            scores["is_high_potential"]
+        )
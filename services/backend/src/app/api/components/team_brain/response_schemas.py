@@ -0,0 +1,67 @@
+"""
+Team Brain LLM Response Schemas
+
+Team Brain のプロンプトが要求するJSON出力の構造定義。
+AIClient の構造化出力（response_schema）に渡し、プロバイダー側でJSONスキーマに
+沿った出力を生成させる。各フィールドには既定値を持たせ、欠落時も同じ形の辞書になる。
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class AnonymizedDraft(BaseModel):
+    """匿名化された共有ドラフト"""
+    statement: str = ""
+    context: str = ""
+    key_insight: str = ""
+
+
+class SharingSuggestionGateResponse(BaseModel):
+    """共有提案の要否判定（sharing_suggestion_gate.txt）"""
+    should_suggest: bool = False
+    suggestion_reason: str = ""
+
+
+class SharingSuggestionResponse(SharingSuggestionGateResponse):
+    """共有提案（sharing_suggestion.txt）"""
+    target_audience: List[str] = Field(default_factory=list)
+    anonymized_draft: AnonymizedDraft = Field(default_factory=AnonymizedDraft)
+    user_message: str = ""
+    sharing_benefits: List[str] = Field(default_factory=list)
+
+
+class RelatedHypothesisSummary(BaseModel):
+    """アドバイスに含める関連仮説の要約"""
+    hypothesis_id: str = ""
+    status: str = "UNVERIFIED"
+    summary: str = ""
+    relevance: str = ""
+    verification_summary: str = ""
+
+
+class DifferentialOpportunity(BaseModel):
+    """差分検証の機会"""
+    exists: bool = False
+    description: str = ""
+
+
+class RAGAdviceResponse(BaseModel):
+    """ステータス考慮型RAGのアドバイス（status_aware_rag.txt）"""
+    has_relevant_info: bool = True
+    advice_type: str = "information"
+    main_message: str = ""
+    related_hypotheses_summary: List[RelatedHypothesisSummary] = Field(default_factory=list)
+    suggested_actions: List[str] = Field(default_factory=list)
+    differential_opportunity: DifferentialOpportunity = Field(default_factory=DifferentialOpportunity)
+
+
+class DiffVerificationResponse(BaseModel):
+    """差分検証の評価（differential_verification.txt）"""
+    verification_value: str = "medium"
+    rationale: str = ""
+    expected_insights: List[str] = Field(default_factory=list)
+    recommended_approach: str = ""
+    potential_pitfalls: List[str] = Field(default_factory=list)
+
@@ -5,19 +5,26 @@ Sharing Suggester (FR-202)
 共有サジェストと承認フローを管理するコンポーネント。
 """
 
-import json
+import asyncio
 import logging
-from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from langchain_core.prompts import PromptTemplate
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.api.ai_client import AIClient
+from app.api.components.team_brain.response_schemas import (
+    SharingSuggestionGateResponse,
+    SharingSuggestionResponse,
+)
 from app.api.db import DBClient
-from config import MODEL_HYPOTHESIS_GENERATION
+from app.utils import json_utils
+from app.utils.llm_cache import llm_result_cache
+from app.utils.prompt_loader import load_prompt_template
+from config import MODEL_HYPOTHESIS_GENERATION, MODEL_SUGGESTION_GATE
 
 logger = logging.getLogger(__name__)
 
+# 検証完了とみなす検証状態（verification_complete トリガーの対象）
+COMPLETE_VERIFICATION_STATES = frozenset({"VALIDATED", "FAILED"})
+
 
 class SharingSuggester:
     """
@@ -38,8 +45,8 @@ class SharingSuggester:
         self.db_client = db_client or DBClient()
 
         # プロンプトファイルの読み込み
-        prompt_path = Path(__file__).resolve().parents[3] / "static/prompts/sharing_suggestion.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("sharing_suggestion.txt")
+        self.gate_prompt_template = load_prompt_template("sharing_suggestion_gate.txt")
 
     def check_and_suggest(
         self,
@@ -58,8 +65,101 @@ class SharingSuggester:
         Returns:
             提案結果
         """
-        # 仮説を取得
-        hypothesis = self.db_client.get_hypothesis(hypothesis_id)
+        hypothesis, early_result = self._prepare_suggestion(hypothesis_id, user_id, trigger)
+        if early_result is not None:
+            return early_result
+
+        # AIによる提案生成
+        result = self._generate_suggestion(hypothesis)
+
+        return self._build_suggestion_result(hypothesis_id, user_id, result)
+
+    async def acheck_and_suggest(
+        self,
+        hypothesis_id: str,
+        user_id: str,
+        trigger: str = "quality_check",
+        hypothesis: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        check_and_suggest の非同期版。DBアクセスはスレッドで、AI呼び出しは非同期クライアントで行う。
+        取得済みの仮説（hypothesis）が渡された場合はDBから再取得しない。
+        """
+        hypothesis, early_result = await asyncio.to_thread(
+            self._prepare_suggestion, hypothesis_id, user_id, trigger, hypothesis
+        )
+        if early_result is not None:
+            return early_result
+
+        result = await self._agenerate_suggestion(hypothesis)
+
+        return await asyncio.to_thread(
+            self._build_suggestion_result, hypothesis_id, user_id, result
+        )
+
+    def _prepare_suggestion(
+        self,
+        hypothesis_id: str,
+        user_id: str,
+        trigger: str,
+        hypothesis: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        提案チェックの前段（仮説取得と条件判定）。
+
+        Returns:
+            (仮説, None) またはAI呼び出し不要な場合は (None, 結果)
+        """
+        # 仮説を取得（取得済みの場合はそれを使う）
+        if hypothesis is None:
+            hypothesis = self.db_client.get_hypothesis(hypothesis_id)
+
+        early_result = self._precheck(hypothesis, user_id, trigger)
+        if early_result is not None:
+            return None, early_result
+
+        return hypothesis, None
+
+    def _generate_suggestion(self, hypothesis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        2段階でAIに問い合わせる（同一入力の結果はキャッシュを再利用）。
+
+        まず軽量モデルで提案の要否のみを判定し、提案する場合だけ
+        仮説生成用モデルで匿名化ドラフトを含む提案内容を生成する。
+        """
+        gate = llm_result_cache.generate(
+            self.ai_client, self._create_gate_prompt(hypothesis), MODEL_SUGGESTION_GATE,
+            response_schema=SharingSuggestionGateResponse
+        )
+        if not gate or not gate.get("should_suggest", False):
+            return gate
+
+        return llm_result_cache.generate(
+            self.ai_client, self._create_prompt(hypothesis), MODEL_HYPOTHESIS_GENERATION,
+            response_schema=SharingSuggestionResponse
+        )
+
+    async def _agenerate_suggestion(self, hypothesis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """_generate_suggestion の非同期版。"""
+        gate = await llm_result_cache.agenerate(
+            self.ai_client, self._create_gate_prompt(hypothesis), MODEL_SUGGESTION_GATE,
+            response_schema=SharingSuggestionGateResponse
+        )
+        if not gate or not gate.get("should_suggest", False):
+            return gate
+
+        return await llm_result_cache.agenerate(
+            self.ai_client, self._create_prompt(hypothesis), MODEL_HYPOTHESIS_GENERATION,
+            response_schema=SharingSuggestionResponse
+        )
+
+    def _precheck(
+        self,
+        hypothesis: Optional[Dict[str, Any]],
+        user_id: str,
+        trigger: str
+    ) -> Optional[Dict[str, Any]]:
+        """AIに問い合わせる前の判定。提案不要・不可の場合はその結果を返す。"""
         if not hypothesis:
             return {"success": False, "error": "Hypothesis not found"}
 
@@ -92,13 +192,15 @@ class SharingSuggester:
                 "reason": "Does not meet suggestion criteria"
             }
 
-        # AIによる提案生成
-        prompt = self._create_prompt(hypothesis, quality_score, verification_state)
-        result = self.ai_client.generate_response(
-            prompt,
-            model=MODEL_HYPOTHESIS_GENERATION
-        )
+        return None
 
+    def _build_suggestion_result(
+        self,
+        hypothesis_id: str,
+        user_id: str,
+        result: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """AIの提案結果を保存し、レスポンスを組み立てる。"""
         if not result:
             return {"success": False, "error": "AI suggestion generation failed"}
 
@@ -155,22 +257,68 @@ class SharingSuggester:
             応答結果
         """
         # サジェストの情報を取得（pending状態のもの）
-        pending = self.db_client.get_pending_suggestions(user_id)
-        suggestion = next(
-            (s for s in pending if s.get("id") == suggestion_id),
-            None
+        suggestion = self.db_client.get_pending_suggestion(suggestion_id, user_id)
+
+        return self._apply_response(
+            suggestion, suggestion_id, user_id, action, edited_content, team_id
+        )
+
+    def respond_to_suggestions(
+        self,
+        user_id: str,
+        responses: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        複数の共有サジェストにまとめて応答する。
+
+        Args:
+            user_id: ユーザーID
+            responses: suggestion_id, action, edited_content, team_id を持つ応答のリスト
+
+        Returns:
+            responses と同じ順序の応答結果リスト
+        """
+        # 対象のサジェストを1クエリで取得し、IDで引けるようにする
+        pending = self.db_client.get_pending_suggestions_by_ids(
+            [r["suggestion_id"] for r in responses], user_id
         )
+        by_id = {s["id"]: s for s in pending}
+
+        results = []
+        for r in responses:
+            # 同じIDへの2回目以降の応答は処理済みとして扱う
+            suggestion = by_id.pop(r["suggestion_id"], None)
+            results.append(self._apply_response(
+                suggestion,
+                r["suggestion_id"],
+                user_id,
+                r.get("action"),
+                r.get("edited_content"),
+                r.get("team_id")
+            ))
+        return results
 
+    def _apply_response(
+        self,
+        suggestion: Optional[Dict[str, Any]],
+        suggestion_id: int,
+        user_id: str,
+        action: str,
+        edited_content: Optional[str],
+        team_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """取得済みのサジェストに対して応答アクションを実行する。"""
         if not suggestion:
             return {"success": False, "error": "Suggestion not found or already processed"}
 
         hypothesis_id = suggestion.get("hypothesis_id")
 
         if action == "accept":
-            # そのまま共有
-            status = "ACCEPTED"
-            self.db_client.respond_to_suggestion(suggestion_id, user_id, status)
-            self.db_client.share_hypothesis(hypothesis_id, user_id, team_id)
+            # そのまま共有（サジェスト更新と共有を1トランザクションで実行）
+            if not self.db_client.accept_and_share_suggestion(
+                suggestion_id, hypothesis_id, user_id, team_id
+            ):
+                return {"success": False, "error": "Failed to share hypothesis"}
 
             return {
                 "success": True,
@@ -183,15 +331,12 @@ class SharingSuggester:
             if not edited_content:
                 return {"success": False, "error": "Edited content required"}
 
-            status = "EDITED"
-            self.db_client.respond_to_suggestion(
-                suggestion_id, user_id, status, edited_content
-            )
-            # 仮説のコンテンツを更新して共有
-            self.db_client.update_hypothesis(
-                hypothesis_id, user_id, content=edited_content
-            )
-            self.db_client.share_hypothesis(hypothesis_id, user_id, team_id)
+            # 仮説のコンテンツを更新して共有（1トランザクションで実行）
+            if not self.db_client.accept_and_share_suggestion(
+                suggestion_id, hypothesis_id, user_id, team_id,
+                edited_content=edited_content
+            ):
+                return {"success": False, "error": "Failed to share hypothesis"}
 
             return {
                 "success": True,
@@ -228,22 +373,26 @@ class SharingSuggester:
 
         # 検証完了時
         if trigger == "verification_complete":
-            return verification_state in ["VALIDATED", "FAILED"]
+            return verification_state in COMPLETE_VERIFICATION_STATES
 
         return False
 
-    def _create_prompt(
-        self,
-        hypothesis: Dict[str, Any],
-        quality_score: Dict[str, Any],
-        verification_state: str
-    ) -> str:
+    def _create_prompt(self, hypothesis: Dict[str, Any]) -> str:
         """サジェスト用プロンプトを作成する。"""
-        return self.prompt_template.format(
-            hypothesis=json.dumps(hypothesis.get("content", ""), ensure_ascii=False),
-            quality_score=json.dumps(quality_score, ensure_ascii=False, indent=2),
-            verification_state=verification_state
-        )
+        return self.prompt_template.format(**self._prompt_fields(hypothesis))
+
+    def _create_gate_prompt(self, hypothesis: Dict[str, Any]) -> str:
+        """提案要否判定用プロンプトを作成する。"""
+        return self.gate_prompt_template.format(**self._prompt_fields(hypothesis))
+
+    @staticmethod
+    def _prompt_fields(hypothesis: Dict[str, Any]) -> Dict[str, str]:
+        """サジェスト系プロンプトに埋め込む仮説情報。"""
+        return {
+            "hypothesis": json_utils.dumps(hypothesis.get("content", "")),
+            "quality_score": json_utils.dumps(hypothesis.get("quality_score", {}), indent=True),
+            "verification_state": hypothesis.get("verification_state", "UNVERIFIED")
+        }
 
     def _save_suggestion(
         self,
@@ -253,7 +402,7 @@ class SharingSuggester:
     ) -> Optional[int]:
         """サジェストをデータベースに保存する。"""
         anonymized_draft = result.get("anonymized_draft", {})
-        draft_content = json.dumps(anonymized_draft, ensure_ascii=False)
+        draft_content = json_utils.dumps(anonymized_draft)
 
         return self.db_client.create_sharing_suggestion(
             hypothesis_id=hypothesis_id,
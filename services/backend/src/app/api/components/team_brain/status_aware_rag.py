@@ -5,20 +5,49 @@ Status-Aware RAG (FR-401, FR-402)
 他者の検証結果を自考に活かすコンポーネント。
 """
 
-import json
+import asyncio
 import logging
-from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from langchain_core.prompts import PromptTemplate
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, FrozenSet, List, Optional, Tuple
 
 from app.api.ai_client import AIClient
+from app.api.components.team_brain.response_schemas import DiffVerificationResponse, RAGAdviceResponse
 from app.api.db import DBClient
+from app.utils import json_utils
+from app.utils.llm_cache import llm_result_cache
+from app.utils.prompt_loader import load_prompt_template
 from app.api.components.rag_manager import RAGManager
 from config import MODEL_HYPOTHESIS_GENERATION
 
 logger = logging.getLogger(__name__)
 
+# 日本語と英語の単語を抽出するパターン
+_KEYWORD_RE = re.compile(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff]+|\w+')
+
+# キーワード抽出時に除去するストップワード
+_STOPWORDS = frozenset({
+    'の', 'に', 'は', 'を', 'た', 'が', 'で', 'て', 'と', 'し', 'れ',
+    'さ', 'ある', 'いる', 'も', 'する', 'から', 'な', 'こと', 'として',
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'shall'
+})
+
+
+@lru_cache(maxsize=1024)
+def _char_bigrams(text: str) -> FrozenSet[str]:
+    """文字バイグラムの集合（1文字の場合はその文字自体）。既存条件の分は呼び出し間でキャッシュされる。"""
+    if len(text) < 2:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+
+# 共有仮説検索と並行してベクトル検索を実行するためのスレッドプール
+_RETRIEVAL_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="status-rag")
+
 
 class StatusAwareRAG:
     """
@@ -46,8 +75,8 @@ class StatusAwareRAG:
         self.rag_manager = rag_manager or RAGManager(ai_client)
 
         # プロンプトファイルの読み込み
-        prompt_path = Path(__file__).resolve().parents[3] / "static/prompts/status_aware_rag.txt"
-        self.prompt_template = PromptTemplate.from_file(prompt_path)
+        self.prompt_template = load_prompt_template("status_aware_rag.txt")
+        self.differential_prompt_template = load_prompt_template("differential_verification.txt")
 
     def retrieve_with_status(
         self,
@@ -66,46 +95,190 @@ class StatusAwareRAG:
         Returns:
             検証ステータスを含む関連情報とアドバイス
         """
+        retrieved, early_result = self._retrieve_related(user_id, user_thought, category)
+        if early_result is not None:
+            return early_result
+
+        related_hypotheses, vector_results = retrieved
+
+        # AIによるアドバイス生成（同一の思考・関連仮説の結果はキャッシュを再利用）
+        prompt = self._create_prompt(user_thought, related_hypotheses)
+        result = llm_result_cache.generate(
+            self.ai_client, prompt, MODEL_HYPOTHESIS_GENERATION,
+            response_schema=RAGAdviceResponse
+        )
+
+        return self._build_advice(related_hypotheses, vector_results, result)
+
+    async def aretrieve_with_status(
+        self,
+        user_id: str,
+        user_thought: str,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        retrieve_with_status の非同期版。複数の思考に対して asyncio.gather で並行実行できる。
+        """
+        retrieved, early_result = await self._aretrieve_related(user_id, user_thought, category)
+        if early_result is not None:
+            return early_result
+
+        related_hypotheses, vector_results = retrieved
+
+        prompt = self._create_prompt(user_thought, related_hypotheses)
+        result = await llm_result_cache.agenerate(
+            self.ai_client, prompt, MODEL_HYPOTHESIS_GENERATION,
+            response_schema=RAGAdviceResponse
+        )
+
+        return self._build_advice(related_hypotheses, vector_results, result)
+
+    async def retrieve_with_status_stream(
+        self,
+        user_id: str,
+        user_thought: str,
+        category: Optional[str] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        retrieve_with_status のストリーミング版。
+
+        検索結果を "header" イベントとして先に返し、LLMの出力を "delta" イベントで
+        逐次中継した後、retrieve_with_status と同じ形式の結果を "complete" イベントで返す。
+        """
+        retrieved, early_result = await self._aretrieve_related(user_id, user_thought, category)
+        if early_result is not None:
+            yield {"type": "complete", **early_result}
+            return
+
+        related_hypotheses, vector_results = retrieved
+        yield {
+            "type": "header",
+            "raw_data": {
+                "hypotheses": related_hypotheses,
+                "vector_results": vector_results
+            }
+        }
+
+        prompt = self._create_prompt(user_thought, related_hypotheses)
+        cache_key = llm_result_cache.make_key(MODEL_HYPOTHESIS_GENERATION, prompt, RAGAdviceResponse)
+        result = llm_result_cache.get(cache_key)
+
+        if result is None:
+            chunks = []
+            async for text in self.ai_client.generate_stream(
+                prompt,
+                model=MODEL_HYPOTHESIS_GENERATION
+            ):
+                if text:
+                    chunks.append(text)
+                    yield {"type": "delta", "text": text}
+
+            # ストリームはスキーマ指定なしで生成されるため、RAGAdviceResponse で検証できた
+            # 結果だけを非ストリーミング版と共通のキャッシュに保存する（None は保存されない）
+            result = self.ai_client.parse_response("".join(chunks), RAGAdviceResponse)
+            llm_result_cache.put(cache_key, result)
+
+        yield {"type": "complete", **self._build_advice(related_hypotheses, vector_results, result)}
+
+    def _retrieve_related(
+        self,
+        user_id: str,
+        user_thought: str,
+        category: Optional[str]
+    ) -> Tuple[Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]], Optional[Dict[str, Any]]]:
+        """
+        共有仮説とベクトル検索の結果を取得する。
+
+        Returns:
+            ((related_hypotheses, vector_results), None) または関連情報がない場合は (None, 結果)
+        """
         # キーワード抽出
         keywords = self._extract_keywords(user_thought)
 
         if not keywords:
-            return {
+            return None, {
+                "success": True,
+                "has_relevant_info": False,
+                "message": "No keywords extracted from thought"
+            }
+
+        # 共有仮説（SQL）とベクトル検索は独立しているため並行実行する
+        vector_future = _RETRIEVAL_EXECUTOR.submit(
+            self._search_vectors, user_id, user_thought, category
+        )
+        related_hypotheses = self._search_shared(user_id, keywords)
+        vector_results = vector_future.result()
+
+        return self._check_related(related_hypotheses, vector_results)
+
+    async def _aretrieve_related(
+        self,
+        user_id: str,
+        user_thought: str,
+        category: Optional[str]
+    ) -> Tuple[Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]], Optional[Dict[str, Any]]]:
+        """_retrieve_related の非同期版（SQLとベクトル検索を asyncio.gather で並行実行）。"""
+        keywords = self._extract_keywords(user_thought)
+
+        if not keywords:
+            return None, {
                 "success": True,
                 "has_relevant_info": False,
                 "message": "No keywords extracted from thought"
             }
 
-        # 共有仮説を検索（検証ステータス付き）
-        related_hypotheses = self.db_client.search_hypotheses_for_rag(
+        related_hypotheses, vector_results = await asyncio.gather(
+            asyncio.to_thread(self._search_shared, user_id, keywords),
+            asyncio.to_thread(self._search_vectors, user_id, user_thought, category)
+        )
+
+        return self._check_related(related_hypotheses, vector_results)
+
+    def _search_shared(self, user_id: str, keywords: List[str]) -> List[Dict[str, Any]]:
+        """共有仮説を検索する（検証ステータス付き）。"""
+        return self.db_client.search_hypotheses_for_rag(
             keywords=keywords,
             exclude_user_id=user_id,
             include_verification_summary=True,
             limit=10
         )
 
-        # ベクトル検索も実行（補助的に）
-        vector_results = self.rag_manager.search_by_text(
+    def _search_vectors(
+        self,
+        user_id: str,
+        user_thought: str,
+        category: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """ベクトル検索を実行する（補助的に）。"""
+        return self.rag_manager.search_by_text(
             query_text=user_thought,
             user_id=user_id,
             category=category,
             limit=5
         )
 
+    @staticmethod
+    def _check_related(
+        related_hypotheses: List[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]]
+    ) -> Tuple[Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]], Optional[Dict[str, Any]]]:
+        """関連情報が見つからなかった場合は早期終了用の結果を返す。"""
         if not related_hypotheses and not vector_results:
-            return {
+            return None, {
                 "success": True,
                 "has_relevant_info": False,
                 "message": "No related information found"
             }
 
-        # AIによるアドバイス生成
-        prompt = self._create_prompt(user_thought, related_hypotheses)
-        result = self.ai_client.generate_response(
-            prompt,
-            model=MODEL_HYPOTHESIS_GENERATION
-        )
+        return (related_hypotheses, vector_results), None
 
+    def _build_advice(
+        self,
+        related_hypotheses: List[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]],
+        result: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """AIのアドバイスと検索結果からレスポンスを組み立てる。"""
         if not result:
             # AI失敗時は生データを返す
             return {
@@ -132,13 +305,15 @@ class StatusAwareRAG:
 
     def get_verification_context(
         self,
-        hypothesis_id: str
+        hypothesis_id: str,
+        include_detail: bool = True
     ) -> Dict[str, Any]:
         """
         特定の仮説の検証コンテキストを取得する。
 
         Args:
             hypothesis_id: 仮説ID
+            include_detail: 検証レコードの全件（evidence含む）を返すか
 
         Returns:
             検証コンテキスト（誰が検証したか、結果はどうだったか）
@@ -147,49 +322,42 @@ class StatusAwareRAG:
         if not hypothesis:
             return {"success": False, "error": "Hypothesis not found"}
 
-        verifications = self.db_client.get_hypothesis_verifications(hypothesis_id)
+        # 件数の集計はSQL側で行い、チーム別の内訳は必要なカラムのみ取得する
+        aggregated = self.db_client.get_verification_summary(hypothesis_id)
+        counts = aggregated["counts"]
 
-        # 検証サマリーの構築
-        summary = {
-            "total_verifications": len(verifications),
-            "success_count": 0,
-            "failure_count": 0,
-            "partial_count": 0,
-            "inconclusive_count": 0,
-            "by_team": {},
-            "conditions_tried": []
-        }
-
-        for v in verifications:
-            result = v.get("verification_result")
-            if result == "SUCCESS":
-                summary["success_count"] += 1
-            elif result == "FAILURE":
-                summary["failure_count"] += 1
-            elif result == "PARTIAL":
-                summary["partial_count"] += 1
-            elif result == "INCONCLUSIVE":
-                summary["inconclusive_count"] += 1
-
-            team_name = v.get("team_name", "Unknown")
-            if team_name not in summary["by_team"]:
-                summary["by_team"][team_name] = []
-            summary["by_team"][team_name].append({
-                "result": result,
+        by_team = defaultdict(list)
+        conditions_tried = []
+        for v in aggregated["rows"]:
+            by_team[v.get("team_name", "Unknown")].append({
+                "result": v.get("verification_result"),
                 "conditions": v.get("conditions"),
                 "notes": v.get("notes"),
                 "created_at": v.get("created_at")
             })
 
             if v.get("conditions"):
-                summary["conditions_tried"].append(v["conditions"])
+                conditions_tried.append(v["conditions"])
 
-        return {
+        # 検証サマリーの構築
+        summary = {
+            "total_verifications": sum(counts.values()),
+            "success_count": counts.get("SUCCESS", 0),
+            "failure_count": counts.get("FAILURE", 0),
+            "partial_count": counts.get("PARTIAL", 0),
+            "inconclusive_count": counts.get("INCONCLUSIVE", 0),
+            "by_team": dict(by_team),
+            "conditions_tried": conditions_tried
+        }
+
+        context = {
             "success": True,
             "hypothesis": hypothesis,
-            "verification_summary": summary,
-            "verifications": verifications
+            "verification_summary": summary
         }
+        if include_detail:
+            context["verifications"] = self.db_client.get_hypothesis_verifications(hypothesis_id)
+        return context
 
     def suggest_differential_verification(
         self,
@@ -208,54 +376,82 @@ class StatusAwareRAG:
         Returns:
             差分検証の提案
         """
-        context = self.get_verification_context(hypothesis_id)
-        if not context.get("success"):
-            return context
+        prompt, early_result = self._prepare_differential(hypothesis_id, new_conditions)
+        if early_result is not None:
+            return early_result
 
-        existing_conditions = context["verification_summary"]["conditions_tried"]
+        result = self.ai_client.generate_structured(
+            prompt,
+            DiffVerificationResponse,
+            model=MODEL_HYPOTHESIS_GENERATION
+        )
+
+        return self._build_differential_result(hypothesis_id, result)
+
+    async def asuggest_differential_verification(
+        self,
+        user_id: str,
+        hypothesis_id: str,
+        new_conditions: str
+    ) -> Dict[str, Any]:
+        """suggest_differential_verification の非同期版。"""
+        prompt, early_result = await asyncio.to_thread(
+            self._prepare_differential, hypothesis_id, new_conditions
+        )
+        if early_result is not None:
+            return early_result
+
+        result = await self.ai_client.agenerate_structured(
+            prompt,
+            DiffVerificationResponse,
+            model=MODEL_HYPOTHESIS_GENERATION
+        )
+
+        return self._build_differential_result(hypothesis_id, result)
+
+    def _prepare_differential(
+        self,
+        hypothesis_id: str,
+        new_conditions: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        差分検証の前段（新規性チェックと検証コンテキスト取得）。
+
+        Returns:
+            (プロンプト, None) またはAI呼び出し不要な場合は (None, 結果)
+        """
+        # 重複判定に必要な検証条件だけを先に取得し、重複ならコンテキスト取得を省略する
+        existing_conditions = self.db_client.get_conditions_tried(hypothesis_id)
 
         # 新しい条件が既存と重複していないかチェック
         is_novel = self._check_condition_novelty(new_conditions, existing_conditions)
 
         if not is_novel:
-            return {
+            return None, {
                 "success": True,
                 "should_verify": False,
                 "reason": "Similar conditions have already been tested",
                 "existing_conditions": existing_conditions
             }
 
+        context = self.get_verification_context(hypothesis_id, include_detail=False)
+        if not context.get("success"):
+            return None, context
+
         # 差分検証の提案を生成
-        prompt = f"""
-以下の仮説に対して、新しい条件での差分検証が提案されています。
-
-## 既存の仮説
-{json.dumps(context['hypothesis'].get('content', ''), ensure_ascii=False)}
-
-## 既存の検証結果
-{json.dumps(context['verification_summary'], ensure_ascii=False, indent=2)}
-
-## 新しい検証条件
-{new_conditions}
-
-## タスク
-この差分検証の価値を評価し、以下のJSON形式で出力してください：
-
-```json
-{{
-  "verification_value": "high/medium/low",
-  "rationale": "この差分検証が価値がある理由",
-  "expected_insights": ["得られる可能性のある知見"],
-  "recommended_approach": "推奨されるアプローチ",
-  "potential_pitfalls": ["注意すべき点"]
-}}
-```
-"""
-        result = self.ai_client.generate_response(
-            prompt,
-            model=MODEL_HYPOTHESIS_GENERATION
+        prompt = self.differential_prompt_template.format(
+            hypothesis_content=json_utils.dumps(context['hypothesis'].get('content', '')),
+            verification_summary=json_utils.dumps(context['verification_summary'], indent=True),
+            new_conditions=new_conditions
         )
+        return prompt, None
 
+    def _build_differential_result(
+        self,
+        hypothesis_id: str,
+        result: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """差分検証の評価結果からレスポンスを組み立てる。"""
         if not result:
             return {
                 "success": True,
@@ -328,22 +524,16 @@ class StatusAwareRAG:
         """テキストからキーワードを抽出する。"""
         # シンプルな実装：重要そうな単語を抽出
         # 実際の実装ではNLPを使用することを推奨
-        import re
-
-        # 日本語と英語の単語を抽出
-        words = re.findall(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff]+|\w+', text)
+        keywords = []
+        for match in _KEYWORD_RE.finditer(text):
+            word = match.group(0)
+            if len(word) > 1 and word.lower() not in _STOPWORDS:
+                keywords.append(word)
+                # 最大10個のキーワードを返す
+                if len(keywords) == 10:
+                    break
 
-        # ストップワードを除去
-        stopwords = {'の', 'に', 'は', 'を', 'た', 'が', 'で', 'て', 'と', 'し', 'れ',
-                     'さ', 'ある', 'いる', 'も', 'する', 'から', 'な', 'こと', 'として',
-                     'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                     'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                     'would', 'could', 'should', 'may', 'might', 'must', 'shall'}
-
-        keywords = [w for w in words if w.lower() not in stopwords and len(w) > 1]
-
-        # 最大10個のキーワードを返す
-        return keywords[:10]
+        return keywords
 
     def _create_prompt(
         self,
@@ -351,14 +541,15 @@ class StatusAwareRAG:
         related_hypotheses: List[Dict[str, Any]]
     ) -> str:
         """アドバイス生成用プロンプトを作成する。"""
-        hypotheses_text = ""
-        for h in related_hypotheses:
-            hypotheses_text += f"""
+        hypotheses_text = "".join(
+            f"""
 - 仮説: {h.get('content', '')}
   検証状態: {h.get('verification_state', 'UNVERIFIED')}
   検証回数: {h.get('total_verifications', 0)} (成功: {h.get('success_count', 0)}, 失敗: {h.get('failure_count', 0)})
   検証サマリー: {h.get('verification_summary', 'なし')}
 """
+            for h in related_hypotheses
+        )
 
         return self.prompt_template.format(
             user_thought=user_thought,
@@ -374,14 +565,14 @@ class StatusAwareRAG:
         if not existing_conditions:
             return True
 
-        # シンプルな類似度チェック
-        new_lower = new_conditions.lower()
+        # 文字バイグラムのJaccard係数で類似度をチェック
+        new_bigrams = _char_bigrams(new_conditions.lower())
         for existing in existing_conditions:
             if existing:
-                existing_lower = existing.lower()
-                # 80%以上の文字が一致する場合は重複とみなす
-                common_chars = sum(1 for c in new_lower if c in existing_lower)
-                similarity = common_chars / max(len(new_lower), len(existing_lower))
+                existing_bigrams = _char_bigrams(existing.lower())
+                union = len(new_bigrams | existing_bigrams)
+                similarity = len(new_bigrams & existing_bigrams) / union if union else 1.0
+                # 80%以上一致する場合は重複とみなす
                 if similarity > 0.8:
                     return False
 
@@ -4,21 +4,50 @@ Team Brain Manager
 統合マネージャー：3階層ナレッジプラットフォームを統括する。
 """
 
-import json
+import asyncio
+import copy
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from cachetools import TTLCache
 
 from app.api.ai_client import AIClient
 from app.api.db import DBClient
 from app.api.components.rag_manager import RAGManager
 
-from .hypothesis_incubator import HypothesisIncubator
+from .hypothesis_incubator import HypothesisIncubator, parse_hypothesis_content
 from .quality_scorer import HypothesisQualityScorer
-from .sharing_suggester import SharingSuggester
+from .sharing_suggester import COMPLETE_VERIFICATION_STATES, SharingSuggester
 from .status_aware_rag import StatusAwareRAG
 
 logger = logging.getLogger(__name__)
 
+# ダッシュボード統計の独立したDBクエリを並行実行するためのスレッドプール
+_DASHBOARD_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="team-brain-dashboard")
+
+# ダッシュボードで集計するステータス（未出現のものも0件として返す）
+_STATUS_KEYS = ("DRAFT", "PROPOSED", "SHARED")
+_VERIFICATION_STATE_KEYS = ("UNVERIFIED", "IN_PROGRESS", "VALIDATED", "FAILED")
+
+
+@lru_cache(maxsize=1)
+def _default_db_client() -> DBClient:
+    """注入されない場合に使うプロセス共通の DBClient。"""
+    return DBClient()
+
+
+@lru_cache(maxsize=1)
+def _default_rag_manager() -> RAGManager:
+    """
+    注入されない場合に使うプロセス共通の RAGManager。
+    埋め込み・検索結果のキャッシュをリクエスト間で共有するため、専用の AIClient で一度だけ生成する。
+    """
+    return RAGManager(AIClient())
+
 
 class TeamBrainManager:
     """
@@ -30,6 +59,10 @@ class TeamBrainManager:
     - 3階: 共創の広場 (Public Layer)
     """
 
+    # パース済みcontentのキャッシュ（(仮説ID, contentのハッシュ) 単位なので内容が変われば別キーになる）
+    _content_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+    _content_cache_lock = threading.Lock()
+
     def __init__(
         self,
         ai_client: AIClient,
@@ -37,14 +70,39 @@ class TeamBrainManager:
         rag_manager: Optional[RAGManager] = None
     ):
         self.ai_client = ai_client
-        self.db_client = db_client or DBClient()
-        self.rag_manager = rag_manager or RAGManager(ai_client)
+        # 注入されたクライアントはそのまま使い、未指定の場合は初回アクセス時にプロセス共通のものを使う
+        if db_client is not None:
+            self.db_client = db_client
+        if rag_manager is not None:
+            self.rag_manager = rag_manager
+
+    # =========================================================================
+    # コンポーネント（エンドポイントごとに必要なものだけを遅延初期化する）
+    # =========================================================================
+
+    @cached_property
+    def db_client(self) -> DBClient:
+        return _default_db_client()
+
+    @cached_property
+    def rag_manager(self) -> RAGManager:
+        return _default_rag_manager()
+
+    @cached_property
+    def incubator(self) -> HypothesisIncubator:
+        return HypothesisIncubator(self.ai_client, self.db_client)
+
+    @cached_property
+    def scorer(self) -> HypothesisQualityScorer:
+        return HypothesisQualityScorer(self.ai_client, self.db_client)
 
-        # コンポーネントの初期化
-        self.incubator = HypothesisIncubator(ai_client, self.db_client)
-        self.scorer = HypothesisQualityScorer(ai_client, self.db_client)
-        self.suggester = SharingSuggester(ai_client, self.db_client)
-        self.status_aware_rag = StatusAwareRAG(ai_client, self.db_client, self.rag_manager)
+    @cached_property
+    def suggester(self) -> SharingSuggester:
+        return SharingSuggester(self.ai_client, self.db_client)
+
+    @cached_property
+    def status_aware_rag(self) -> StatusAwareRAG:
+        return StatusAwareRAG(self.ai_client, self.db_client, self.rag_manager)
 
     # =========================================================================
     # 1階: 思考の私有地 (Private Layer)
@@ -80,13 +138,7 @@ class TeamBrainManager:
             return incubation_result
 
         hypothesis_id = incubation_result.get("hypothesis_id")
-        result = {
-            "success": True,
-            "hypothesis_id": hypothesis_id,
-            "structured_hypothesis": incubation_result.get("structured_hypothesis"),
-            "reasoning": incubation_result.get("reasoning"),
-            "refinement_suggestions": incubation_result.get("refinement_suggestions")
-        }
+        result = self._incubation_response(incubation_result)
 
         # 2. 品質スコアリング（2階）
         if auto_score and hypothesis_id:
@@ -100,15 +152,119 @@ class TeamBrainManager:
                     hypothesis_id, user_id, trigger="quality_check"
                 )
                 if suggestion_result.get("should_suggest"):
-                    result["sharing_suggestion"] = {
-                        "suggestion_id": suggestion_result.get("suggestion_id"),
-                        "message": suggestion_result.get("user_message"),
-                        "anonymized_draft": suggestion_result.get("anonymized_draft"),
-                        "benefits": suggestion_result.get("sharing_benefits")
-                    }
+                    result["sharing_suggestion"] = self._sharing_suggestion_summary(suggestion_result)
+
+        return result
+
+    async def aincubate_hypothesis(
+        self,
+        user_id: str,
+        experience: str,
+        interest_profile: Optional[Dict[str, Any]] = None,
+        auto_score: bool = True,
+        check_sharing: bool = True
+    ) -> Dict[str, Any]:
+        """
+        incubate_hypothesis の非同期版。
+        スコアリング（DB検索＋AI呼び出し）の実行中に、共有チェック用の仮説レコードを先読みする。
+        """
+        # 1. 仮説の生成（1階）
+        incubation_result = await asyncio.to_thread(
+            self.incubator.incubate, user_id, experience, interest_profile
+        )
+
+        if not incubation_result.get("success"):
+            return incubation_result
+
+        hypothesis_id = incubation_result.get("hypothesis_id")
+        result = self._incubation_response(incubation_result)
+
+        if auto_score and hypothesis_id:
+            result.update(await self.afinalize_hypothesis(hypothesis_id, user_id, check_sharing))
 
         return result
 
+    async def afinalize_hypothesis(
+        self,
+        hypothesis_id: str,
+        user_id: str,
+        check_sharing: bool = True
+    ) -> Dict[str, Any]:
+        """
+        生成済みの仮説をスコアリングし、オプションで共有チェックを行う。
+        仮説生成のレスポンス後にバックグラウンドタスクとしても実行される。
+
+        Returns:
+            quality_score / scoring_rationale / sharing_suggestion（提案時のみ）
+        """
+        # 2. 品質スコアリング（2階）と共有チェック用の仮説取得を並行実行
+        scoring_task = asyncio.create_task(self.scorer.ascore(hypothesis_id))
+        hypothesis = None
+        if check_sharing:
+            hypothesis = await asyncio.to_thread(self.db_client.get_hypothesis, hypothesis_id)
+        scoring_result = await scoring_task
+
+        result = {
+            "quality_score": scoring_result.get("scores", {}),
+            "scoring_rationale": scoring_result.get("rationale", {})
+        }
+
+        # 3. 共有サジェスト（2階）: 先読みした仮説に保存済みのスコアを反映して判定する
+        if check_sharing and scoring_result.get("success"):
+            if hypothesis:
+                hypothesis["quality_score"] = scoring_result["stored_quality_score"]
+            suggestion_result = await self.suggester.acheck_and_suggest(
+                hypothesis_id, user_id, trigger="quality_check", hypothesis=hypothesis
+            )
+            if suggestion_result.get("should_suggest"):
+                result["sharing_suggestion"] = self._sharing_suggestion_summary(suggestion_result)
+
+        return result
+
+    def get_hypothesis_status(self, user_id: str, hypothesis_id: str) -> Dict[str, Any]:
+        """
+        仮説の現在の状態（スコア・保留中の共有サジェスト）を取得する。
+        スコアリングをバックグラウンドで実行した場合のポーリング用。
+        """
+        hypothesis = self.db_client.get_hypothesis(hypothesis_id)
+        if not hypothesis or hypothesis.get("origin_user_id") != user_id:
+            return {"success": False, "error": "Hypothesis not found"}
+
+        pending = [
+            s for s in self.suggester.get_pending_suggestions(user_id)
+            if s.get("hypothesis_id") == hypothesis_id
+        ]
+
+        return {
+            "success": True,
+            "hypothesis_id": hypothesis_id,
+            "status": hypothesis.get("status"),
+            "verification_state": hypothesis.get("verification_state"),
+            "quality_score": hypothesis.get("quality_score") or None,
+            "sharing_suggestion": pending[0] if pending else None
+        }
+
+    @staticmethod
+    def _incubation_response(incubation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """仮説生成結果からレスポンスの基本部分を組み立てる。"""
+        return {
+            "success": True,
+            "hypothesis_id": incubation_result.get("hypothesis_id"),
+            "structured_hypothesis": incubation_result.get("structured_hypothesis"),
+            "reasoning": incubation_result.get("reasoning"),
+            "refinement_suggestions": incubation_result.get("refinement_suggestions")
+        }
+
+    @staticmethod
+    def _sharing_suggestion_summary(suggestion_result: Dict[str, Any]) -> Dict[str, Any]:
+        """共有サジェスト結果のうちレスポンスに含める部分。"""
+        return {
+            "suggestion_id": suggestion_result.get("suggestion_id"),
+            "message": suggestion_result.get("user_message"),
+            "anonymized_draft": suggestion_result.get("anonymized_draft"),
+            "benefits": suggestion_result.get("sharing_benefits")
+        }
+
     def refine_hypothesis(
         self,
         user_id: str,
@@ -163,17 +319,12 @@ class TeamBrainManager:
         }
 
         # 検証完了時は共有サジェストをチェック
-        if verification_state in ["VALIDATED", "FAILED"]:
+        if verification_state in COMPLETE_VERIFICATION_STATES:
             suggestion_result = self.suggester.check_and_suggest(
                 hypothesis_id, user_id, trigger="verification_complete"
             )
             if suggestion_result.get("should_suggest"):
-                result["sharing_suggestion"] = {
-                    "suggestion_id": suggestion_result.get("suggestion_id"),
-                    "message": suggestion_result.get("user_message"),
-                    "anonymized_draft": suggestion_result.get("anonymized_draft"),
-                    "benefits": suggestion_result.get("sharing_benefits")
-                }
+                result["sharing_suggestion"] = self._sharing_suggestion_summary(suggestion_result)
 
         return result
 
@@ -202,6 +353,14 @@ class TeamBrainManager:
             suggestion_id, user_id, action, edited_content, team_id
         )
 
+    def respond_to_suggestions(
+        self,
+        user_id: str,
+        responses: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """複数の共有サジェストにまとめて応答する。"""
+        return self.suggester.respond_to_suggestions(user_id, responses)
+
     # =========================================================================
     # 3階: 共創の広場 (Public Layer)
     # =========================================================================
@@ -217,16 +376,29 @@ class TeamBrainManager:
             team_id, verification_state, limit
         )
 
-        # コンテンツをパース
+        # コンテンツをパース（同じ版の仮説は前回のパース結果を再利用する）
         for h in hypotheses:
             if h.get("content"):
-                try:
-                    h["content_parsed"] = json.loads(h["content"])
-                except json.JSONDecodeError:
-                    h["content_parsed"] = {"statement": h["content"]}
+                h["content_parsed"] = self._parse_content_cached(h)
 
         return hypotheses
 
+    @classmethod
+    def _parse_content_cached(cls, hypothesis: Dict[str, Any]) -> Any:
+        """
+        仮説のcontentをパースする。(ID, contentのハッシュ) が同じならキャッシュを返す。
+        呼び出し側が結果を書き換えてもキャッシュに影響しないよう、コピーを返す。
+        """
+        content = hypothesis["content"]
+        key = (hypothesis.get("id"), hash(content))
+        with cls._content_cache_lock:
+            parsed = cls._content_cache.get(key)
+        if parsed is None:
+            parsed = parse_hypothesis_content(content)
+            with cls._content_cache_lock:
+                cls._content_cache[key] = parsed
+        return copy.deepcopy(parsed)
+
     def add_verification(
         self,
         user_id: str,
@@ -272,6 +444,30 @@ class TeamBrainManager:
             "verification_result": verification_result
         }
 
+    def add_verifications_bulk(
+        self,
+        user_id: str,
+        verifications: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        複数の検証結果を1回のINSERTでまとめて追加する（CSVインポートや遡っての一括登録用）。
+
+        Args:
+            user_id: 検証者のユーザーID
+            verifications: hypothesis_id, verification_result, conditions, notes, evidence, team_id の辞書のリスト
+
+        Returns:
+            追加結果（verification_ids は入力と同じ順序）
+        """
+        if not verifications:
+            return {"success": True, "verification_ids": []}
+
+        verification_ids = self.db_client.add_verifications_bulk(user_id, verifications)
+        if not verification_ids:
+            return {"success": False, "error": "Failed to add verifications"}
+
+        return {"success": True, "verification_ids": verification_ids}
+
     def get_hypothesis_verifications(
         self,
         hypothesis_id: str
@@ -304,6 +500,28 @@ class TeamBrainManager:
             user_id, thought, category
         )
 
+    async def athink_with_collective_wisdom(
+        self,
+        user_id: str,
+        thought: str,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """think_with_collective_wisdom の非同期版。"""
+        return await self.status_aware_rag.aretrieve_with_status(
+            user_id, thought, category
+        )
+
+    def think_with_collective_wisdom_stream(
+        self,
+        user_id: str,
+        thought: str,
+        category: Optional[str] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """think_with_collective_wisdom のストリーミング版（イベントの非同期イテレータを返す）。"""
+        return self.status_aware_rag.retrieve_with_status_stream(
+            user_id, thought, category
+        )
+
     def suggest_differential_verification(
         self,
         user_id: str,
@@ -315,6 +533,17 @@ class TeamBrainManager:
             user_id, hypothesis_id, new_conditions
         )
 
+    async def asuggest_differential_verification(
+        self,
+        user_id: str,
+        hypothesis_id: str,
+        new_conditions: str
+    ) -> Dict[str, Any]:
+        """suggest_differential_verification の非同期版。"""
+        return await self.status_aware_rag.asuggest_differential_verification(
+            user_id, hypothesis_id, new_conditions
+        )
+
     def record_differential_verification(
         self,
         user_id: str,
@@ -384,38 +613,31 @@ class TeamBrainManager:
     # =========================================================================
 
     def get_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
-        """ダッシュボード用の統計情報を取得する。"""
-        my_hypotheses = self.db_client.get_user_hypotheses(user_id, limit=100)
+        """
+        ダッシュボード用の統計情報を取得する。
+
+        仮説の件数はSQLの GROUP BY で集計し、保留中サジェスト・所属チームの取得と並行実行する。
+        """
+        db_client = self.db_client
+        suggester = self.suggester
+        stats_future = _DASHBOARD_EXECUTOR.submit(db_client.get_user_hypothesis_stats, user_id)
+        suggestions_future = _DASHBOARD_EXECUTOR.submit(suggester.get_pending_suggestions, user_id)
+        teams_future = _DASHBOARD_EXECUTOR.submit(db_client.get_user_teams, user_id)
+
+        rows = stats_future.result()
+        status_counts = Counter()
+        verification_counts = Counter()
+        for row in rows:
+            status_counts[row.get("status")] += row["count"]
+            verification_counts[row.get("verification_state")] += row["count"]
 
         stats = {
-            "total_hypotheses": len(my_hypotheses),
-            "by_status": {
-                "DRAFT": 0,
-                "PROPOSED": 0,
-                "SHARED": 0
-            },
-            "by_verification_state": {
-                "UNVERIFIED": 0,
-                "IN_PROGRESS": 0,
-                "VALIDATED": 0,
-                "FAILED": 0
-            },
-            "high_potential_count": 0,
-            "pending_suggestions": len(self.suggester.get_pending_suggestions(user_id)),
-            "teams": self.db_client.get_user_teams(user_id)
+            "total_hypotheses": sum(status_counts.values()),
+            "by_status": {k: status_counts.get(k, 0) for k in _STATUS_KEYS},
+            "by_verification_state": {k: verification_counts.get(k, 0) for k in _VERIFICATION_STATE_KEYS},
+            "high_potential_count": sum(row["high_potential_count"] for row in rows),
+            "pending_suggestions": len(suggestions_future.result()),
+            "teams": teams_future.result()
         }
 
-        for h in my_hypotheses:
-            status = h.get("status", "DRAFT")
-            verification = h.get("verification_state", "UNVERIFIED")
-
-            if status in stats["by_status"]:
-                stats["by_status"][status] += 1
-            if verification in stats["by_verification_state"]:
-                stats["by_verification_state"][verification] += 1
-
-            quality = h.get("quality_score", {})
-            if quality.get("is_high_potential"):
-                stats["high_potential_count"] += 1
-
         return stats
@@ -1,26 +1,39 @@
-import json
-from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.api.ai_client import AIClient
+from app.utils import json_utils
+from app.utils.llm_cache import llm_result_cache
+from app.utils.prompt_loader import load_prompt_text
 from config import MODEL_INNOVATION_SYNTHESIS
 
 class VariantGenerator:
     """
     亜種生成を行うコンポーネント。
     """
+    __slots__ = ("ai_client", "base_prompt", "_prompt_prefix")
+
     def __init__(self, ai_client: AIClient):
         self.ai_client = ai_client
-        prompt_path = Path(__file__).resolve().parents[2] / "static/prompts/variant_generation.txt"
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            self.base_prompt = f.read()
+        self.base_prompt = load_prompt_text("variant_generation.txt")
+        # 構造分析の直前までの固定部分（テンプレートにJSONの波括弧を含むため format は使わない）
+        self._prompt_prefix = f"{self.base_prompt}\n\nStructural Analysis:\n"
 
     def generate(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         構造分解された要素から亜種を生成する。
         """
         prompt = self._create_prompt(context)
-        response = self.ai_client.generate_response(prompt, model=MODEL_INNOVATION_SYNTHESIS)
+        response = self._generate_cached(prompt)
+
+        return self._apply_response(context, response)
+
+    def _generate_cached(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        プロンプト完全一致のキャッシュを通してLLMで亜種を生成する。
+        """
+        return llm_result_cache.generate(self.ai_client, prompt, model=MODEL_INNOVATION_SYNTHESIS)
 
+    @staticmethod
+    def _apply_response(context: Dict[str, Any], response: Any) -> Dict[str, Any]:
         if response and "idea_variants" in response:
             context["idea_variants"] = response["idea_variants"]
 
@@ -28,6 +41,7 @@ class VariantGenerator:
 
     def _create_prompt(self, context: Dict[str, Any]) -> str:
         structural_analysis = context.get("structural_analysis", {})
-        analysis_str = json.dumps(structural_analysis, ensure_ascii=False, indent=2)
+        # キー順を揃え、並び順だけが異なる構造分析が同じプロンプト（完全一致キャッシュのキー）になるようにする
+        analysis_str = json_utils.dumps(structural_analysis, indent=True, sort_keys=True)
 
-        return f"{self.base_prompt}\n\nStructural Analysis:\n{analysis_str}"
+        return self._prompt_prefix + analysis_str
@@ -1,12 +1,39 @@
-import json
-from typing import Any, Dict, List, Optional
+import copy
+import hashlib
+import itertools
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
 
 import mysql.connector
+from cachetools import TTLCache
 from mysql.connector import errorcode
+from mysql.connector.errors import PoolError
+
+from app.utils import json_utils
+from app.utils.query_cache import query_result_cache
+from config import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT, DB_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every DBClient in the process
+DB_POOL_NAME = "backend_pool"
+
+
+def _identity(value: Any) -> Any:
+    return value
 
-from config import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT
 
 class DBClient:
+    # Read-through caches shared by all instances in the process. user_files rows
+    # (path/owner/title) never change once inserted; catalog entries are
+    # invalidated by the catalog writers in this process and expire quickly.
+    _file_cache = TTLCache(maxsize=4096, ttl=300)
+    _service_cache = TTLCache(maxsize=4096, ttl=60)
+    _cache_lock = threading.Lock()
+
     def __init__(self):
         self.config = {
             'host': DB_HOST,
@@ -17,21 +44,94 @@ class DBClient:
             'charset': 'utf8mb4'
         }
 
+    def _connect(self):
+        """
+        Check out a connection from the process-wide pool (close() returns it).
+        Falls back to a dedicated connection when the pool is exhausted.
+        """
+        try:
+            return mysql.connector.connect(
+                pool_name=DB_POOL_NAME, pool_size=DB_POOL_SIZE, **self.config
+            )
+        except PoolError:
+            return mysql.connector.connect(**self.config)
+
+    @contextmanager
+    def _cursor(self, dictionary: bool = False) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yield (conn, cursor) on a pooled connection and close both on exit.
+        MySQL errors roll back the open transaction and propagate to the caller,
+        which decides what to log and return.
+        """
+        conn = self._connect()
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=dictionary)
+            yield conn, cursor
+        except mysql.connector.Error:
+            try:
+                conn.rollback()
+            except mysql.connector.Error:
+                pass
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            conn.close()
+
+    @classmethod
+    def _cache_get(cls, cache: TTLCache, key: Hashable) -> Optional[Dict[str, Any]]:
+        with cls._cache_lock:
+            row = cache.get(key)
+        # Callers may mutate the returned row (including its decoded JSON lists)
+        return copy.deepcopy(row) if row is not None else None
+
+    @classmethod
+    def _cache_put(cls, cache: TTLCache, key: Hashable, row: Optional[Dict[str, Any]]) -> None:
+        # Misses are not cached: the row may be inserted later
+        if row is not None:
+            with cls._cache_lock:
+                cache[key] = copy.deepcopy(row)
+
+    @classmethod
+    def _clear_service_cache(cls) -> None:
+        with cls._cache_lock:
+            cls._service_cache.clear()
+
+    @classmethod
+    def _invalidate_hypothesis_cache(cls) -> None:
+        # Called after writes that change shared / high-potential hypothesis lists
+        query_result_cache.invalidate(cls.HYPOTHESIS_CACHE_NAMESPACE)
+
     def create_user(self, line_user_id=None):
+        """
+        Return the user ID for a LINE user, creating the user if needed.
+        Existing users (the common re-login case) are resolved with a single SELECT.
+        """
         conn = None
         cursor = None
-        import uuid
         user_id = str(uuid.uuid4())
         try:
-            conn = mysql.connector.connect(**self.config)
+            conn = self._connect()
             cursor = conn.cursor()
+            if line_user_id is not None:
+                cursor.execute(
+                    "SELECT id FROM users WHERE line_user_id=%s",
+                    (line_user_id,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    return row[0]
             cursor.execute(
                 "INSERT INTO users (id, line_user_id) VALUES (%s,%s)",
                 (user_id, line_user_id),
             )
             conn.commit()
         except mysql.connector.Error as err:
+            # A concurrent login may have created the user after the SELECT;
+            # end the transaction so the re-read is not served from its snapshot
             if err.errno == errorcode.ER_DUP_ENTRY:
+                conn.rollback()
                 cursor.execute(
                     "SELECT id FROM users WHERE line_user_id=%s",
                     (line_user_id,),
@@ -39,7 +139,7 @@ class DBClient:
                 row = cursor.fetchone()
                 user_id = row[0] if row else user_id
             else:
-                print(f"[✗] MySQL Error: {err}")
+                logger.error("[✗] MySQL Error: %s", err)
         finally:
             if cursor:
                 cursor.close()
@@ -51,466 +151,402 @@ class DBClient:
         """
         Retrieves file info by UUID (extracted from file_path).
         """
-        conn = None
-        cursor = None
+        cache_key = ("uuid", file_id)
+        cached = self._cache_get(self._file_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            # Search by file path pattern since UUID is not a column
-            query = "SELECT id, user_id, file_path, is_public, title FROM user_files WHERE file_path LIKE %s LIMIT 1"
-            cursor.execute(query, (f"%{file_id}.pdf",))
-            return cursor.fetchone()
+            with self._cursor(dictionary=True) as (conn, cursor):
+                # file_uuid is a stored generated column (file name without extension), indexed
+                query = "SELECT id, user_id, file_path, is_public, title FROM user_files WHERE file_uuid = %s LIMIT 1"
+                cursor.execute(query, (file_id,))
+                row = cursor.fetchone()
+                self._cache_put(self._file_cache, cache_key, row)
+                return row
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_file_info_by_uuid: {err}")
+            logger.error("[✗] MySQL Error in get_file_info_by_uuid: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_file_by_id(self, file_id: int) -> Optional[Dict[str, Any]]:
         """
         Retrieves file info by Primary Key ID.
         """
-        conn = None
-        cursor = None
+        cache_key = ("id", file_id)
+        cached = self._cache_get(self._file_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = "SELECT id, user_id, file_path, is_public, title FROM user_files WHERE id = %s"
-            cursor.execute(query, (file_id,))
-            return cursor.fetchone()
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = "SELECT id, user_id, file_path, is_public, title FROM user_files WHERE id = %s"
+                cursor.execute(query, (file_id,))
+                row = cursor.fetchone()
+                self._cache_put(self._file_cache, cache_key, row)
+                return row
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_file_by_id: {err}")
+            logger.error("[✗] MySQL Error in get_file_by_id: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def check_file_exists(self, user_id: str, file_hash: str) -> bool:
         """
         Check if the file already exists for the user or is public.
         """
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                SELECT id FROM user_files
-                WHERE (user_id = %s AND file_hash = %s)
-                   OR (is_public = 1 AND file_hash = %s)
-                LIMIT 1
-            """
-            cursor.execute(query, (user_id, file_hash, file_hash))
-            return cursor.fetchone() is not None
+            with self._cursor() as (conn, cursor):
+                query = """
+                    SELECT id FROM user_files
+                    WHERE (user_id = %s AND file_hash = %s)
+                       OR (is_public = 1 AND file_hash = %s)
+                    LIMIT 1
+                """
+                cursor.execute(query, (user_id, file_hash, file_hash))
+                return cursor.fetchone() is not None
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in check_file_exists: {err}")
+            logger.error("[✗] MySQL Error in check_file_exists: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def insert_user_file(self, user_id: str, file_name: str, file_path: str, title: str, file_hash: str, is_public: bool) -> Optional[int]:
         """
         Inserts a record for an uploaded user file and returns the ID.
         """
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = "INSERT INTO user_files (user_id, file_name, file_path, title, file_hash, is_public) VALUES (%s, %s, %s, %s, %s, %s)"
-            cursor.execute(query, (user_id, file_name, file_path, title, file_hash, int(is_public)))
-            conn.commit()
-            return cursor.lastrowid
+            with self._cursor() as (conn, cursor):
+                query = "INSERT INTO user_files (user_id, file_name, file_path, title, file_hash, is_public) VALUES (%s, %s, %s, %s, %s, %s)"
+                cursor.execute(query, (user_id, file_name, file_path, title, file_hash, int(is_public)))
+                conn.commit()
+                return cursor.lastrowid
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def insert_message(self, user_id, role, message):
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-
-            query = """
-                INSERT INTO user_messages (user_id, role, message)
-                VALUES (%s, %s, %s)
-            """
-            values = (user_id, role, message)
-            cursor.execute(query, values)
-            conn.commit()
-
-            print(f"[✓] Inserted user_messages for user_id={user_id} role={role}")
-            return cursor.lastrowid
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO user_messages (user_id, role, message)
+                    VALUES (%s, %s, %s)
+                """
+                values = (user_id, role, message)
+                cursor.execute(query, values)
+                conn.commit()
 
+                logger.debug("[✓] Inserted user_messages for user_id=%s role=%s", user_id, role)
+                return cursor.lastrowid
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def get_user_messages(self, user_id, limit=10):
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT user_id, role, message
-                FROM user_messages
-                WHERE user_id = %s
-                ORDER BY id DESC
-                LIMIT %s
-            """
-            cursor.execute(query, (user_id, limit))
-            messages = cursor.fetchall()
-            return messages
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT user_id, role, message
+                    FROM user_messages
+                    WHERE user_id = %s
+                    ORDER BY id DESC
+                    LIMIT %s
+                """
+                cursor.execute(query, (user_id, limit))
+                messages = cursor.fetchall()
+                return messages
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_innovation_history(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         """
         イノベーションモード（構造分解など）が行われた分析ログを取得する。
         """
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            # MySQL 5.7/8.0のJSON関数を使用してフィルタリング
-            query = """
-                SELECT id, created_at, analysis
-                FROM user_message_analyses
-                WHERE user_id = %s
-                  AND JSON_EXTRACT(analysis, '$.structural_analysis') IS NOT NULL
-                ORDER BY id DESC
-                LIMIT %s
-            """
-            cursor.execute(query, (user_id, limit))
-            rows = cursor.fetchall()
-
-            results = []
-            for row in rows:
-                analysis_data = json.loads(row["analysis"]) if isinstance(row["analysis"], str) else row["analysis"]
-                results.append({
-                    "id": row["id"],
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                    "data": analysis_data
-                })
-            return results
+            with self._cursor(dictionary=True) as (conn, cursor):
+                # has_structural は analysis から生成されるインデックス付き列
+                query = """
+                    SELECT id, created_at, analysis
+                    FROM user_message_analyses
+                    WHERE user_id = %s
+                      AND has_structural = 1
+                    ORDER BY id DESC
+                    LIMIT %s
+                """
+                cursor.execute(query, (user_id, limit))
+
+                # Read rows off the (unbuffered) cursor so each raw JSON blob can be
+                # released once parsed, instead of holding fetchall()'s list as well
+                results = []
+                first = cursor.fetchone()
+                if first is None:
+                    return results
+
+                # The column type is fixed, so the driver returns the same type for every row
+                if isinstance(first["analysis"], (str, bytes, bytearray)):
+                    parse = json_utils.loads
+                else:
+                    parse = _identity
+
+                for row in itertools.chain((first,), cursor):
+                    results.append({
+                        "id": row["id"],
+                        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+                        "data": parse(row["analysis"])
+                    })
+                return results
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_recent_conversation(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT id, user_id, role, message, created_at
-                FROM (
+            with self._cursor(dictionary=True) as (conn, cursor):
+                # Backward scan of (user_id, id); flipped to chronological order below
+                query = """
                     SELECT id, user_id, role, message, created_at
                     FROM user_messages
                     WHERE user_id = %s
                     ORDER BY id DESC
                     LIMIT %s
-                ) AS recent
-                ORDER BY id ASC
-            """
-            cursor.execute(query, (user_id, limit))
-            rows = cursor.fetchall()
-            for row in rows:
-                if row.get("created_at"):
-                    row["created_at"] = row["created_at"].isoformat()
-            return rows
+                """
+                cursor.execute(query, (user_id, limit))
+                rows = cursor.fetchall()
+                rows.reverse()
+                for row in rows:
+                    if row.get("created_at"):
+                        row["created_at"] = row["created_at"].isoformat()
+                return rows
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def get_user_state(self, user_id: str) -> Optional[Dict[str, Any]]:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                SELECT interest_profile, active_hypotheses
-                FROM user_states
-                WHERE user_id = %s
-            """
-            cursor.execute(query, (user_id,))
-            row = cursor.fetchone()
-            if not row:
-                return None
-            interest_profile = json.loads(row[0]) if row[0] else None
-            active_hypotheses = json.loads(row[1]) if row[1] else None
-            return {
-                "interest_profile": interest_profile,
-                "active_hypotheses": active_hypotheses,
-            }
+            with self._cursor() as (conn, cursor):
+                query = """
+                    SELECT interest_profile, active_hypotheses
+                    FROM user_states
+                    WHERE user_id = %s
+                """
+                cursor.execute(query, (user_id,))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                interest_profile = json_utils.loads(row[0]) if row[0] else None
+                active_hypotheses = json_utils.loads(row[1]) if row[1] else None
+                return {
+                    "interest_profile": interest_profile,
+                    "active_hypotheses": active_hypotheses,
+                }
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def upsert_user_state(self, user_id: str, interest_profile: Dict[str, Any], active_hypotheses: Dict[str, Any]) -> None:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO user_states (user_id, interest_profile, active_hypotheses)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    interest_profile = VALUES(interest_profile),
-                    active_hypotheses = VALUES(active_hypotheses)
-            """
-            cursor.execute(
-                query,
-                (
-                    user_id,
-                    json.dumps(interest_profile, ensure_ascii=False),
-                    json.dumps(active_hypotheses, ensure_ascii=False),
-                ),
-            )
-            conn.commit()
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO user_states (user_id, interest_profile, active_hypotheses)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        interest_profile = VALUES(interest_profile),
+                        active_hypotheses = VALUES(active_hypotheses)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        user_id,
+                        json_utils.dumps(interest_profile),
+                        json_utils.dumps(active_hypotheses),
+                    ),
+                )
+                conn.commit()
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            logger.error("[✗] MySQL Error: %s", err)
 
     def save_captured_page(self, user_id: str, url: str, title: str, content: str, screenshot_url: Optional[str] = None) -> int:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO captured_pages (user_id, url, title, content, screenshot_url)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(query, (user_id, url, title, content, screenshot_url))
-            conn.commit()
-            return cursor.lastrowid
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO captured_pages (user_id, url, title, content, screenshot_url)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor.execute(query, (user_id, url, title, content, screenshot_url))
+                conn.commit()
+                return cursor.lastrowid
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def get_latest_captured_page(self, user_id: str) -> Optional[Dict[str, Any]]:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT * FROM captured_pages
-                WHERE user_id = %s
-                ORDER BY created_at DESC
-                LIMIT 1
-            """
-            cursor.execute(query, (user_id,))
-            row = cursor.fetchone()
-            return row
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT * FROM captured_pages
+                    WHERE user_id = %s
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                """
+                cursor.execute(query, (user_id,))
+                row = cursor.fetchone()
+                return row
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def record_analysis(self, user_id: str, user_message_id: int, analysis: Dict[str, Any]) -> None:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO user_message_analyses (user_id, user_message_id, analysis)
-                VALUES (%s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    user_id,
-                    user_message_id,
-                    json.dumps(analysis, ensure_ascii=False),
-                ),
-            )
-            conn.commit()
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO user_message_analyses (user_id, user_message_id, analysis)
+                    VALUES (%s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        user_id,
+                        user_message_id,
+                        json_utils.dumps(analysis),
+                    ),
+                )
+                conn.commit()
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            logger.error("[✗] MySQL Error: %s", err)
 
     def create_service_catalog_table(self):
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                CREATE TABLE IF NOT EXISTS service_catalog (
-                    id VARCHAR(255) PRIMARY KEY,
-                    title VARCHAR(255) NOT NULL,
-                    target TEXT,
-                    target_labels JSON,
-                    conditions TEXT,
-                    service_content TEXT,
-                    service_labels JSON,
-                    url JSON,
-                    updated_at VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-            cursor.execute(query)
-            conn.commit()
-            print("[✓] Table service_catalog created or already exists.")
+            with self._cursor() as (conn, cursor):
+                query = """
+                    CREATE TABLE IF NOT EXISTS service_catalog (
+                        id VARCHAR(255) PRIMARY KEY,
+                        title VARCHAR(255) NOT NULL,
+                        target TEXT,
+                        target_labels JSON,
+                        conditions TEXT,
+                        service_content TEXT,
+                        service_labels JSON,
+                        url JSON,
+                        updated_at VARCHAR(255),
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """
+                cursor.execute(query)
+                conn.commit()
+                logger.info("[✓] Table service_catalog created or already exists.")
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+            logger.error("[✗] MySQL Error: %s", err)
+
+    SERVICE_CATALOG_UPSERT_QUERY = """
+        INSERT INTO service_catalog (
+            id, title, target, target_labels, conditions,
+            service_content, service_labels, url, updated_at
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            title = VALUES(title),
+            target = VALUES(target),
+            target_labels = VALUES(target_labels),
+            conditions = VALUES(conditions),
+            service_content = VALUES(service_content),
+            service_labels = VALUES(service_labels),
+            url = VALUES(url),
+            updated_at = VALUES(updated_at)
+    """
+
+    # Rows per multi-row INSERT in insert_service_catalog_entries
+    SERVICE_CATALOG_BATCH_SIZE = 500
+
+    @staticmethod
+    def _service_catalog_values(entry: Dict[str, Any]) -> tuple:
+        """Build the service_catalog row for a catalog entry."""
+        # Generate a deterministic ID if not present
+        if "id" not in entry:
+            unique_str = entry.get("タイトル", "") + entry.get("URL", {}).get("items", "")
+            entry_id = hashlib.md5(unique_str.encode()).hexdigest()
+        else:
+            entry_id = entry["id"]
+
+        return (
+            entry_id,
+            entry.get("タイトル"),
+            entry.get("対象者"),
+            json_utils.dumps(entry.get("対象者ラベル", [])),
+            entry.get("条件・申し込み方法"),
+            entry.get("サービス内容"),
+            json_utils.dumps(entry.get("サービスラベル", [])),
+            json_utils.dumps(entry.get("URL", {})),
+            entry.get("更新日") or entry.get("公開日")
+        )
 
     def insert_service_catalog_entry(self, entry: Dict[str, Any]):
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO service_catalog (
-                    id, title, target, target_labels, conditions,
-                    service_content, service_labels, url, updated_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    title = VALUES(title),
-                    target = VALUES(target),
-                    target_labels = VALUES(target_labels),
-                    conditions = VALUES(conditions),
-                    service_content = VALUES(service_content),
-                    service_labels = VALUES(service_labels),
-                    url = VALUES(url),
-                    updated_at = VALUES(updated_at)
-            """
-            # Generate a deterministic ID if not present
-            import hashlib
-            if "id" not in entry:
-                unique_str = entry.get("タイトル", "") + entry.get("URL", {}).get("items", "")
-                entry_id = hashlib.md5(unique_str.encode()).hexdigest()
-            else:
-                entry_id = entry["id"]
-
-            values = (
-                entry_id,
-                entry.get("タイトル"),
-                entry.get("対象者"),
-                json.dumps(entry.get("対象者ラベル", []), ensure_ascii=False),
-                entry.get("条件・申し込み方法"),
-                entry.get("サービス内容"),
-                json.dumps(entry.get("サービスラベル", []), ensure_ascii=False),
-                json.dumps(entry.get("URL", {}), ensure_ascii=False),
-                entry.get("更新日") or entry.get("公開日")
-            )
-            cursor.execute(query, values)
-            conn.commit()
-            return entry_id
+            with self._cursor() as (conn, cursor):
+                values = self._service_catalog_values(entry)
+                cursor.execute(self.SERVICE_CATALOG_UPSERT_QUERY, values)
+                conn.commit()
+                self._clear_service_cache()
+                return values[0]
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+
+    def insert_service_catalog_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Bulk upsert of catalog entries in a single transaction.
+        executemany rewrites each chunk into one multi-row statement; chunking
+        keeps statements under max_allowed_packet for large catalogs.
+        Returns the number of entries written (0 on failure).
+        """
+        if not entries:
+            return 0
+
+        try:
+            with self._cursor() as (conn, cursor):
+                rows = [self._service_catalog_values(entry) for entry in entries]
+                for start in range(0, len(rows), self.SERVICE_CATALOG_BATCH_SIZE):
+                    cursor.executemany(
+                        self.SERVICE_CATALOG_UPSERT_QUERY,
+                        rows[start:start + self.SERVICE_CATALOG_BATCH_SIZE]
+                    )
+                conn.commit()
+                self._clear_service_cache()
+                return len(rows)
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in insert_service_catalog_entries: %s", err)
+            return 0
 
     def get_service_by_id(self, service_id: str) -> Optional[Dict[str, Any]]:
-        conn = None
-        cursor = None
+        cached = self._cache_get(self._service_cache, service_id)
+        if cached is not None:
+            return cached
+
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = "SELECT * FROM service_catalog WHERE id = %s"
-            cursor.execute(query, (service_id,))
-            row = cursor.fetchone()
-            if row:
-                if row.get("target_labels"):
-                    row["target_labels"] = json.loads(row["target_labels"])
-                if row.get("service_labels"):
-                    row["service_labels"] = json.loads(row["service_labels"])
-                if row.get("url"):
-                    row["url"] = json.loads(row["url"])
-            return row
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = "SELECT * FROM service_catalog WHERE id = %s"
+                cursor.execute(query, (service_id,))
+                row = cursor.fetchone()
+                if row:
+                    if row.get("target_labels"):
+                        row["target_labels"] = json_utils.loads(row["target_labels"])
+                    if row.get("service_labels"):
+                        row["service_labels"] = json_utils.loads(row["service_labels"])
+                    if row.get("url"):
+                        row["url"] = json_utils.loads(row["url"])
+                self._cache_put(self._service_cache, service_id, row)
+                return row
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return None
-        finally:
-            if conn:
-                conn.close()
 
     def truncate_service_catalog(self):
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = "TRUNCATE TABLE service_catalog"
-            cursor.execute(query)
-            conn.commit()
-            print("[✓] Table service_catalog truncated.")
-            return True
+            with self._cursor() as (conn, cursor):
+                query = "TRUNCATE TABLE service_catalog"
+                cursor.execute(query)
+                conn.commit()
+                self._clear_service_cache()
+                logger.info("[✓] Table service_catalog truncated.")
+                return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error: {err}")
+            logger.error("[✗] MySQL Error: %s", err)
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def add_file_categories(self, file_id: int, categories: List[str], conn=None, cursor=None) -> bool:
         """Adds categories to a file."""
@@ -521,11 +557,11 @@ class DBClient:
         local_conn = False
         if not conn:
             try:
-                conn = mysql.connector.connect(**self.config)
+                conn = self._connect()
                 cursor = conn.cursor()
                 local_conn = True
             except mysql.connector.Error as err:
-                print(f"[✗] MySQL Error in add_file_categories connection: {err}")
+                logger.error("[✗] MySQL Error in add_file_categories connection: %s", err)
                 return False
 
         try:
@@ -536,7 +572,7 @@ class DBClient:
                 conn.commit()
             return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in add_file_categories: {err}")
+            logger.error("[✗] MySQL Error in add_file_categories: %s", err)
             return False
         finally:
             if local_conn:
@@ -548,11 +584,11 @@ class DBClient:
         local_conn = False
         if not conn:
             try:
-                conn = mysql.connector.connect(**self.config)
+                conn = self._connect()
                 cursor = conn.cursor()
                 local_conn = True
             except mysql.connector.Error as err:
-                print(f"[✗] MySQL Error in delete_file_categories connection: {err}")
+                logger.error("[✗] MySQL Error in delete_file_categories connection: %s", err)
                 return False
 
         try:
@@ -562,7 +598,7 @@ class DBClient:
                 conn.commit()
             return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in delete_file_categories: {err}")
+            logger.error("[✗] MySQL Error in delete_file_categories: %s", err)
             return False
         finally:
             if local_conn:
@@ -577,11 +613,11 @@ class DBClient:
         local_conn = False
         if not conn:
             try:
-                conn = mysql.connector.connect(**self.config)
+                conn = self._connect()
                 cursor = conn.cursor()
                 local_conn = True
             except mysql.connector.Error as err:
-                print(f"[✗] MySQL Error in add_file_keywords connection: {err}")
+                logger.error("[✗] MySQL Error in add_file_keywords connection: %s", err)
                 return False
 
         try:
@@ -592,7 +628,7 @@ class DBClient:
                 conn.commit()
             return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in add_file_keywords: {err}")
+            logger.error("[✗] MySQL Error in add_file_keywords: %s", err)
             return False
         finally:
             if local_conn:
@@ -604,11 +640,11 @@ class DBClient:
         local_conn = False
         if not conn:
             try:
-                conn = mysql.connector.connect(**self.config)
+                conn = self._connect()
                 cursor = conn.cursor()
                 local_conn = True
             except mysql.connector.Error as err:
-                print(f"[✗] MySQL Error in delete_file_keywords connection: {err}")
+                logger.error("[✗] MySQL Error in delete_file_keywords connection: %s", err)
                 return False
 
         try:
@@ -618,7 +654,7 @@ class DBClient:
                 conn.commit()
             return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in delete_file_keywords: {err}")
+            logger.error("[✗] MySQL Error in delete_file_keywords: %s", err)
             return False
         finally:
             if local_conn:
@@ -631,147 +667,117 @@ class DBClient:
         Also marks the file as verified.
         Executes within a single transaction.
         """
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            # Start transaction
-            conn.start_transaction()
-            cursor = conn.cursor()
-
-            # 1. Update verification status
-            query_update = "UPDATE user_files SET is_verified = %s WHERE id = %s"
-            cursor.execute(query_update, (is_verified, file_id))
-
-            # 2. Update categories (Delete & Insert)
-            if not self.delete_file_categories(file_id, conn=conn, cursor=cursor):
-                conn.rollback()
-                return False
+            with self._cursor() as (conn, cursor):
+                conn.start_transaction()
 
-            if not self.add_file_categories(file_id, categories, conn=conn, cursor=cursor):
-                conn.rollback()
-                return False
+                # 1. Update verification status
+                query_update = "UPDATE user_files SET is_verified = %s WHERE id = %s"
+                cursor.execute(query_update, (is_verified, file_id))
 
-            # 3. Update keywords (Delete & Insert) if provided
-            if keywords is not None:
-                if not self.delete_file_keywords(file_id, conn=conn, cursor=cursor):
+                # 2. Update categories (Delete & Insert)
+                if not self.delete_file_categories(file_id, conn=conn, cursor=cursor):
                     conn.rollback()
                     return False
-                if not self.add_file_keywords(file_id, keywords, conn=conn, cursor=cursor):
+
+                if not self.add_file_categories(file_id, categories, conn=conn, cursor=cursor):
                     conn.rollback()
                     return False
 
-            conn.commit()
-            return True
+                # 3. Update keywords (Delete & Insert) if provided
+                if keywords is not None:
+                    if not self.delete_file_keywords(file_id, conn=conn, cursor=cursor):
+                        conn.rollback()
+                        return False
+                    if not self.add_file_keywords(file_id, keywords, conn=conn, cursor=cursor):
+                        conn.rollback()
+                        return False
+
+                conn.commit()
+                return True
         except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
-            print(f"[✗] MySQL Error in update_file_category: {err}")
+            logger.error("[✗] MySQL Error in update_file_category: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def update_capture_category(self, capture_id: int, category: str, is_verified: bool = True) -> bool:
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = "UPDATE captured_pages SET category = %s, is_verified = %s WHERE id = %s"
-            cursor.execute(query, (category, is_verified, capture_id))
-            conn.commit()
-            return True
+            with self._cursor() as (conn, cursor):
+                query = "UPDATE captured_pages SET category = %s, is_verified = %s WHERE id = %s"
+                cursor.execute(query, (category, is_verified, capture_id))
+                conn.commit()
+                return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in update_capture_category: {err}")
+            logger.error("[✗] MySQL Error in update_capture_category: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_all_user_contents(self, user_id: str) -> List[Dict[str, Any]]:
-        conn = None
-        cursor = None
-        contents = []
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-
-            # 1. Files (with aggregated categories and keywords)
-            # Using LEFT JOIN to ensure files without categories/keywords are still returned.
-            # We need subqueries or separate aggregations to avoid cross-product duplication issues with multiple GROUP_CONCATs
-            # But simple GROUP_CONCAT with DISTINCT usually works for simple 1:N relations.
-
-            query_files = """
-                SELECT f.id, f.title, f.is_verified, f.created_at, 'file' as type, f.file_name as source,
-                       GROUP_CONCAT(DISTINCT fc.category_name) as category,
-                       GROUP_CONCAT(DISTINCT fk.keyword) as keywords
-                FROM user_files f
-                LEFT JOIN file_categories fc ON f.id = fc.file_id
-                LEFT JOIN file_keywords fk ON f.id = fk.file_id
-                WHERE f.user_id = %s
-                GROUP BY f.id
-            """
-            cursor.execute(query_files, (user_id,))
-            files = cursor.fetchall()
-
-            # Post-process files: convert 'category' and 'keywords' strings to list
-            for f in files:
-                cat_str = f.get("category")
-                if cat_str:
-                    f["category"] = cat_str.split(",")
-                else:
-                    f["category"] = []
-
-                kw_str = f.get("keywords")
-                if kw_str:
-                    f["keywords"] = kw_str.split(",")
-                else:
-                    f["keywords"] = []
-
-            contents.extend(files)
-
-            # 2. Captured Pages
-            # Keeping as single category but wrapping in list for consistency if needed by UI
-            # or UI handles both list and string.
-            # To unify, we'll convert to list.
-            query_captures = """
-                SELECT id, title, category, is_verified, created_at, 'capture' as type, url as source
-                FROM captured_pages
-                WHERE user_id = %s
-            """
-            cursor.execute(query_captures, (user_id,))
-            captures = cursor.fetchall()
-
-            for c in captures:
-                cat = c.get("category")
-                if cat:
-                    c["category"] = [cat]
-                else:
-                    c["category"] = []
-
-            contents.extend(captures)
-
-            # Sort by created_at DESC
-            contents.sort(key=lambda x: x['created_at'], reverse=True)
-
-            # Format datetime
-            for item in contents:
-                if item.get('created_at'):
-                    item['created_at'] = item['created_at'].isoformat()
-
-            return contents
+            with self._cursor(dictionary=True) as (conn, cursor):
+                # Files (with aggregated categories and keywords) and captured pages in one
+                # round trip, sorted by the server. Categories and keywords are aggregated
+                # in separate subqueries (unique per file, so no DISTINCT) instead of joining
+                # both tables, which would build |categories| x |keywords| rows per file.
+                query = """
+                    SELECT f.id, f.title, f.is_verified, f.created_at, 'file' as type, f.file_name as source,
+                           (SELECT GROUP_CONCAT(fc.category_name) FROM file_categories fc
+                            WHERE fc.file_id = f.id) as category,
+                           (SELECT GROUP_CONCAT(fk.keyword) FROM file_keywords fk
+                            WHERE fk.file_id = f.id) as keywords
+                    FROM user_files f
+                    WHERE f.user_id = %s
+                    UNION ALL
+                    SELECT id, title, is_verified, created_at, 'capture' as type, url as source,
+                           category, NULL as keywords
+                    FROM captured_pages
+                    WHERE user_id = %s
+                    ORDER BY created_at DESC
+                """
+                cursor.execute(query, (user_id, user_id))
+
+                # Convert 'category' and 'keywords' strings to lists
+                # (a capture has a single category, wrapped in a list for consistency)
+                # and format datetime, row by row as they are read from the cursor
+                contents = []
+                for item in cursor:
+                    cat_str = item.get("category")
+                    if not cat_str:
+                        item["category"] = []
+                    elif item["type"] == "file":
+                        item["category"] = cat_str.split(",")
+                    else:
+                        item["category"] = [cat_str]
+
+                    kw_str = item.get("keywords")
+                    item["keywords"] = kw_str.split(",") if kw_str else []
+
+                    if item.get('created_at'):
+                        item['created_at'] = item['created_at'].isoformat()
+                    contents.append(item)
+
+                return contents
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_all_user_contents: {err}")
+            logger.error("[✗] MySQL Error in get_all_user_contents: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     # =========================================================================
     # Team Brain: Hypothesis Management (FR-103, FR-104)
     # =========================================================================
 
+    # query_result_cache namespace for hypothesis list queries
+    HYPOTHESIS_CACHE_NAMESPACE = "hypotheses"
+
+    # Per-hypothesis verification counts in one index range read (LATERAL, MySQL 8.0.14+),
+    # replacing one correlated COUNT subquery per counted column
+    VERIFICATION_COUNTS_JOIN = """
+        LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS total,
+                   COUNT(CASE WHEN hv.verification_result = 'SUCCESS' THEN 1 END) AS success,
+                   COUNT(CASE WHEN hv.verification_result = 'FAILURE' THEN 1 END) AS failure
+            FROM hypothesis_verifications hv
+            WHERE hv.hypothesis_id = h.id
+        ) vc ON TRUE
+    """
+
     def create_hypothesis(
         self,
         user_id: str,
@@ -783,66 +789,54 @@ class DBClient:
         """
         Create a new hypothesis (1階: Private Layer).
         """
-        conn = None
-        cursor = None
-        import uuid
-        import hashlib
         hypothesis_id = str(uuid.uuid4())
         user_hash = hashlib.sha256(user_id.encode()).hexdigest()[:16]
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO hypotheses (
-                    id, origin_user_id, origin_user_id_hash, content,
-                    original_experience, tags, parent_hypothesis_id
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(query, (
-                hypothesis_id,
-                user_id,
-                user_hash,
-                content,
-                original_experience,
-                json.dumps(tags or [], ensure_ascii=False),
-                parent_hypothesis_id
-            ))
-            conn.commit()
-            print(f"[✓] Created hypothesis {hypothesis_id} for user {user_id}")
-            return hypothesis_id
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO hypotheses (
+                        id, origin_user_id, origin_user_id_hash, content,
+                        original_experience, tags, parent_hypothesis_id
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(query, (
+                    hypothesis_id,
+                    user_id,
+                    user_hash,
+                    content,
+                    original_experience,
+                    json_utils.dumps(tags or []),
+                    parent_hypothesis_id
+                ))
+                conn.commit()
+                logger.debug("[✓] Created hypothesis %s for user %s", hypothesis_id, user_id)
+                return hypothesis_id
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in create_hypothesis: {err}")
+            logger.error("[✗] MySQL Error in create_hypothesis: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_hypothesis(self, hypothesis_id: str) -> Optional[Dict[str, Any]]:
         """Get a single hypothesis by ID."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT h.*,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id) as verification_count,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id AND hv.verification_result = 'SUCCESS') as success_count
-                FROM hypotheses h
-                WHERE h.id = %s
-            """
-            cursor.execute(query, (hypothesis_id,))
-            row = cursor.fetchone()
-            if row:
-                row = self._format_hypothesis_row(row)
-            return row
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = f"""
+                    SELECT h.*,
+                           IF(JSON_VALID(h.content), JSON_UNQUOTE(JSON_EXTRACT(h.content, '$.statement')), NULL) as statement,
+                           vc.total as verification_count,
+                           vc.success as success_count
+                    FROM hypotheses h
+                    {self.VERIFICATION_COUNTS_JOIN}
+                    WHERE h.id = %s
+                """
+                cursor.execute(query, (hypothesis_id,))
+                row = cursor.fetchone()
+                if row:
+                    row = self._format_hypothesis_row(row)
+                return row
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_hypothesis: {err}")
+            logger.error("[✗] MySQL Error in get_hypothesis: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_user_hypotheses(
         self,
@@ -854,15 +848,30 @@ class DBClient:
         """
         Get hypotheses for a user (1階: Private Layer).
         """
+        return list(self.iter_user_hypotheses(user_id, status, verification_state, limit))
+
+    def iter_user_hypotheses(
+        self,
+        user_id: str,
+        status: str = None,
+        verification_state: str = None,
+        limit: int = 50
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream hypotheses for a user, formatting each row as it is read from the cursor.
+        The connection stays open until the generator is exhausted or closed.
+        """
         conn = None
         cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
+            conn = self._connect()
             cursor = conn.cursor(dictionary=True)
-            query = """
+            query = f"""
                 SELECT h.*,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id) as verification_count
+                       IF(JSON_VALID(h.content), JSON_UNQUOTE(JSON_EXTRACT(h.content, '$.statement')), NULL) as statement,
+                       vc.total as verification_count
                 FROM hypotheses h
+                {self.VERIFICATION_COUNTS_JOIN}
                 WHERE h.origin_user_id = %s
             """
             params = [user_id]
@@ -875,13 +884,20 @@ class DBClient:
             query += " ORDER BY h.updated_at DESC LIMIT %s"
             params.append(limit)
             cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return [self._format_hypothesis_row(row) for row in rows]
+            row = cursor.fetchone()
+            while row is not None:
+                yield self._format_hypothesis_row(row)
+                row = cursor.fetchone()
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_user_hypotheses: {err}")
-            return []
+            logger.error("[✗] MySQL Error in iter_user_hypotheses: %s", err)
         finally:
-            if cursor: cursor.close()
+            if cursor:
+                # Drain unread rows so the connection can be closed cleanly
+                try:
+                    cursor.fetchall()
+                except mysql.connector.Error:
+                    pass
+                cursor.close()
             if conn: conn.close()
 
     def update_hypothesis(
@@ -894,44 +910,38 @@ class DBClient:
         tags: List[str] = None
     ) -> bool:
         """Update hypothesis (ownership check included)."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-
-            # Build dynamic update
-            updates = []
-            params = []
-            if content is not None:
-                updates.append("content = %s")
-                params.append(content)
-            if status is not None:
-                updates.append("status = %s")
-                params.append(status)
-                if status == 'SHARED':
-                    updates.append("shared_at = NOW()")
-            if verification_state is not None:
-                updates.append("verification_state = %s")
-                params.append(verification_state)
-            if tags is not None:
-                updates.append("tags = %s")
-                params.append(json.dumps(tags, ensure_ascii=False))
-
-            if not updates:
-                return True
-
-            query = f"UPDATE hypotheses SET {', '.join(updates)} WHERE id = %s AND origin_user_id = %s"
-            params.extend([hypothesis_id, user_id])
-            cursor.execute(query, tuple(params))
-            conn.commit()
-            return cursor.rowcount > 0
+            with self._cursor() as (conn, cursor):
+                # Build dynamic update
+                updates = []
+                params = []
+                if content is not None:
+                    updates.append("content = %s")
+                    params.append(content)
+                if status is not None:
+                    updates.append("status = %s")
+                    params.append(status)
+                    if status == 'SHARED':
+                        updates.append("shared_at = NOW()")
+                if verification_state is not None:
+                    updates.append("verification_state = %s")
+                    params.append(verification_state)
+                if tags is not None:
+                    updates.append("tags = %s")
+                    params.append(json_utils.dumps(tags))
+
+                if not updates:
+                    return True
+
+                query = f"UPDATE hypotheses SET {', '.join(updates)} WHERE id = %s AND origin_user_id = %s"
+                params.extend([hypothesis_id, user_id])
+                cursor.execute(query, tuple(params))
+                conn.commit()
+                self._invalidate_hypothesis_cache()
+                return cursor.rowcount > 0
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in update_hypothesis: {err}")
+            logger.error("[✗] MySQL Error in update_hypothesis: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def update_hypothesis_verification_state(
         self,
@@ -948,9 +958,9 @@ class DBClient:
     def _format_hypothesis_row(self, row: Dict) -> Dict:
         """Format hypothesis row for API response."""
         if row.get('tags') and isinstance(row['tags'], str):
-            row['tags'] = json.loads(row['tags'])
+            row['tags'] = json_utils.loads(row['tags'])
         if row.get('quality_score') and isinstance(row['quality_score'], str):
-            row['quality_score'] = json.loads(row['quality_score'])
+            row['quality_score'] = json_utils.loads(row['quality_score'])
         if row.get('created_at'):
             row['created_at'] = row['created_at'].isoformat()
         if row.get('updated_at'):
@@ -976,38 +986,87 @@ class DBClient:
         parent_verification_id: int = None
     ) -> Optional[int]:
         """Add a verification result to a hypothesis."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO hypothesis_verifications (
-                    hypothesis_id, verifier_user_id, verifier_team_id,
-                    verification_result, conditions, notes, evidence,
-                    is_differential, parent_verification_id
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(query, (
-                hypothesis_id,
-                verifier_user_id,
-                verifier_team_id,
-                verification_result,
-                conditions,
-                notes,
-                json.dumps(evidence, ensure_ascii=False) if evidence else None,
-                is_differential,
-                parent_verification_id
-            ))
-            conn.commit()
-            return cursor.lastrowid
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO hypothesis_verifications (
+                        hypothesis_id, verifier_user_id, verifier_team_id,
+                        verification_result, conditions, notes, evidence,
+                        is_differential, parent_verification_id
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(query, (
+                    hypothesis_id,
+                    verifier_user_id,
+                    verifier_team_id,
+                    verification_result,
+                    conditions,
+                    notes,
+                    json_utils.dumps(evidence) if evidence else None,
+                    is_differential,
+                    parent_verification_id
+                ))
+                conn.commit()
+                self._invalidate_hypothesis_cache()
+                return cursor.lastrowid
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in add_verification: {err}")
+            logger.error("[✗] MySQL Error in add_verification: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
+
+    def add_verifications_bulk(
+        self,
+        verifier_user_id: str,
+        verifications: List[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Add several verification results with one multi-row INSERT.
+        executemany rewrites the INSERT into a single statement; InnoDB gives
+        a simple multi-row INSERT consecutive auto-increment values in every
+        lock mode, so the IDs are lastrowid + i * @@auto_increment_increment.
+        Returns the new verification IDs in input order ([] on failure).
+        """
+        if not verifications:
+            return []
+
+        try:
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO hypothesis_verifications (
+                        hypothesis_id, verifier_user_id, verifier_team_id,
+                        verification_result, conditions, notes, evidence
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """
+                rows = [
+                    (
+                        v["hypothesis_id"],
+                        verifier_user_id,
+                        v.get("team_id"),
+                        v["verification_result"],
+                        v.get("conditions"),
+                        v.get("notes"),
+                        json_utils.dumps(v["evidence"]) if v.get("evidence") else None
+                    )
+                    for v in verifications
+                ]
+                cursor.executemany(query, rows)
+                if cursor.rowcount != len(rows):
+                    logger.error(
+                        "[✗] add_verifications_bulk inserted %s of %s rows", cursor.rowcount, len(rows)
+                    )
+                    conn.rollback()
+                    return []
+                first_id = cursor.lastrowid
+
+                cursor.execute("SELECT @@auto_increment_increment")
+                (increment,) = cursor.fetchone()
+                conn.commit()
+                self._invalidate_hypothesis_cache()
+                return [first_id + i * increment for i in range(len(rows))]
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in add_verifications_bulk: %s", err)
+            return []
 
     def get_hypothesis_verifications(
         self,
@@ -1015,38 +1074,141 @@ class DBClient:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get all verifications for a hypothesis."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT hv.*, t.name as team_name
-                FROM hypothesis_verifications hv
-                LEFT JOIN teams t ON hv.verifier_team_id = t.id
-                WHERE hv.hypothesis_id = %s
-                ORDER BY hv.created_at DESC
-                LIMIT %s
-            """
-            cursor.execute(query, (hypothesis_id, limit))
-            rows = cursor.fetchall()
-            for row in rows:
-                if row.get('evidence') and isinstance(row['evidence'], str):
-                    row['evidence'] = json.loads(row['evidence'])
-                if row.get('created_at'):
-                    row['created_at'] = row['created_at'].isoformat()
-            return rows
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT hv.*, t.name as team_name
+                    FROM hypothesis_verifications hv
+                    LEFT JOIN teams t ON hv.verifier_team_id = t.id
+                    WHERE hv.hypothesis_id = %s
+                    ORDER BY hv.created_at DESC
+                    LIMIT %s
+                """
+                cursor.execute(query, (hypothesis_id, limit))
+                rows = cursor.fetchall()
+                for row in rows:
+                    if row.get('evidence') and isinstance(row['evidence'], str):
+                        row['evidence'] = json_utils.loads(row['evidence'])
+                    if row.get('created_at'):
+                        row['created_at'] = row['created_at'].isoformat()
+                return rows
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_hypothesis_verifications: {err}")
+            logger.error("[✗] MySQL Error in get_hypothesis_verifications: %s", err)
+            return []
+
+    def get_verification_summary(
+        self,
+        hypothesis_id: str,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Aggregate verifications for a hypothesis in SQL.
+
+        Returns result counts (GROUP BY verification_result) and the most
+        recent verifications with only the columns needed for a per-team
+        rollup, without fetching evidence payloads.
+        """
+        try:
+            with self._cursor(dictionary=True) as (conn, cursor):
+                cursor.execute(
+                    """
+                    SELECT verification_result, COUNT(*) as count
+                    FROM hypothesis_verifications
+                    WHERE hypothesis_id = %s
+                    GROUP BY verification_result
+                    """,
+                    (hypothesis_id,)
+                )
+                counts = {row['verification_result']: row['count'] for row in cursor.fetchall()}
+
+                cursor.execute(
+                    """
+                    SELECT t.name as team_name, hv.verification_result, hv.conditions,
+                           hv.notes, hv.created_at
+                    FROM hypothesis_verifications hv
+                    LEFT JOIN teams t ON hv.verifier_team_id = t.id
+                    WHERE hv.hypothesis_id = %s
+                    ORDER BY hv.created_at DESC
+                    LIMIT %s
+                    """,
+                    (hypothesis_id, limit)
+                )
+                rows = cursor.fetchall()
+                for row in rows:
+                    if row.get('created_at'):
+                        row['created_at'] = row['created_at'].isoformat()
+                return {"counts": counts, "rows": rows}
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in get_verification_summary: %s", err)
+            return {"counts": {}, "rows": []}
+
+    def get_user_hypothesis_stats(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Aggregate a user's hypotheses in SQL for the dashboard.
+
+        Returns one row per (status, verification_state) with the hypothesis
+        count and how many of them are flagged high-potential in quality_score.
+        """
+        try:
+            with self._cursor(dictionary=True) as (conn, cursor):
+                cursor.execute(
+                    """
+                    SELECT status, verification_state,
+                           COUNT(*) as count,
+                           SUM(IF(JSON_EXTRACT(quality_score, '$.is_high_potential') = CAST('true' AS JSON), 1, 0))
+                               as high_potential_count
+                    FROM hypotheses
+                    WHERE origin_user_id = %s
+                    GROUP BY status, verification_state
+                    """,
+                    (user_id,)
+                )
+                rows = cursor.fetchall()
+                for row in rows:
+                    row['count'] = int(row['count'])
+                    row['high_potential_count'] = int(row['high_potential_count'] or 0)
+                return rows
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in get_user_hypothesis_stats: %s", err)
+            return []
+
+    def get_conditions_tried(self, hypothesis_id: str) -> List[str]:
+        """Get the conditions of all verifications recorded for a hypothesis."""
+        try:
+            with self._cursor() as (conn, cursor):
+                query = """
+                    SELECT conditions
+                    FROM hypothesis_verifications
+                    WHERE hypothesis_id = %s AND conditions IS NOT NULL AND conditions != ''
+                    ORDER BY created_at DESC
+                """
+                cursor.execute(query, (hypothesis_id,))
+                return [row[0] for row in cursor.fetchall()]
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in get_conditions_tried: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     # =========================================================================
     # Team Brain: Quality Scoring (FR-201)
     # =========================================================================
 
+    @staticmethod
+    def quality_score_record(
+        novelty_score: float,
+        specificity_score: float,
+        impact_score: float,
+        overall_score: float,
+        is_high_potential: bool
+    ) -> Dict[str, Any]:
+        """The latest-score summary stored in hypotheses.quality_score."""
+        return {
+            "novelty": novelty_score,
+            "specificity": specificity_score,
+            "impact": impact_score,
+            "overall": overall_score,
+            "is_high_potential": is_high_potential
+        }
+
     def save_quality_score(
         self,
         hypothesis_id: str,
@@ -1058,55 +1220,45 @@ class DBClient:
         scoring_rationale: str = None
     ) -> Optional[int]:
         """Save quality score for a hypothesis."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-
-            # Insert score record
-            query = """
-                INSERT INTO hypothesis_quality_scores (
-                    hypothesis_id, novelty_score, specificity_score,
-                    impact_score, overall_score, is_high_potential,
+            with self._cursor() as (conn, cursor):
+                # Insert score record
+                query = """
+                    INSERT INTO hypothesis_quality_scores (
+                        hypothesis_id, novelty_score, specificity_score,
+                        impact_score, overall_score, is_high_potential,
+                        scoring_rationale
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(query, (
+                    hypothesis_id,
+                    novelty_score,
+                    specificity_score,
+                    impact_score,
+                    overall_score,
+                    is_high_potential,
                     scoring_rationale
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(query, (
-                hypothesis_id,
-                novelty_score,
-                specificity_score,
-                impact_score,
-                overall_score,
-                is_high_potential,
-                scoring_rationale
-            ))
-            score_id = cursor.lastrowid
-
-            # Update hypothesis with latest score
-            update_query = """
-                UPDATE hypotheses
-                SET quality_score = %s
-                WHERE id = %s
-            """
-            score_json = json.dumps({
-                "novelty": novelty_score,
-                "specificity": specificity_score,
-                "impact": impact_score,
-                "overall": overall_score,
-                "is_high_potential": is_high_potential
-            })
-            cursor.execute(update_query, (score_json, hypothesis_id))
+                ))
+                score_id = cursor.lastrowid
+
+                # Update hypothesis with latest score
+                update_query = """
+                    UPDATE hypotheses
+                    SET quality_score = %s
+                    WHERE id = %s
+                """
+                score_json = json_utils.dumps(self.quality_score_record(
+                    novelty_score, specificity_score, impact_score, overall_score, is_high_potential
+                ))
+                cursor.execute(update_query, (score_json, hypothesis_id))
 
-            conn.commit()
-            return score_id
+                conn.commit()
+                self._invalidate_hypothesis_cache()
+                return score_id
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in save_quality_score: {err}")
+            logger.error("[✗] MySQL Error in save_quality_score: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_high_potential_hypotheses(
         self,
@@ -1114,32 +1266,42 @@ class DBClient:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get hypotheses marked as high potential."""
-        conn = None
-        cursor = None
+        rows = query_result_cache.get_or_compute(
+            self.HYPOTHESIS_CACHE_NAMESPACE,
+            ("high_potential", user_id, limit),
+            lambda: self._fetch_high_potential_hypotheses(user_id, limit)
+        )
+        return rows if rows is not None else []
+
+    def _fetch_high_potential_hypotheses(
+        self,
+        user_id: Optional[str],
+        limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT h.*, hqs.overall_score, hqs.scoring_rationale
-                FROM hypotheses h
-                JOIN hypothesis_quality_scores hqs ON h.id = hqs.hypothesis_id
-                WHERE hqs.is_high_potential = TRUE
-            """
-            params = []
-            if user_id:
-                query += " AND h.origin_user_id = %s"
-                params.append(user_id)
-            query += " ORDER BY hqs.overall_score DESC LIMIT %s"
-            params.append(limit)
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return [self._format_hypothesis_row(row) for row in rows]
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT h.*, hqs.overall_score, hqs.scoring_rationale
+                    FROM hypotheses h
+                    JOIN hypothesis_quality_scores hqs ON h.id = hqs.hypothesis_id
+                    WHERE hqs.is_high_potential = TRUE
+                """
+                params = []
+                if user_id:
+                    query += " AND h.origin_user_id = %s"
+                    params.append(user_id)
+                query += " ORDER BY hqs.overall_score DESC LIMIT %s"
+                params.append(limit)
+                cursor.execute(query, tuple(params))
+                rows = cursor.fetchall()
+                for row in rows:
+                    # DECIMAL(3,2) -> float so the rows are JSON-serializable
+                    if row.get('overall_score') is not None:
+                        row['overall_score'] = float(row['overall_score'])
+                return [self._format_hypothesis_row(row) for row in rows]
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_high_potential_hypotheses: {err}")
-            return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
+            logger.error("[✗] MySQL Error in get_high_potential_hypotheses: %s", err)
+            return None
 
     # =========================================================================
     # Team Brain: Sharing Suggestions (FR-202)
@@ -1153,28 +1315,22 @@ class DBClient:
         draft_content: str
     ) -> Optional[int]:
         """Create a sharing suggestion for a hypothesis."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO sharing_suggestions (
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO sharing_suggestions (
+                        hypothesis_id, user_id, suggestion_reason, draft_content
+                    )
+                    VALUES (%s, %s, %s, %s)
+                """
+                cursor.execute(query, (
                     hypothesis_id, user_id, suggestion_reason, draft_content
-                )
-                VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(query, (
-                hypothesis_id, user_id, suggestion_reason, draft_content
-            ))
-            conn.commit()
-            return cursor.lastrowid
+                ))
+                conn.commit()
+                return cursor.lastrowid
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in create_sharing_suggestion: {err}")
+            logger.error("[✗] MySQL Error in create_sharing_suggestion: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_pending_suggestions(
         self,
@@ -1182,31 +1338,75 @@ class DBClient:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get pending sharing suggestions for a user."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT ss.*, h.content as hypothesis_content
-                FROM sharing_suggestions ss
-                JOIN hypotheses h ON ss.hypothesis_id = h.id
-                WHERE ss.user_id = %s AND ss.status = 'PENDING'
-                ORDER BY ss.created_at DESC
-                LIMIT %s
-            """
-            cursor.execute(query, (user_id, limit))
-            rows = cursor.fetchall()
-            for row in rows:
-                if row.get('created_at'):
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT ss.*, h.content as hypothesis_content
+                    FROM sharing_suggestions ss
+                    JOIN hypotheses h ON ss.hypothesis_id = h.id
+                    WHERE ss.user_id = %s AND ss.status = 'PENDING'
+                    ORDER BY ss.created_at DESC
+                    LIMIT %s
+                """
+                cursor.execute(query, (user_id, limit))
+                rows = cursor.fetchall()
+                for row in rows:
+                    if row.get('created_at'):
+                        row['created_at'] = row['created_at'].isoformat()
+                return rows
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in get_pending_suggestions: %s", err)
+            return []
+
+    def get_pending_suggestion(
+        self,
+        suggestion_id: int,
+        user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single pending sharing suggestion owned by the user."""
+        try:
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT ss.*, h.content as hypothesis_content
+                    FROM sharing_suggestions ss
+                    JOIN hypotheses h ON ss.hypothesis_id = h.id
+                    WHERE ss.id = %s AND ss.user_id = %s AND ss.status = 'PENDING'
+                """
+                cursor.execute(query, (suggestion_id, user_id))
+                row = cursor.fetchone()
+                if row and row.get('created_at'):
                     row['created_at'] = row['created_at'].isoformat()
-            return rows
+                return row
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_pending_suggestions: {err}")
+            logger.error("[✗] MySQL Error in get_pending_suggestion: %s", err)
+            return None
+
+    def get_pending_suggestions_by_ids(
+        self,
+        suggestion_ids: List[int],
+        user_id: str
+    ) -> List[Dict[str, Any]]:
+        """Get pending sharing suggestions owned by the user, by id, in one query."""
+        if not suggestion_ids:
+            return []
+        try:
+            with self._cursor(dictionary=True) as (conn, cursor):
+                placeholders = ", ".join(["%s"] * len(suggestion_ids))
+                query = f"""
+                    SELECT ss.*, h.content as hypothesis_content
+                    FROM sharing_suggestions ss
+                    JOIN hypotheses h ON ss.hypothesis_id = h.id
+                    WHERE ss.id IN ({placeholders}) AND ss.user_id = %s AND ss.status = 'PENDING'
+                """
+                cursor.execute(query, (*suggestion_ids, user_id))
+                rows = cursor.fetchall()
+                for row in rows:
+                    if row.get('created_at'):
+                        row['created_at'] = row['created_at'].isoformat()
+                return rows
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in get_pending_suggestions_by_ids: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def respond_to_suggestion(
         self,
@@ -1216,25 +1416,79 @@ class DBClient:
         edited_content: str = None
     ) -> bool:
         """Respond to a sharing suggestion."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                UPDATE sharing_suggestions
-                SET status = %s, edited_content = %s, responded_at = NOW()
-                WHERE id = %s AND user_id = %s
-            """
-            cursor.execute(query, (status, edited_content, suggestion_id, user_id))
-            conn.commit()
-            return cursor.rowcount > 0
+            with self._cursor() as (conn, cursor):
+                query = """
+                    UPDATE sharing_suggestions
+                    SET status = %s, edited_content = %s, responded_at = NOW()
+                    WHERE id = %s AND user_id = %s AND status = 'PENDING'
+                """
+                cursor.execute(query, (status, edited_content, suggestion_id, user_id))
+                conn.commit()
+                return cursor.rowcount > 0
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in respond_to_suggestion: {err}")
+            logger.error("[✗] MySQL Error in respond_to_suggestion: %s", err)
+            return False
+
+    def accept_and_share_suggestion(
+        self,
+        suggestion_id: int,
+        hypothesis_id: str,
+        user_id: str,
+        team_id: str = None,
+        edited_content: str = None
+    ) -> bool:
+        """
+        Accept a sharing suggestion and share the hypothesis in one transaction.
+
+        When edited_content is given the suggestion is marked EDITED and the
+        hypothesis content is replaced before sharing; otherwise ACCEPTED.
+        Nothing is applied (returns False) unless the suggestion is still PENDING
+        and the hypothesis can be shared (DRAFT/PROPOSED).
+        """
+        try:
+            with self._cursor() as (conn, cursor):
+                conn.start_transaction()
+
+                status = 'EDITED' if edited_content is not None else 'ACCEPTED'
+                cursor.execute(
+                    """
+                    UPDATE sharing_suggestions
+                    SET status = %s, edited_content = %s, responded_at = NOW()
+                    WHERE id = %s AND user_id = %s AND status = 'PENDING'
+                    """,
+                    (status, edited_content, suggestion_id, user_id)
+                )
+                # Already answered (e.g. a concurrent accept/reject) or not this user's
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return False
+
+                if edited_content is not None:
+                    cursor.execute(
+                        "UPDATE hypotheses SET content = %s WHERE id = %s AND origin_user_id = %s",
+                        (edited_content, hypothesis_id, user_id)
+                    )
+
+                cursor.execute(
+                    """
+                    UPDATE hypotheses
+                    SET status = 'SHARED', team_id = %s, shared_at = NOW()
+                    WHERE id = %s AND origin_user_id = %s AND status IN ('DRAFT', 'PROPOSED')
+                    """,
+                    (team_id, hypothesis_id, user_id)
+                )
+                # Hypothesis missing or already shared: keep the suggestion PENDING
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return False
+
+                conn.commit()
+                self._invalidate_hypothesis_cache()
+                return True
+        except mysql.connector.Error as err:
+            logger.error("[✗] MySQL Error in accept_and_share_suggestion: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     # =========================================================================
     # Team Brain: Public Hypothesis Bank (FR-301)
@@ -1250,47 +1504,55 @@ class DBClient:
         Get shared hypotheses (3階: Public Layer).
         Returns hypotheses with their verification status summary.
         """
-        conn = None
-        cursor = None
+        rows = query_result_cache.get_or_compute(
+            self.HYPOTHESIS_CACHE_NAMESPACE,
+            ("shared", team_id, verification_state, limit),
+            lambda: self._fetch_shared_hypotheses(team_id, verification_state, limit)
+        )
+        return rows if rows is not None else []
+
+    def _fetch_shared_hypotheses(
+        self,
+        team_id: Optional[str],
+        verification_state: Optional[str],
+        limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT h.*,
-                       h.origin_user_id_hash as anonymous_author,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id) as total_verifications,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id AND hv.verification_result = 'SUCCESS') as success_count,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id AND hv.verification_result = 'FAILURE') as failure_count
-                FROM hypotheses h
-                WHERE h.status = 'SHARED'
-            """
-            params = []
-            if team_id:
-                query += " AND h.team_id = %s"
-                params.append(team_id)
-            if verification_state:
-                query += " AND h.verification_state = %s"
-                params.append(verification_state)
-            query += " ORDER BY h.shared_at DESC LIMIT %s"
-            params.append(limit)
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-
-            # Remove sensitive data and format
-            result = []
-            for row in rows:
-                row = self._format_hypothesis_row(row)
-                # Remove origin_user_id from public view
-                if 'origin_user_id' in row:
-                    del row['origin_user_id']
-                result.append(row)
-            return result
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = f"""
+                    SELECT h.*,
+                           h.origin_user_id_hash as anonymous_author,
+                           vc.total as total_verifications,
+                           vc.success as success_count,
+                           vc.failure as failure_count
+                    FROM hypotheses h
+                    {self.VERIFICATION_COUNTS_JOIN}
+                    WHERE h.status = 'SHARED'
+                """
+                params = []
+                if team_id:
+                    query += " AND h.team_id = %s"
+                    params.append(team_id)
+                if verification_state:
+                    query += " AND h.verification_state = %s"
+                    params.append(verification_state)
+                query += " ORDER BY h.shared_at DESC LIMIT %s"
+                params.append(limit)
+                cursor.execute(query, tuple(params))
+                rows = cursor.fetchall()
+
+                # Remove sensitive data and format
+                result = []
+                for row in rows:
+                    row = self._format_hypothesis_row(row)
+                    # Remove origin_user_id from public view
+                    if 'origin_user_id' in row:
+                        del row['origin_user_id']
+                    result.append(row)
+                return result
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_shared_hypotheses: {err}")
-            return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
+            logger.error("[✗] MySQL Error in get_shared_hypotheses: %s", err)
+            return None
 
     def share_hypothesis(
         self,
@@ -1299,25 +1561,20 @@ class DBClient:
         team_id: str = None
     ) -> bool:
         """Share a hypothesis to the public layer."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                UPDATE hypotheses
-                SET status = 'SHARED', team_id = %s, shared_at = NOW()
-                WHERE id = %s AND origin_user_id = %s AND status IN ('DRAFT', 'PROPOSED')
-            """
-            cursor.execute(query, (team_id, hypothesis_id, user_id))
-            conn.commit()
-            return cursor.rowcount > 0
+            with self._cursor() as (conn, cursor):
+                query = """
+                    UPDATE hypotheses
+                    SET status = 'SHARED', team_id = %s, shared_at = NOW()
+                    WHERE id = %s AND origin_user_id = %s AND status IN ('DRAFT', 'PROPOSED')
+                """
+                cursor.execute(query, (team_id, hypothesis_id, user_id))
+                conn.commit()
+                self._invalidate_hypothesis_cache()
+                return cursor.rowcount > 0
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in share_hypothesis: {err}")
+            logger.error("[✗] MySQL Error in share_hypothesis: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     # =========================================================================
     # Team Brain: Team Management
@@ -1330,68 +1587,54 @@ class DBClient:
         description: str = None
     ) -> Optional[str]:
         """Create a new team."""
-        conn = None
-        cursor = None
-        import uuid
         team_id = str(uuid.uuid4())
         try:
-            conn = mysql.connector.connect(**self.config)
-            conn.start_transaction()
-            cursor = conn.cursor()
+            with self._cursor() as (conn, cursor):
+                conn.start_transaction()
+
+                # Create team
+                query = """
+                    INSERT INTO teams (id, name, description, created_by)
+                    VALUES (%s, %s, %s, %s)
+                """
+                cursor.execute(query, (team_id, name, description, created_by))
+
+                # Add creator as owner
+                member_query = """
+                    INSERT INTO team_members (team_id, user_id, role)
+                    VALUES (%s, %s, 'owner')
+                """
+                cursor.execute(member_query, (team_id, created_by))
 
-            # Create team
-            query = """
-                INSERT INTO teams (id, name, description, created_by)
-                VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(query, (team_id, name, description, created_by))
-
-            # Add creator as owner
-            member_query = """
-                INSERT INTO team_members (team_id, user_id, role)
-                VALUES (%s, %s, 'owner')
-            """
-            cursor.execute(member_query, (team_id, created_by))
-
-            conn.commit()
-            return team_id
+                conn.commit()
+                return team_id
         except mysql.connector.Error as err:
-            if conn: conn.rollback()
-            print(f"[✗] MySQL Error in create_team: {err}")
+            logger.error("[✗] MySQL Error in create_team: %s", err)
             return None
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def get_user_teams(self, user_id: str) -> List[Dict[str, Any]]:
         """Get teams a user belongs to."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT t.*, tm.role,
-                       (SELECT COUNT(*) FROM team_members WHERE team_id = t.id) as member_count
-                FROM teams t
-                JOIN team_members tm ON t.id = tm.team_id
-                WHERE tm.user_id = %s
-                ORDER BY t.name
-            """
-            cursor.execute(query, (user_id,))
-            rows = cursor.fetchall()
-            for row in rows:
-                if row.get('created_at'):
-                    row['created_at'] = row['created_at'].isoformat()
-                if row.get('updated_at'):
-                    row['updated_at'] = row['updated_at'].isoformat()
-            return rows
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = """
+                    SELECT t.*, tm.role,
+                           (SELECT COUNT(*) FROM team_members WHERE team_id = t.id) as member_count
+                    FROM teams t
+                    JOIN team_members tm ON t.id = tm.team_id
+                    WHERE tm.user_id = %s
+                    ORDER BY t.name
+                """
+                cursor.execute(query, (user_id,))
+                rows = cursor.fetchall()
+                for row in rows:
+                    if row.get('created_at'):
+                        row['created_at'] = row['created_at'].isoformat()
+                    if row.get('updated_at'):
+                        row['updated_at'] = row['updated_at'].isoformat()
+                return rows
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in get_user_teams: {err}")
+            logger.error("[✗] MySQL Error in get_user_teams: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     def add_team_member(
         self,
@@ -1400,30 +1643,27 @@ class DBClient:
         role: str = 'viewer'
     ) -> bool:
         """Add a member to a team."""
-        conn = None
-        cursor = None
         try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
-            query = """
-                INSERT INTO team_members (team_id, user_id, role)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE role = VALUES(role)
-            """
-            cursor.execute(query, (team_id, user_id, role))
-            conn.commit()
-            return True
+            with self._cursor() as (conn, cursor):
+                query = """
+                    INSERT INTO team_members (team_id, user_id, role)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE role = VALUES(role)
+                """
+                cursor.execute(query, (team_id, user_id, role))
+                conn.commit()
+                return True
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in add_team_member: {err}")
+            logger.error("[✗] MySQL Error in add_team_member: %s", err)
             return False
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
 
     # =========================================================================
     # Team Brain: Status-Aware RAG Support (FR-401)
     # =========================================================================
 
+    # ngram_token_size of the hypotheses FULLTEXT index (mysql/my.cnf)
+    FULLTEXT_MIN_TERM_LENGTH = 2
+
     def search_hypotheses_for_rag(
         self,
         keywords: List[str],
@@ -1434,46 +1674,46 @@ class DBClient:
         """
         Search shared hypotheses for RAG retrieval.
         Returns hypotheses with verification status metadata.
+        Matches any keyword as a phrase on the ngram FULLTEXT index of content.
         """
-        conn = None
-        cursor = None
-        try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor(dictionary=True)
-
-            # Build LIKE conditions for keywords
-            keyword_conditions = " OR ".join(["h.content LIKE %s"] * len(keywords))
-            keyword_params = [f"%{kw}%" for kw in keywords]
-
-            query = f"""
-                SELECT h.id, h.content, h.verification_state, h.tags,
-                       h.origin_user_id_hash as author_hash,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id) as total_verifications,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id AND hv.verification_result = 'SUCCESS') as success_count,
-                       (SELECT COUNT(*) FROM hypothesis_verifications hv WHERE hv.hypothesis_id = h.id AND hv.verification_result = 'FAILURE') as failure_count,
-                       (SELECT GROUP_CONCAT(DISTINCT CONCAT(t.name, ':', hv2.verification_result) SEPARATOR '; ')
-                        FROM hypothesis_verifications hv2
-                        LEFT JOIN teams t ON hv2.verifier_team_id = t.id
-                        WHERE hv2.hypothesis_id = h.id) as verification_summary
-                FROM hypotheses h
-                WHERE h.status = 'SHARED'
-                  AND ({keyword_conditions})
-            """
-            params = keyword_params.copy()
-
-            if exclude_user_id:
-                query += " AND h.origin_user_id != %s"
-                params.append(exclude_user_id)
-
-            query += " ORDER BY h.verification_state = 'VALIDATED' DESC, h.shared_at DESC LIMIT %s"
-            params.append(limit)
+        # Quoted phrases match like LIKE '%kw%'; terms shorter than the ngram
+        # token size cannot be looked up in the index
+        terms = [kw.replace('"', " ").strip() for kw in keywords]
+        terms = [term for term in terms if len(term) >= self.FULLTEXT_MIN_TERM_LENGTH]
+        if not terms:
+            return []
+        against = " ".join(f'"{term}"' for term in terms)
 
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return [self._format_hypothesis_row(row) for row in rows]
+        try:
+            with self._cursor(dictionary=True) as (conn, cursor):
+                query = f"""
+                    SELECT h.id, h.content, h.verification_state, h.tags,
+                           h.origin_user_id_hash as author_hash,
+                           MATCH(h.content) AGAINST (%s IN BOOLEAN MODE) as relevance,
+                           vc.total as total_verifications,
+                           vc.success as success_count,
+                           vc.failure as failure_count,
+                           (SELECT GROUP_CONCAT(DISTINCT CONCAT(t.name, ':', hv2.verification_result) SEPARATOR '; ')
+                            FROM hypothesis_verifications hv2
+                            LEFT JOIN teams t ON hv2.verifier_team_id = t.id
+                            WHERE hv2.hypothesis_id = h.id) as verification_summary
+                    FROM hypotheses h
+                    {self.VERIFICATION_COUNTS_JOIN}
+                    WHERE h.status = 'SHARED'
+                      AND MATCH(h.content) AGAINST (%s IN BOOLEAN MODE)
+                """
+                params = [against, against]
+
+                if exclude_user_id:
+                    query += " AND h.origin_user_id != %s"
+                    params.append(exclude_user_id)
+
+                query += " ORDER BY h.verification_state = 'VALIDATED' DESC, relevance DESC, h.shared_at DESC LIMIT %s"
+                params.append(limit)
+
+                cursor.execute(query, tuple(params))
+                rows = cursor.fetchall()
+                return [self._format_hypothesis_row(row) for row in rows]
         except mysql.connector.Error as err:
-            print(f"[✗] MySQL Error in search_hypotheses_for_rag: {err}")
+            logger.error("[✗] MySQL Error in search_hypotheses_for_rag: %s", err)
             return []
-        finally:
-            if cursor: cursor.close()
-            if conn: conn.close()
@@ -1,6 +1,7 @@
+import asyncio
 from copy import deepcopy
 import json
-from fastapi import FastAPI, Request, HTTPException, Query
+from fastapi import BackgroundTasks, FastAPI, Request, HTTPException, Query
 from typing import Any, Dict, List, Optional
 import logging
 import os
@@ -95,6 +96,8 @@ class HypothesisIncubateRequest(BaseModel):
     interest_profile: Optional[Dict[str, Any]] = None
     auto_score: bool = True
     check_sharing: bool = True
+    # True の場合、スコアリングと共有チェックはレスポンス後にバックグラウンドで実行する
+    defer_scoring: bool = False
 
 class HypothesisRefineRequest(BaseModel):
     user_id: str
@@ -114,6 +117,16 @@ class SuggestionResponseRequest(BaseModel):
     edited_content: Optional[str] = None
     team_id: Optional[str] = None
 
+class SuggestionActionItem(BaseModel):
+    suggestion_id: int
+    action: str  # accept, reject, edit
+    edited_content: Optional[str] = None
+    team_id: Optional[str] = None
+
+class BatchSuggestionResponseRequest(BaseModel):
+    user_id: str
+    responses: List[SuggestionActionItem]
+
 class AddVerificationRequest(BaseModel):
     user_id: str
     hypothesis_id: str
@@ -123,6 +136,18 @@ class AddVerificationRequest(BaseModel):
     evidence: Optional[Dict[str, Any]] = None
     team_id: Optional[str] = None
 
+class VerificationItem(BaseModel):
+    hypothesis_id: str
+    verification_result: str  # SUCCESS, FAILURE, PARTIAL, INCONCLUSIVE
+    conditions: Optional[str] = None
+    notes: Optional[str] = None
+    evidence: Optional[Dict[str, Any]] = None
+    team_id: Optional[str] = None
+
+class BatchVerificationRequest(BaseModel):
+    user_id: str
+    verifications: List[VerificationItem]
+
 class CollectiveWisdomRequest(BaseModel):
     user_id: str
     thought: str
@@ -335,6 +360,45 @@ async def get_file_content(file_id: str):
 
     return {"url": url}
 
+async def _load_conversation_context(repo: DBClient, user_id: str):
+    """
+    会話履歴・ユーザー状態・直近のキャプチャを並行して取得する。
+    DBアクセスはスレッドで行い、イベントループをブロックしない。
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(repo.get_recent_conversation, user_id),
+        asyncio.to_thread(repo.get_user_state, user_id),
+        asyncio.to_thread(repo.get_latest_captured_page, user_id)
+    )
+
+async def _save_conversation_turn(
+    repo: DBClient,
+    user_id: str,
+    user_message_id: int,
+    bot_message: str,
+    final_state: Dict[str, Any]
+):
+    """
+    1ターン分の結果（ユーザー状態・分析結果・AIの返答）を並行して保存する。
+    3つの書き込みは互いに依存しない（分析結果が参照するユーザーメッセージは保存済み）。
+    """
+    analysis_to_save = {
+        "interest_profile": final_state.get("interest_profile"),
+        "active_hypotheses": final_state.get("active_hypotheses"),
+        "hypotheses": final_state.get("hypotheses"),
+        "response_plan": final_state.get("response_plan")
+    }
+    await asyncio.gather(
+        asyncio.to_thread(
+            repo.upsert_user_state,
+            user_id,
+            final_state.get("interest_profile", {}),
+            final_state.get("active_hypotheses", {})
+        ),
+        asyncio.to_thread(repo.record_analysis, user_id, user_message_id, analysis_to_save),
+        asyncio.to_thread(repo.insert_message, user_id, "ai", bot_message)
+    )
+
 @app.post("/api/v1/chat/stream")
 async def chat_stream(request: ChatRequest):
     """
@@ -357,8 +421,7 @@ async def chat_stream(request: ChatRequest):
     workflow_manager = WorkflowManager(ai_client)
 
     # Initialize State
-    history = repo.get_recent_conversation(user_id)
-    stored_state = repo.get_user_state(user_id)
+    history, stored_state, latest_page = await _load_conversation_context(repo, user_id)
     current_state = StateManager.get_state_with_defaults(stored_state)
 
     initial_state = StateManager.init_conversation_context(
@@ -370,7 +433,6 @@ async def chat_stream(request: ChatRequest):
     initial_state["user_id"] = user_id
 
     # Check for latest captured page context
-    latest_page = repo.get_latest_captured_page(user_id)
     if latest_page:
         initial_state["captured_page"] = latest_page
 
@@ -493,9 +555,8 @@ async def post_usermessage_stream(request: Request) -> StreamingResponse:
 
     workflow_manager = WorkflowManager(ai_client)
 
-    # Load state and history
-    history = repo.get_recent_conversation(user_id)
-    stored_state = repo.get_user_state(user_id)
+    # Load state, history and latest captured page
+    history, stored_state, latest_page = await _load_conversation_context(repo, user_id)
     current_state = StateManager.get_state_with_defaults(stored_state)
 
     initial_state = StateManager.init_conversation_context(
@@ -507,7 +568,6 @@ async def post_usermessage_stream(request: Request) -> StreamingResponse:
     initial_state["user_id"] = user_id # Add user_id to state
 
     # Check for latest captured page context
-    latest_page = repo.get_latest_captured_page(user_id)
     if latest_page:
         initial_state["captured_page"] = latest_page
 
@@ -541,22 +601,8 @@ async def post_usermessage_stream(request: Request) -> StreamingResponse:
         # Note: 'bot_message' comes from response_planning
         bot_message = final_state.get("bot_message", "申し訳ありません、エラーが発生しました。")
 
-        # Save updated state
-        repo.upsert_user_state(
-            user_id,
-            final_state.get("interest_profile", {}),
-            final_state.get("active_hypotheses", {})
-        )
-
-        # Save analysis
-        analysis_to_save = {
-            "interest_profile": final_state.get("interest_profile"),
-            "active_hypotheses": final_state.get("active_hypotheses"),
-            "hypotheses": final_state.get("hypotheses"),
-            "response_plan": final_state.get("response_plan")
-        }
-        repo.record_analysis(user_id, user_message_id, analysis_to_save)
-        repo.insert_message(user_id, "ai", bot_message)
+        # Save updated state, analysis and reply
+        await _save_conversation_turn(repo, user_id, user_message_id, bot_message, final_state)
 
         yield json.dumps({
             "type": "result",
@@ -816,7 +862,7 @@ async def get_user_contents(user_id: str = Query(..., description="User ID")):
 # =============================================================================
 
 from pathlib import Path
-from langchain_core.prompts import PromptTemplate
+from app.utils.prompt_loader import load_prompt_template
 from config import MODEL_HYPOTHESIS_GENERATION
 import zipfile
 import tempfile
@@ -1190,9 +1236,8 @@ async def generate_hypothesis_draft(request: HypothesisDraftRequest):
     ai_client = AIClient()
 
     # プロンプトテンプレートを読み込み
-    prompt_path = Path(__file__).resolve().parents[1] / "static/prompts/hypothesis_draft.txt"
     try:
-        prompt_template = PromptTemplate.from_file(prompt_path)
+        prompt_template = load_prompt_template("hypothesis_draft.txt")
     except Exception as e:
         logger.error(f"Failed to load prompt template: {e}")
         raise HTTPException(status_code=500, detail="Prompt template not found")
@@ -1254,18 +1299,32 @@ def get_team_brain_manager() -> TeamBrainManager:
 # ---------------------------------------------------------------------------
 
 @app.post("/api/v1/team-brain/hypotheses/incubate")
-async def incubate_hypothesis(request: HypothesisIncubateRequest):
+async def incubate_hypothesis(request: HypothesisIncubateRequest, background_tasks: BackgroundTasks):
     """
     経験から仮説を生成する（FR-103: 仮説形成アシスタント）
+
+    defer_scoring=True の場合は仮説生成の結果だけを即座に返し、スコアリングと共有チェックは
+    バックグラウンドで実行する（結果は /hypotheses/{hypothesis_id}/status で取得）。
     """
     manager = get_team_brain_manager()
-    result = manager.incubate_hypothesis(
+    defer = request.defer_scoring and request.auto_score
+    result = await manager.aincubate_hypothesis(
         user_id=request.user_id,
         experience=request.experience,
         interest_profile=request.interest_profile,
-        auto_score=request.auto_score,
+        auto_score=request.auto_score and not defer,
         check_sharing=request.check_sharing
     )
+
+    if defer and result.get("success") and result.get("hypothesis_id"):
+        background_tasks.add_task(
+            manager.afinalize_hypothesis,
+            result["hypothesis_id"],
+            request.user_id,
+            request.check_sharing
+        )
+        result["pending"] = ["quality_score", "sharing_suggestion"] if request.check_sharing else ["quality_score"]
+
     return result
 
 
@@ -1303,6 +1362,18 @@ async def get_my_hypotheses(
     return {"hypotheses": hypotheses}
 
 
+@app.get("/api/v1/team-brain/hypotheses/{hypothesis_id}/status")
+async def get_hypothesis_status(
+    hypothesis_id: str,
+    user_id: str = Query(..., description="User ID")
+):
+    """
+    仮説のスコアと保留中の共有サジェストを取得する（バックグラウンド処理のポーリング用）
+    """
+    manager = get_team_brain_manager()
+    return manager.get_hypothesis_status(user_id, hypothesis_id)
+
+
 @app.post("/api/v1/team-brain/hypotheses/verification-state")
 async def update_hypothesis_verification_state(request: HypothesisUpdateVerificationRequest):
     """
@@ -1358,6 +1429,19 @@ async def respond_to_suggestion(request: SuggestionResponseRequest):
     return result
 
 
+@app.post("/api/v1/team-brain/suggestions/respond-batch")
+async def respond_to_suggestions(request: BatchSuggestionResponseRequest):
+    """
+    複数の共有サジェストにまとめて応答する（FR-202: 承認フロー）
+    """
+    manager = get_team_brain_manager()
+    results = manager.respond_to_suggestions(
+        user_id=request.user_id,
+        responses=[r.model_dump() for r in request.responses]
+    )
+    return {"results": results}
+
+
 # ---------------------------------------------------------------------------
 # 3階: 共創の広場 (Public Layer) - FR-301
 # ---------------------------------------------------------------------------
@@ -1398,6 +1482,19 @@ async def add_verification(request: AddVerificationRequest):
     return result
 
 
+@app.post("/api/v1/team-brain/hypotheses/verify-batch")
+async def add_verifications_bulk(request: BatchVerificationRequest):
+    """
+    複数の検証結果をまとめて追加する（FR-301: 検証ステータス共有の一括登録）
+    """
+    manager = get_team_brain_manager()
+    result = manager.add_verifications_bulk(
+        user_id=request.user_id,
+        verifications=[v.model_dump() for v in request.verifications]
+    )
+    return result
+
+
 @app.get("/api/v1/team-brain/hypotheses/{hypothesis_id}/verifications")
 async def get_hypothesis_verifications(hypothesis_id: str):
     """
@@ -1418,7 +1515,7 @@ async def think_with_collective_wisdom(request: CollectiveWisdomRequest):
     組織の集合知を活用してアドバイスを取得する（FR-401: ステータス考慮型RAG）
     """
     manager = get_team_brain_manager()
-    result = manager.think_with_collective_wisdom(
+    result = await manager.athink_with_collective_wisdom(
         user_id=request.user_id,
         thought=request.thought,
         category=request.category
@@ -1426,13 +1523,37 @@ async def think_with_collective_wisdom(request: CollectiveWisdomRequest):
     return result
 
 
+@app.post("/api/v1/team-brain/think-stream")
+async def think_with_collective_wisdom_stream(request: CollectiveWisdomRequest) -> StreamingResponse:
+    """
+    組織の集合知を活用したアドバイスをSSEでストリーミングする（FR-401）
+
+    イベント: header（検索結果）→ delta（LLM出力の断片）→ complete（最終結果）
+    """
+    manager = get_team_brain_manager()
+
+    async def event_generator():
+        try:
+            async for event in manager.think_with_collective_wisdom_stream(
+                user_id=request.user_id,
+                thought=request.thought,
+                category=request.category
+            ):
+                yield f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+        except Exception as e:
+            logger.error(f"Team brain stream error: {e}", exc_info=True)
+            yield f"data: {json.dumps({'type': 'error', 'message': str(e)}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @app.post("/api/v1/team-brain/differential/suggest")
 async def suggest_differential_verification(request: DifferentialVerificationRequest):
     """
     差分検証を提案する（FR-402）
     """
     manager = get_team_brain_manager()
-    result = manager.suggest_differential_verification(
+    result = await manager.asuggest_differential_verification(
         user_id=request.user_id,
         hypothesis_id=request.hypothesis_id,
         new_conditions=request.new_conditions
@@ -16,6 +16,7 @@ from app.api.ai_client import AIClient
 from app.api.db import DBClient
 from app.api.state_manager import StateManager
 from app.api.components.knowledge_manager import KnowledgeManager
+from app.api.components.rag_manager import RAGManager
 from app.api.components.topic_client import TopicClient
 from config import MODEL_CAPTURE_FILTERING, MODEL_HOT_CACHE
 
@@ -436,6 +437,9 @@ def process_document_task(user_id: str, file_path: str, title: str, file_id: str
                 success_count += 1
             except Exception as e:
                 logger.error(f"Graph update failed for chunk {i}: {e}")
+
+        # 追加したチャンクが近似重複クエリのキャッシュに隠れないようにする
+        RAGManager.invalidate_cached_results(km.collection_name, user_id)
         # --- 修正終了 -----------------------
 
         logger.info(f"Processed {success_count} chunks for {title}")
@@ -504,7 +508,8 @@ def process_capture_task(payload: Dict[str, Any]):
             meta = {"source_url": url, "title": title, "capture_id": capture_id}
 
             if visibility == "public":
-                knowledge_manager.add_shared_fact(summary, "webhook_capture", meta)
+                # Captures are de-duplicated via is_duplicate_content, so wait for the write
+                knowledge_manager.add_shared_fact(summary, "webhook_capture", meta, wait=True)
             else:
                 category_for_memory = "CapturedInterest"
                 try:
@@ -533,7 +538,8 @@ def process_capture_task(payload: Dict[str, Any]):
                     content=summary,
                     memory_type="user_hypothesis",
                     category=category_for_memory,
-                    meta=meta
+                    meta=meta,
+                    wait=True
                 )
 
             logger.info(f"Saved 'Interest' content for user {user_id}")
@@ -0,0 +1,29 @@
+"""
+Fast JSON helpers
+
+Thin wrappers around orjson that keep the stdlib call sites readable.
+orjson writes UTF-8 natively, so non-ASCII (Japanese) text is preserved
+exactly like json.dumps(..., ensure_ascii=False).
+"""
+
+from typing import Any, Union
+
+import orjson
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing handlers keep working
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string (non-ASCII kept as-is, optional 2-space indent / sorted keys)."""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, option=option).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON string or bytes."""
+    return orjson.loads(data)
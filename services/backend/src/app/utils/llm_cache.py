@@ -0,0 +1,146 @@
+"""
+LLM Result Cache
+
+Memoizes parsed LLM responses keyed by a hash of (model, prompt), so that
+repeated calls with identical inputs (e.g. the same unchanged hypothesis
+checked by several triggers) skip the LLM round-trip.
+
+Entries live in an in-process TTL cache. When LLM_CACHE_REDIS_URL is set,
+Redis is used as a shared second level across workers; Redis errors are
+logged and treated as cache misses.
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional
+
+from cachetools import TTLCache
+
+from app.utils import json_utils
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL")
+
+_KEY_PREFIX = "llm_cache:"
+
+
+class LLMResultCache:
+    """
+    Thread-safe TTL cache for LLM results with an optional Redis layer.
+
+    Values are deep-copied on the way in and out, so callers may mutate
+    what they get back without corrupting the cached entry.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: int = LLM_CACHE_TTL,
+        redis_url: Optional[str] = LLM_CACHE_REDIS_URL
+    ):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning(f"[!] LLM cache Redis unavailable, using in-process cache only: {e}")
+
+    @staticmethod
+    def make_key(model: Optional[str], prompt: str, response_schema: Optional[type] = None) -> str:
+        """Hash the model name, prompt text and output schema into a cache key."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update((model or "").encode("utf-8"))
+        digest.update(b"\x00")
+        if response_schema is not None:
+            digest.update(response_schema.__name__.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result, or None on a miss."""
+        with self._lock:
+            value = self._cache.get(key)
+        if value is not None:
+            return copy.deepcopy(value)
+        if self._redis is None:
+            return None
+
+        try:
+            raw = self._redis.get(_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"[!] LLM cache Redis get failed: {e}")
+            return None
+        if raw is None:
+            return None
+
+        value = json_utils.loads(raw)
+        with self._lock:
+            self._cache[key] = copy.deepcopy(value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result. None (failed generations) is never cached."""
+        if value is None:
+            return
+        with self._lock:
+            self._cache[key] = copy.deepcopy(value)
+        if self._redis is not None:
+            try:
+                self._redis.set(_KEY_PREFIX + key, json_utils.dumps(value), ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"[!] LLM cache Redis set failed: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached result or compute, store and return it."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def generate(
+        self,
+        ai_client: Any,
+        prompt: str,
+        model: Optional[str] = None,
+        response_schema: Optional[type] = None
+    ) -> Any:
+        """ai_client.generate_response (structured when a schema is given) through the cache."""
+        return self.get_or_compute(
+            self.make_key(model, prompt, response_schema),
+            lambda: ai_client.generate_response(prompt, model=model, response_schema=response_schema)
+        )
+
+    async def agenerate(
+        self,
+        ai_client: Any,
+        prompt: str,
+        model: Optional[str] = None,
+        response_schema: Optional[type] = None
+    ) -> Any:
+        """ai_client.agenerate_response (structured when a schema is given) through the cache."""
+        key = self.make_key(model, prompt, response_schema)
+        value = self.get(key)
+        if value is None:
+            value = await ai_client.agenerate_response(prompt, model=model, response_schema=response_schema)
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop in-process entries (Redis entries expire by TTL)."""
+        with self._lock:
+            self._cache.clear()
+
+
+# Shared by all components in the process
+llm_result_cache = LLMResultCache()
@@ -0,0 +1,52 @@
+"""
+Prompt Template Loader
+
+Prompt files are static for the lifetime of the process, so each file is
+read (and, for templates, parsed into a PromptTemplate) once and shared by
+every component instance (components are constructed per request).
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Union
+
+from langchain_core.prompts import PromptTemplate
+
+# backend/src/app/static/prompts
+PROMPTS_DIR = Path(__file__).resolve().parents[1] / "static/prompts"
+
+
+@lru_cache(maxsize=None)
+def _load_template(path: Path) -> PromptTemplate:
+    return PromptTemplate.from_file(path)
+
+
+def load_prompt_template(name: Union[str, Path]) -> PromptTemplate:
+    """
+    Return the cached PromptTemplate for a prompt file.
+
+    Args:
+        name: File name under static/prompts, or an absolute path
+
+    Returns:
+        Shared PromptTemplate instance (treat as read-only)
+    """
+    return _load_template(PROMPTS_DIR / name)
+
+
+@lru_cache(maxsize=None)
+def _load_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def load_prompt_text(name: Union[str, Path]) -> str:
+    """
+    Return the cached raw text of a prompt file.
+
+    Args:
+        name: File name under static/prompts, or an absolute path
+
+    Returns:
+        Prompt file contents
+    """
+    return _load_text(PROMPTS_DIR / name)
@@ -0,0 +1,97 @@
+"""
+Query Result Cache
+
+Redis cache for read-mostly DB queries that many users load repeatedly
+(e.g. the shared hypothesis bank on the dashboard).
+
+Keys embed a per-namespace version counter. Writers bump the counter (INCR)
+instead of scanning for keys to delete, so old entries are simply never read
+again and expire by TTL.
+
+Caching is off unless QUERY_CACHE_REDIS_URL is set: an in-process copy could
+not be invalidated by writes from other API or Celery workers. Redis errors
+are logged and treated as cache misses.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Any, Callable, Optional
+
+from app.utils import json_utils
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "60"))
+QUERY_CACHE_REDIS_URL = os.getenv("QUERY_CACHE_REDIS_URL")
+
+_KEY_PREFIX = "query_cache:"
+
+
+class QueryResultCache:
+    """Versioned Redis cache for JSON-serializable query results."""
+
+    def __init__(
+        self,
+        ttl: int = QUERY_CACHE_TTL,
+        redis_url: Optional[str] = QUERY_CACHE_REDIS_URL
+    ):
+        self.ttl = ttl
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning(f"[!] Query cache Redis unavailable, caching disabled: {e}")
+
+    @staticmethod
+    def _version_key(namespace: str) -> str:
+        return f"{_KEY_PREFIX}{namespace}:ver"
+
+    @staticmethod
+    def make_key(namespace: str, version: bytes, params: tuple) -> str:
+        """Hash the namespace version and query parameters into a cache key."""
+        digest = hashlib.sha1(version)
+        digest.update(b"\x00")
+        digest.update(json_utils.dumps(list(params)).encode("utf-8"))
+        return f"{_KEY_PREFIX}{namespace}:{digest.hexdigest()}"
+
+    def get_or_compute(self, namespace: str, params: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for (namespace, params), or compute, store and return it.
+        None (a failed query) is never cached.
+        """
+        if self._redis is None:
+            return compute()
+
+        key = None
+        try:
+            version = self._redis.get(self._version_key(namespace)) or b"0"
+            key = self.make_key(namespace, version, params)
+            raw = self._redis.get(key)
+            if raw is not None:
+                return json_utils.loads(raw)
+        except Exception as e:
+            logger.warning(f"[!] Query cache Redis get failed: {e}")
+
+        value = compute()
+        if value is not None and key is not None:
+            try:
+                self._redis.set(key, json_utils.dumps(value), ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"[!] Query cache Redis set failed: {e}")
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        """Make every cached result of the namespace unreachable."""
+        if self._redis is None:
+            return
+        try:
+            self._redis.incr(self._version_key(namespace))
+        except Exception as e:
+            logger.warning(f"[!] Query cache Redis invalidate failed: {e}")
+
+
+# Shared by all DBClient instances in the process
+query_result_cache = QueryResultCache()
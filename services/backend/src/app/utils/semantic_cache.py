@@ -0,0 +1,175 @@
+"""
+Semantic Result Cache
+
+Caches results keyed by approximate embedding similarity so that
+paraphrased queries can reuse the results of an earlier, near-identical
+query instead of issuing a new vector search / LLM call.
+
+Candidates are found with random-projection LSH (signed projections packed
+into a 64-bit signature, compared by Hamming distance) and then verified
+with an exact cosine similarity check.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class SemanticResultCache:
+    """
+    Thread-safe near-duplicate cache for embedding-keyed results.
+
+    Entries are grouped into buckets (e.g. per user / filter / collection) so
+    that a hit never crosses filter semantics. Each bucket is bounded and
+    evicts its least recently used entry; the total across buckets is bounded
+    too and evicts the oldest entry. Expired entries are pruned on every put,
+    and empty buckets are dropped.
+    """
+
+    def __init__(
+        self,
+        num_bits: int = 64,
+        max_hamming: int = 4,
+        min_similarity: float = 0.97,
+        max_entries_per_bucket: int = 256,
+        max_entries: int = 4096,
+        ttl: float = 600.0,
+        seed: int = 0
+    ):
+        self.num_bits = num_bits
+        self.max_hamming = max_hamming
+        self.min_similarity = min_similarity
+        self.max_entries_per_bucket = max_entries_per_bucket
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._seed = seed
+
+        # Projection matrices per embedding dimension (sampled lazily)
+        self._projections: Dict[int, np.ndarray] = {}
+        self._buckets: Dict[Hashable, "OrderedDict[int, Tuple[int, np.ndarray, Any, float]]"] = {}
+        # Every live entry id -> its bucket key, in insertion (= expiry) order
+        self._entries: "OrderedDict[int, Hashable]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _projection(self, dim: int) -> np.ndarray:
+        projection = self._projections.get(dim)
+        if projection is None:
+            rng = np.random.default_rng(self._seed)
+            projection = rng.standard_normal((self.num_bits, dim)).astype(np.float32)
+            self._projections[dim] = projection
+        return projection
+
+    def _signature(self, vector: Sequence[float]) -> Tuple[int, np.ndarray]:
+        """Return (LSH bits, unit-normalized vector) for an embedding."""
+        vec = np.ascontiguousarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        if norm > 0:
+            vec = vec / norm
+        bits = np.packbits(self._projection(vec.shape[0]) @ vec > 0)
+        return int.from_bytes(bits.tobytes(), "big"), vec
+
+    def get(self, bucket_key: Hashable, vector: Sequence[float]) -> Optional[Any]:
+        """Return the cached value for a near-duplicate vector, or None."""
+        if vector is None or len(vector) == 0:
+            return None
+
+        bits, vec = self._signature(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if not bucket:
+                self.misses += 1
+                return None
+
+            best_id = None
+            best_similarity = self.min_similarity
+            for entry_id, (entry_bits, entry_vec, _, ts) in list(bucket.items()):
+                if now - ts > self.ttl:
+                    self._remove(bucket_key, entry_id)
+                    continue
+                if bin(bits ^ entry_bits).count("1") > self.max_hamming:
+                    continue
+                if entry_vec.shape != vec.shape:
+                    continue
+                similarity = float(np.dot(entry_vec, vec))
+                if similarity >= best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            bucket.move_to_end(best_id)
+            self.hits += 1
+            return bucket[best_id][2]
+
+    def put(self, bucket_key: Hashable, vector: Sequence[float], value: Any) -> None:
+        """Store a value for an embedding in the given bucket."""
+        if vector is None or len(vector) == 0:
+            return
+
+        bits, vec = self._signature(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            self._prune_expired(now)
+
+            bucket = self._buckets.setdefault(bucket_key, OrderedDict())
+            entry_id = self._next_id
+            self._next_id += 1
+            bucket[entry_id] = (bits, vec, value, now)
+            self._entries[entry_id] = bucket_key
+
+            while len(bucket) > self.max_entries_per_bucket:
+                self._remove(bucket_key, next(iter(bucket)))
+            while len(self._entries) > self.max_entries:
+                oldest_id, oldest_key = next(iter(self._entries.items()))
+                self._remove(oldest_key, oldest_id)
+
+    def _remove(self, bucket_key: Hashable, entry_id: int) -> None:
+        """Remove one entry (caller holds the lock); drops the bucket once empty."""
+        self._entries.pop(entry_id, None)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            return
+        bucket.pop(entry_id, None)
+        if not bucket:
+            del self._buckets[bucket_key]
+
+    def _prune_expired(self, now: float) -> None:
+        """Remove expired entries from all buckets (caller holds the lock)."""
+        while self._entries:
+            entry_id, bucket_key = next(iter(self._entries.items()))
+            if now - self._buckets[bucket_key][entry_id][3] <= self.ttl:
+                break
+            self._remove(bucket_key, entry_id)
+
+    def discard(self, match: Callable[[Hashable], bool]) -> None:
+        """Drop every bucket whose key satisfies match (e.g. after the underlying data changed)."""
+        with self._lock:
+            for bucket_key in [k for k in self._buckets if match(k)]:
+                for entry_id in self._buckets.pop(bucket_key):
+                    self._entries.pop(entry_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._buckets.clear()
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "buckets": len(self._buckets),
+                "entries": len(self._entries),
+            }
@@ -91,6 +91,7 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
     DB_PORT: int
+    DB_POOL_SIZE: int = 10
 
     # --- S3 / MinIO Configuration ---
     S3_ENDPOINT_URL: str
@@ -202,21 +203,26 @@ TASK_REPORT_GENERATION: ModelConfig = _cloud_smart()
 # 11. 応答計画 (品質重視)
 TASK_RESPONSE_PLANNING: ModelConfig = _cloud_smart()
 
+# 12. 共有サジェストの事前判定 (速度重視)
+#     "提案すべきか否か" の二値判定のみを行う。多くの仮説は提案対象外となるため軽量モデルで判定し、
+#     提案する場合のみ仮説生成用モデルで匿名化ドラフトを作成する。
+TASK_SUGGESTION_GATE: ModelConfig = _cloud_fast()
+
 
 # --- Embedding Task Configurations ---
 # Embedding生成のタスク別設定
 
-# 12. Wiki Embedding (コスト重視 - 大量処理)
+# 13. Wiki Embedding (コスト重視 - 大量処理)
 #     Wikipediaインポートなど大量のテキストをembedding化する処理。
 #     コストゼロのLocal LLMを使用することで、大量処理でもコストを抑えられる。
 TASK_WIKI_EMBEDDING: EmbeddingConfig = _local_embedding()
 
-# 13. User Document Embedding (品質とコストのバランス)
+# 14. User Document Embedding (品質とコストのバランス)
 #     ユーザーがアップロードしたドキュメントのembedding生成。
 #     品質を重視しつつ、必要に応じてLocalに切り替え可能。
 TASK_USER_DOCUMENT_EMBEDDING: EmbeddingConfig = _cloud_embedding()
 
-# 14. RAG Search Embedding (品質重視)
+# 15. RAG Search Embedding (品質重視)
 #     RAG検索時のクエリembedding生成。検索品質に直結するため、
 #     デフォルトはCloudを使用。
 TASK_RAG_SEARCH_EMBEDDING: EmbeddingConfig = _cloud_embedding()
@@ -239,6 +245,7 @@ MODEL_INNOVATION_SYNTHESIS = TASK_INNOVATION_SYNTHESIS.model
 MODEL_GAP_ANALYSIS = TASK_GAP_ANALYSIS.model
 MODEL_REPORT_GENERATION = TASK_REPORT_GENERATION.model
 MODEL_RESPONSE_PLANNING = TASK_RESPONSE_PLANNING.model
+MODEL_SUGGESTION_GATE = TASK_SUGGESTION_GATE.model
 
 # Legacy global exports
 LLM_MODEL = settings.LLM_MODEL
@@ -251,6 +258,7 @@ DB_USER = settings.DB_USER
 DB_PASSWORD = settings.DB_PASSWORD
 DB_NAME = settings.DB_NAME
 DB_PORT = settings.DB_PORT
+DB_POOL_SIZE = settings.DB_POOL_SIZE
 
 
 # =============================================================================